@@ -0,0 +1,194 @@
+"""
+Análisis por lotes sin interfaz gráfica
+
+Uso:
+    python -m backend RUTA [RUTA ...] [--patrones CSV] [--algoritmo NOMBRE]
+                      [--workers N] [--salida ARCHIVO.jsonl|ARCHIVO.csv] [--subcadenas]
+                      [--indice] [--mmap] [--metricas [--operaciones]]
+
+Las rutas pueden ser archivos o directorios (se recorren recursivamente). No
+importa PyQt5 ni matplotlib, así que puede ejecutarse en servidores sin pantalla.
+Un archivo que no se puede leer se informa y se cuenta en el resumen sin
+detener el lote; en ese caso el código de salida es 1.
+
+Por defecto se buscan palabras o frases completas, con su propio motor sobre
+las palabras del texto: el modelo de costos y --algoritmo solo intervienen con
+--subcadenas, y pedir un motor distinto de "auto" sin --subcadenas es un error.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from backend.algoritmos.compiled_matcher import ENGINES
+from backend.modelos.patrones import PatronesManager
+from backend.utils.metricas import Metricas
+from backend.utils.file_readers import read_file, EXTENSIONES_SOPORTADAS
+from backend.utils.procesador_texto import detect_patterns, detect_patterns_mmap
+from backend.utils.paralelo import detect_files_parallel
+from backend.utils.indice import obtener_indice, detect_patterns_indexed
+
+
+COLUMNAS = ['archivo', 'patron', 'tipo', 'nivel', 'posicion', 'longitud', 'algoritmo', 'distancia', 'contexto']
+
+
+def recolectar_archivos(rutas):
+    """
+    Expande directorios en la lista de archivos soportados que contienen
+
+    Los archivos indicados explícitamente pasan el mismo filtro de extensiones;
+    los no soportados se informan por la salida de errores y se omiten.
+    """
+    archivos = []
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            for raiz, _, nombres in os.walk(ruta):
+                for nombre in sorted(nombres):
+                    if os.path.splitext(nombre.lower())[1] in EXTENSIONES_SOPORTADAS:
+                        archivos.append(os.path.join(raiz, nombre))
+        elif os.path.splitext(ruta.lower())[1] in EXTENSIONES_SOPORTADAS:
+            archivos.append(ruta)
+        else:
+            print(f"{ruta}: formato no soportado, se omite", file=sys.stderr)
+    return archivos
+
+
+def analizar_archivo(ruta, matcher, algoritmo, metricas=None, indice=False, usar_mmap=False):
+    """Analiza un archivo en el proceso actual con la estrategia elegida"""
+    if usar_mmap and os.path.splitext(ruta.lower())[1] == '.txt':
+        # Los .txt se buscan sobre sus bytes mapeados; el resto se extrae como siempre
+        return detect_patterns_mmap(ruta, matcher, metricas)
+
+    texto = read_file(ruta)
+    if indice:
+        indice_archivo = obtener_indice(ruta, texto, matcher)
+        # Sin índice (texto demasiado grande para indexarlo) se recorre como siempre
+        if indice_archivo is not None:
+            return detect_patterns_indexed(indice_archivo, matcher, metricas)
+    return detect_patterns(texto, matcher, algoritmo, metricas)
+
+
+def analizar_archivos(archivos, matcher, algoritmo, workers, metricas=None, indice=False, usar_mmap=False):
+    """
+    Genera (ruta, resultados, error) para cada archivo, en paralelo si workers > 1
+
+    Un archivo que no se puede leer o analizar no detiene el lote: se genera con
+    resultados None y el mensaje del error.
+    """
+    if workers > 1:
+        yield from detect_files_parallel(archivos, matcher, algoritmo, workers, metricas)
+        return
+
+    for ruta in archivos:
+        try:
+            yield ruta, analizar_archivo(ruta, matcher, algoritmo, metricas, indice, usar_mmap), None
+        except Exception as e:
+            yield ruta, None, str(e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backend",
+                                     description="Detección de ciberacoso por lotes")
+    parser.add_argument("rutas", nargs="+", help="archivos o directorios a analizar")
+    parser.add_argument("--patrones", default="data/patrones_ciberacoso.csv",
+                        help="CSV de patrones (por defecto: %(default)s)")
+    parser.add_argument("--algoritmo", default="auto",
+                        choices=["auto", "aho_corasick"] + list(ENGINES),
+                        help="motor de búsqueda; solo se aplica con --subcadenas, sin ella se buscan "
+                             "palabras completas con su propio motor (por defecto: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="procesos en paralelo (por defecto: %(default)s)")
+    parser.add_argument("--salida", help="archivo .jsonl o .csv (por defecto: JSONL por salida estándar)")
+    parser.add_argument("--subcadenas", action="store_true",
+                        help="buscar los patrones también dentro de otras palabras")
+    parser.add_argument("--indice", action="store_true",
+                        help="usar un índice de sufijos guardado junto a cada archivo (se crea si falta, "
+                             "ocupa unas 7 veces el texto; los textos de más de 4 M caracteres "
+                             "se analizan sin índice)")
+    parser.add_argument("--metricas", action="store_true",
+                        help="mostrar llamadas, tiempo y latencias p50/p95/p99 por motor")
+    parser.add_argument("--operaciones", action="store_true",
+                        help="con --metricas, contar también comparaciones y desplazamientos "
+                             "(repite cada búsqueda con una variante instrumentada)")
+    parser.add_argument("--mmap", action="store_true",
+                        help="buscar en los .txt (UTF-8) sobre sus bytes mapeados en memoria; requiere "
+                             "--subcadenas, no normaliza y cuenta \\r\\n como dos caracteres")
+    args = parser.parse_args(argv)
+    if args.algoritmo != "auto" and not args.subcadenas:
+        parser.error("--algoritmo solo se aplica con --subcadenas")
+    if args.operaciones and not args.metricas:
+        parser.error("--operaciones requiere --metricas")
+    if args.mmap and not args.subcadenas:
+        parser.error("--mmap requiere --subcadenas")
+    if args.mmap and args.indice:
+        parser.error("--mmap y --indice no pueden combinarse")
+    if args.workers > 1 and (args.indice or args.mmap):
+        # Con índice o mmap cada archivo es barato: se analizan en el proceso principal
+        parser.error("--workers no puede combinarse con --indice ni con --mmap")
+
+    # La búsqueda sobre bytes compara los patrones tal cual, sin normalizar
+    patrones_manager = PatronesManager(normalizar=not args.mmap, palabras_completas=not args.subcadenas)
+    if not patrones_manager.cargar_desde_csv(args.patrones):
+        print(f"No se pudieron cargar los patrones de {args.patrones}", file=sys.stderr)
+        return 1
+    matcher = patrones_manager.obtener_matcher()
+    if args.mmap and matcher.aproximados:
+        print("--mmap no admite patrones con tolerancia", file=sys.stderr)
+        return 1
+
+    archivos = recolectar_archivos(args.rutas)
+    if not archivos:
+        print("No se encontraron archivos para analizar", file=sys.stderr)
+        return 1
+
+    formato_csv = bool(args.salida) and args.salida.lower().endswith('.csv')
+    salida = open(args.salida, 'w', newline='', encoding='utf-8') if args.salida else sys.stdout
+
+    metricas = Metricas(contar_operaciones=args.operaciones) if args.metricas else None
+    total_bytes = 0
+    total_alertas = 0
+    errores = 0
+    inicio = time.perf_counter()
+
+    try:
+        writer = None
+        if formato_csv:
+            writer = csv.DictWriter(salida, fieldnames=COLUMNAS, extrasaction='ignore')
+            writer.writeheader()
+
+        for ruta, resultados, error in analizar_archivos(archivos, matcher, args.algoritmo, args.workers,
+                                                          metricas, args.indice, args.mmap):
+            if error is not None:
+                print(f"{ruta}: {error}", file=sys.stderr)
+                errores += 1
+                continue
+
+            total_bytes += os.path.getsize(ruta)
+            total_alertas += len(resultados)
+
+            for resultado in resultados:
+                fila = dict(resultado, archivo=ruta)
+                if writer:
+                    writer.writerow(fila)
+                else:
+                    salida.write(json.dumps(fila, ensure_ascii=False) + "\n")
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+    # Resumen de rendimiento
+    duracion = max(time.perf_counter() - inicio, 1e-9)
+    megabytes = total_bytes / (1024 * 1024)
+    analizados = len(archivos) - errores
+    print(f"{analizados} archivos, {megabytes:.2f} MB, {total_alertas} alertas, {errores} errores "
+          f"en {duracion:.2f} s ({analizados / duracion:.1f} archivos/s, {megabytes / duracion:.2f} MB/s)",
+          file=sys.stderr)
+    if metricas is not None:
+        print(json.dumps(metricas.resumen(), indent=2), file=sys.stderr)
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
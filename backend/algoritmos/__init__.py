@@ -1,4 +1,11 @@
 # Importaciones para facilitar el acceso a los algoritmos
 from .kmp import kmp_search, compute_lps
-from .boyer_moore import boyer_moore_search, bad_character_heuristic
+from .boyer_moore import (boyer_moore_search, bad_character_heuristic, good_suffix_table,
+                          boyer_moore_bad_char_search, horspool_search, sunday_search)
+from .aho_corasick import aho_corasick_search, build_automaton
+from .byte_search import byte_horspool_search, byte_bad_char_table
+from .myers import myers_search, myers_peq
+from .tokens import tokenize, word_search
+from .suffix_array import build_suffix_array, build_lcp, suffix_array_search
+from .compiled_matcher import CompiledMatcher
 from .greedy_knapsack import greedy_knapsack
\ No newline at end of file
@@ -0,0 +1,88 @@
+# aho_corasick.py
+from collections import deque
+
+
+def build_automaton(patterns):
+    """
+    Construye el autómata de Aho-Corasick para un conjunto de patrones
+
+    Args:
+        patterns: lista de cadenas a buscar
+
+    Returns:
+        Tupla (goto, fail, output) donde goto[estado] es un dict carácter -> estado,
+        fail[estado] es el enlace de fallo y output[estado] la lista de índices de
+        patrones que terminan en ese estado
+    """
+    goto = [{}]
+    fail = [0]
+    output = [[]]
+
+    # Construcción del trie
+    for index, pattern in enumerate(patterns):
+        if not pattern:
+            continue
+
+        state = 0
+        for char in pattern:
+            next_state = goto[state].get(char)
+            if next_state is None:
+                next_state = len(goto)
+                goto[state][char] = next_state
+                goto.append({})
+                fail.append(0)
+                output.append([])
+            state = next_state
+
+        output[state].append(index)
+
+    # Enlaces de fallo por niveles (BFS); los hijos de la raíz fallan a la raíz
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for char, next_state in goto[state].items():
+            queue.append(next_state)
+
+            f = fail[state]
+            while f and char not in goto[f]:
+                f = fail[f]
+            fail[next_state] = goto[f].get(char, 0)
+
+            # Heredar las salidas del estado de fallo (sufijos que también son patrones)
+            if output[fail[next_state]]:
+                output[next_state] = output[next_state] + output[fail[next_state]]
+
+    return goto, fail, output
+
+
+def aho_corasick_search(text, patterns, automaton=None):
+    """
+    Busca todos los patrones en una sola pasada sobre el texto
+
+    Args:
+        text: texto a analizar
+        patterns: lista de cadenas a buscar
+        automaton: autómata ya construido con build_automaton (opcional)
+
+    Returns:
+        Lista de tuplas (posicion, indice_patron) ordenadas por posición final
+    """
+    if automaton is None:
+        automaton = build_automaton(patterns)
+
+    goto, fail, output = automaton
+    lengths = [len(pattern) for pattern in patterns]
+
+    results = []
+    state = 0
+
+    for i, char in enumerate(text):
+        # Seguir enlaces de fallo hasta encontrar una transición válida
+        while state and char not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(char, 0)
+
+        for index in output[state]:
+            results.append((i - lengths[index] + 1, index))
+
+    return results
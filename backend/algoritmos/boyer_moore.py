@@ -12,16 +12,108 @@ def bad_character_heuristic(pattern):
     return bad_char
 
 
-def boyer_moore_search(text, pattern):
-    """Algoritmo Boyer-Moore simplificado"""
+def good_suffix_table(pattern):
+    """
+    Preprocesamiento para la regla del buen sufijo (versión fuerte)
+
+    Returns:
+        Lista shift de tamaño m + 1: ante un fallo en la posición j del patrón se
+        desplaza shift[j + 1]; tras una coincidencia completa se desplaza shift[0],
+        que es el periodo del patrón
+    """
+    m = len(pattern)
+    shift = [0] * (m + 1)
+    border = [0] * (m + 1)  # border[i]: inicio del borde más largo de pattern[i:]
+
+    # Caso 1: el sufijo coincidente aparece en otra parte del patrón
+    i = m
+    j = m + 1
+    border[i] = j
+    while i > 0:
+        while j <= m and pattern[i - 1] != pattern[j - 1]:
+            if shift[j] == 0:
+                shift[j] = j - i
+            j = border[j]
+        i -= 1
+        j -= 1
+        border[i] = j
+
+    # Caso 2: solo un prefijo del patrón coincide con parte del sufijo
+    j = border[0]
+    for i in range(m + 1):
+        if shift[i] == 0:
+            shift[i] = j
+        if i == j:
+            j = border[j]
+
+    return shift
+
+
+def boyer_moore_preprocess(pattern):
+    """Calcula las tablas del Boyer-Moore completo: (mal carácter, buen sufijo)"""
+    return bad_character_heuristic(pattern), good_suffix_table(pattern)
+
+
+def boyer_moore_search(text, pattern, tables=None):
+    """
+    Algoritmo Boyer-Moore completo: mal carácter + buen sufijo + regla de Galil
+
+    Tras cada coincidencia el patrón avanza su periodo y la regla de Galil evita
+    volver a comparar el prefijo que ya se sabe que coincide, por lo que el peor
+    caso es lineal incluso en texto repetitivo ("jajajaja...").
+
+    Args:
+        text: texto a analizar
+        pattern: patrón a buscar
+        tables: resultado de boyer_moore_preprocess(pattern) (opcional)
+    """
+    n = len(text)
+    m = len(pattern)
+
+    if m == 0:
+        return []
+
+    # Preprocesamiento si no se recibieron las tablas
+    if tables is None:
+        tables = boyer_moore_preprocess(pattern)
+    bad_char, good_suffix = tables
+    period = good_suffix[0]
+
+    results = []
+    s = 0  # desplazamiento del patrón con respecto al texto
+    lower = 0  # posiciones del patrón por debajo de este límite ya se saben iguales (Galil)
+
+    while s <= n - m:
+        j = m - 1
+
+        # Coincidencia de caracteres de derecha a izquierda
+        while j >= lower and pattern[j] == text[s + j]:
+            j -= 1
+
+        if j < lower:
+            results.append(s)
+            # Desplazar por el periodo; el prefijo de longitud m - periodo ya coincide
+            s += period
+            lower = m - period
+        else:
+            bad_char_skip = j - bad_char.get(text[s + j], -1)
+            s += max(good_suffix[j + 1], bad_char_skip)
+            lower = 0
+
+    return results
+
+
+def boyer_moore_bad_char_search(text, pattern, bad_char=None):
+    """Algoritmo Boyer-Moore simplificado, solo con la regla del mal carácter"""
     n = len(text)
     m = len(pattern)
 
     if m == 0:
         return []
 
-    # Preprocesamiento
-    bad_char = bad_character_heuristic(pattern)
+    # Preprocesamiento si no se recibió la tabla
+    if bad_char is None:
+        bad_char = bad_character_heuristic(pattern)
 
     results = []
     s = 0  # s es el desplazamiento del patrón con respecto al texto
@@ -47,4 +139,80 @@ def boyer_moore_search(text, pattern):
                 skip = max(1, j + 1)
             s += skip
 
-    return results
\ No newline at end of file
+    return results
+
+
+def horspool_table(pattern):
+    """Tabla de desplazamientos de Horspool según el carácter alineado con el final del patrón"""
+    m = len(pattern)
+    table = {}
+    for i in range(m - 1):
+        table[pattern[i]] = m - 1 - i
+    return table
+
+
+def horspool_search(text, pattern, table=None):
+    """Variante de Boyer-Moore-Horspool"""
+    n = len(text)
+    m = len(pattern)
+
+    if m == 0:
+        return []
+
+    if table is None:
+        table = horspool_table(pattern)
+
+    results = []
+    s = 0
+
+    while s <= n - m:
+        j = m - 1
+        while j >= 0 and pattern[j] == text[s + j]:
+            j -= 1
+
+        if j < 0:
+            results.append(s)
+
+        # El desplazamiento depende solo del último carácter de la ventana
+        s += table.get(text[s + m - 1], m)
+
+    return results
+
+
+def sunday_table(pattern):
+    """Tabla de desplazamientos de Sunday según el carácter siguiente a la ventana"""
+    m = len(pattern)
+    table = {}
+    for i in range(m):
+        table[pattern[i]] = m - i
+    return table
+
+
+def sunday_search(text, pattern, table=None):
+    """Variante de Sunday (Quick Search)"""
+    n = len(text)
+    m = len(pattern)
+
+    if m == 0:
+        return []
+
+    if table is None:
+        table = sunday_table(pattern)
+
+    results = []
+    s = 0
+
+    while s <= n - m:
+        j = 0
+        while j < m and pattern[j] == text[s + j]:
+            j += 1
+
+        if j == m:
+            results.append(s)
+
+        # El desplazamiento depende del carácter justo después de la ventana
+        if s + m >= n:
+            break
+        s += table.get(text[s + m], m + 1)
+
+    return results
@@ -0,0 +1,48 @@
+# byte_search.py
+def byte_bad_char_table(pattern):
+    """
+    Tabla de mal carácter de Horspool para patrones en bytes
+
+    Es una lista de 256 enteros indexada directamente por el valor del byte,
+    en lugar del dict que usa bad_character_heuristic para texto.
+    """
+    m = len(pattern)
+    table = [m] * 256
+    for i in range(m - 1):
+        table[pattern[i]] = m - 1 - i
+    return table
+
+
+def byte_horspool_search(data, pattern, table=None):
+    """
+    Horspool sobre bytes (bytes, bytearray o mmap)
+
+    Args:
+        data: secuencia de bytes donde buscar
+        pattern: patrón en bytes
+        table: resultado de byte_bad_char_table(pattern) (opcional)
+
+    Returns:
+        Lista de offsets en bytes de cada coincidencia
+    """
+    n = len(data)
+    m = len(pattern)
+
+    if m == 0:
+        return []
+
+    if table is None:
+        table = byte_bad_char_table(pattern)
+
+    results = []
+    last = pattern[m - 1]
+    s = 0
+
+    while s <= n - m:
+        c = data[s + m - 1]
+        # Solo se compara la ventana completa si coincide el último byte
+        if c == last and data[s:s + m] == pattern:
+            results.append(s)
+        s += table[c]
+
+    return results
@@ -0,0 +1,165 @@
+# compiled_matcher.py
+from .kmp import kmp_search, compute_lps
+from .boyer_moore import (boyer_moore_search, boyer_moore_preprocess, horspool_search,
+                          horspool_table, sunday_search, sunday_table)
+from .aho_corasick import build_automaton
+from .byte_search import byte_bad_char_table
+from .normalizacion import normalizar_patron
+from .myers import myers_search, myers_peq, dominance_radius
+from .tokens import tokenize_pattern, word_search
+from functools import cached_property
+
+
+# Motores de un solo patrón: nombre -> (función de búsqueda, preprocesamiento del patrón)
+# La función de búsqueda recibe (texto, patrón, tabla) con la tabla ya calculada
+ENGINES = {
+    "kmp": (kmp_search, compute_lps),
+    "boyer_moore": (boyer_moore_search, boyer_moore_preprocess),
+    "horspool": (horspool_search, horspool_table),
+    "sunday": (sunday_search, sunday_table),
+}
+
+
+class _TablasPorMotor(dict):
+    """motor -> tablas de cada patrón, calculadas la primera vez que se pide el motor"""
+
+    def __init__(self, strings):
+        super().__init__()
+        self.strings = strings
+
+    def __missing__(self, engine):
+        _, preprocess = ENGINES[engine]
+        tablas = self[engine] = [preprocess(pattern) if pattern else None for pattern in self.strings]
+        return tablas
+
+
+class CompiledMatcher:
+    """
+    Conjunto de patrones con sus tablas de preprocesamiento
+
+    Se construye una sola vez a partir de la lista de tuplas (patron, tipo, nivel)
+    y puede reutilizarse en cualquier número de análisis mientras los patrones
+    no cambien. Las tablas de cada motor y los autómatas se calculan la primera
+    vez que se usan: un análisis solo paga el preprocesamiento de los motores
+    que realmente elige (con palabras completas, solo el autómata de palabras).
+
+    Con normalizar=True los patrones se buscan en minúsculas, sin tildes y sin
+    leetspeak (ver normalizacion.py); el texto se normaliza igual al analizarlo.
+
+    tolerancias (opcional) da, para cada patrón, la distancia de edición máxima
+    admitida; los patrones con tolerancia mayor que 0 se buscan con el motor
+    aproximado de Myers en lugar de los motores exactos.
+
+    Con palabras_completas=True los patrones exactos solo coinciden con palabras
+    o frases completas ("fea" no coincide dentro de "fealdad"), buscándolos sobre
+    la secuencia de palabras del texto en lugar de carácter a carácter. Los
+    patrones con tolerancia no se ven afectados: Myers los sigue buscando
+    carácter a carácter, así que pueden coincidir dentro de otras palabras.
+    """
+
+    def __init__(self, patterns, normalizar=False, tolerancias=None, palabras_completas=False):
+        # Copia inmutable para que cambios posteriores en la lista original no
+        # dejen las tablas desincronizadas
+        self.patterns = tuple(tuple(p) for p in patterns)
+        self.normalizar = normalizar
+        self.palabras_completas = palabras_completas
+        # Cadenas que se buscan realmente (normalizadas si corresponde)
+        self.strings = [normalizar_patron(pattern) if normalizar else pattern
+                        for pattern, _, _ in self.patterns]
+        self.max_length = max((len(pattern) for pattern in self.strings), default=0)
+
+        # Con tolerancia >= longitud cualquier posición coincidiría: se limita a m - 1
+        tolerancias = tolerancias or [0] * len(self.patterns)
+        self.tolerancias = [min(int(k), max(0, len(pattern) - 1))
+                            for k, pattern in zip(tolerancias, self.strings)]
+        self.aproximados = [index for index, k in enumerate(self.tolerancias) if k > 0]
+        self.peq = {index: myers_peq(self.strings[index]) for index in self.aproximados}
+
+        # En texto normalizado una coincidencia puede ocupar más caracteres
+        # originales (una marca combinante por letra como máximo en texto NFD)
+        factor = 2 if normalizar else 1
+
+        # Margen en caracteres originales que necesita cada final aproximado a cada
+        # lado para decidir si es el mínimo de su vecindario
+        self.margenes = {index: factor * dominance_radius(len(self.strings[index]), self.tolerancias[index])
+                         for index in self.aproximados}
+
+        # Solapamiento entre ventanas para no partir ninguna coincidencia. Una
+        # coincidencia aproximada ocupa hasta m + k caracteres y además necesita
+        # ver su vecindario completo; una frase puede tener varios espacios o
+        # signos entre palabras, así que se le reserva el doble de su longitud
+        span = 0
+        for pattern, k in zip(self.strings, self.tolerancias):
+            if k:
+                span = max(span, len(pattern) + k + 2 * dominance_radius(len(pattern), k) + 1)
+            elif palabras_completas:
+                span = max(span, 2 * len(pattern))
+            else:
+                span = max(span, len(pattern))
+        self.overlap = max(0, factor * span - 1)
+
+        # Patrones que se buscan de forma exacta ("" en el lugar de los aproximados)
+        self.exactos = [pattern if not k else "" for pattern, k in zip(self.strings, self.tolerancias)]
+
+        # Cantidad de patrones exactos por longitud, para el modelo de costos
+        self.length_counts = {}
+        for pattern in self.exactos:
+            if pattern:
+                self.length_counts[len(pattern)] = self.length_counts.get(len(pattern), 0) + 1
+
+        # Tablas por motor, indexadas igual que self.patterns (cada motor al primer uso)
+        self.tables = _TablasPorMotor(self.strings)
+
+        # Patrones en UTF-8 y sus tablas de 256 entradas, solo si se usa el motor de bytes
+        self._byte_tables = None
+
+    @cached_property
+    def automaton(self):
+        """Autómata para búsqueda simultánea de todos los patrones exactos"""
+        return build_automaton(self.exactos)
+
+    @cached_property
+    def word_patterns(self):
+        """Patrones exactos como tuplas de palabras"""
+        return [tokenize_pattern(pattern) for pattern in self.exactos]
+
+    @cached_property
+    def word_automaton(self):
+        """Autómata sobre palabras de los patrones exactos (None sin palabras completas)"""
+        return build_automaton(self.word_patterns) if self.palabras_completas else None
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def opciones(self):
+        """Argumentos con los que reconstruir un matcher equivalente (por ejemplo en otro proceso)"""
+        return {
+            'normalizar': self.normalizar,
+            'tolerancias': tuple(self.tolerancias),
+            'palabras_completas': self.palabras_completas,
+        }
+
+    def byte_tables(self):
+        """Retorna (patrones en UTF-8, tablas de mal carácter por byte), calculándolos al primer uso"""
+        if self._byte_tables is None:
+            # La búsqueda por bytes no decodifica el texto, así que usa los patrones originales
+            encoded = [pattern.encode('utf-8') for pattern, _, _ in self.patterns]
+            self._byte_tables = (encoded, [byte_bad_char_table(pattern) for pattern in encoded])
+        return self._byte_tables
+
+    def search(self, text, index, engine):
+        """Busca el patrón de índice dado con el motor indicado usando su tabla precalculada"""
+        pattern = self.strings[index]
+        if not pattern:
+            return []
+
+        search_function, _ = ENGINES[engine]
+        return search_function(text, pattern, self.tables[engine][index])
+
+    def search_approximate(self, text, index):
+        """Busca el patrón aproximado de índice dado: lista de (posicion, longitud, distancia)"""
+        return myers_search(text, self.strings[index], self.tolerancias[index], self.peq[index])
+
+    def search_words(self, text, partial_first=False, partial_last=False):
+        """Busca todos los patrones exactos como palabras completas: lista de (posicion, longitud, indice)"""
+        return word_search(text, self.word_patterns, self.word_automaton, partial_first, partial_last)
@@ -0,0 +1,185 @@
+# instrumentados.py
+# Variantes de los motores que cuentan comparaciones de caracteres y desplazamientos.
+# Reproducen paso a paso a los motores originales, que quedan sin ningún contador
+# para no pagar ese costo cuando las métricas están desactivadas.
+from .kmp import compute_lps
+from .boyer_moore import boyer_moore_preprocess, horspool_table, sunday_table
+from .aho_corasick import build_automaton
+
+
+def kmp_search_contado(text, pattern, lps=None):
+    """KMP con contadores: retorna (posiciones, comparaciones, desplazamientos)"""
+    n = len(text)
+    m = len(pattern)
+    if m == 0:
+        return [], 0, 0
+    if lps is None:
+        lps = compute_lps(pattern)
+
+    results = []
+    comparaciones = 0
+    desplazamientos = 0
+    i = 0
+    j = 0
+
+    while i < n:
+        comparaciones += 1
+        if pattern[j] == text[i]:
+            i += 1
+            j += 1
+
+        if j == m:
+            results.append(i - j)
+            j = lps[j - 1]
+            desplazamientos += 1
+        elif i < n:
+            comparaciones += 1
+            if pattern[j] != text[i]:
+                if j != 0:
+                    j = lps[j - 1]
+                else:
+                    i += 1
+                desplazamientos += 1
+
+    return results, comparaciones, desplazamientos
+
+
+def boyer_moore_search_contado(text, pattern, tables=None):
+    """Boyer-Moore completo (con Galil) con contadores"""
+    n = len(text)
+    m = len(pattern)
+    if m == 0:
+        return [], 0, 0
+    if tables is None:
+        tables = boyer_moore_preprocess(pattern)
+    bad_char, good_suffix = tables
+    period = good_suffix[0]
+
+    results = []
+    comparaciones = 0
+    desplazamientos = 0
+    s = 0
+    lower = 0
+
+    while s <= n - m:
+        j = m - 1
+        while j >= lower:
+            comparaciones += 1
+            if pattern[j] != text[s + j]:
+                break
+            j -= 1
+
+        if j < lower:
+            results.append(s)
+            s += period
+            lower = m - period
+        else:
+            bad_char_skip = j - bad_char.get(text[s + j], -1)
+            s += max(good_suffix[j + 1], bad_char_skip)
+            lower = 0
+        desplazamientos += 1
+
+    return results, comparaciones, desplazamientos
+
+
+def horspool_search_contado(text, pattern, table=None):
+    """Horspool con contadores"""
+    n = len(text)
+    m = len(pattern)
+    if m == 0:
+        return [], 0, 0
+    if table is None:
+        table = horspool_table(pattern)
+
+    results = []
+    comparaciones = 0
+    desplazamientos = 0
+    s = 0
+
+    while s <= n - m:
+        j = m - 1
+        while j >= 0:
+            comparaciones += 1
+            if pattern[j] != text[s + j]:
+                break
+            j -= 1
+
+        if j < 0:
+            results.append(s)
+
+        s += table.get(text[s + m - 1], m)
+        desplazamientos += 1
+
+    return results, comparaciones, desplazamientos
+
+
+def sunday_search_contado(text, pattern, table=None):
+    """Sunday con contadores"""
+    n = len(text)
+    m = len(pattern)
+    if m == 0:
+        return [], 0, 0
+    if table is None:
+        table = sunday_table(pattern)
+
+    results = []
+    comparaciones = 0
+    desplazamientos = 0
+    s = 0
+
+    while s <= n - m:
+        j = 0
+        while j < m:
+            comparaciones += 1
+            if pattern[j] != text[s + j]:
+                break
+            j += 1
+
+        if j == m:
+            results.append(s)
+
+        if s + m >= n:
+            break
+        s += table.get(text[s + m], m + 1)
+        desplazamientos += 1
+
+    return results, comparaciones, desplazamientos
+
+
+def aho_corasick_search_contado(text, patterns, automaton=None):
+    """
+    Aho-Corasick con contadores: cada transición consultada cuenta como una
+    comparación y cada enlace de fallo seguido como un desplazamiento
+    """
+    if automaton is None:
+        automaton = build_automaton(patterns)
+
+    goto, fail, output = automaton
+    lengths = [len(pattern) for pattern in patterns]
+
+    results = []
+    comparaciones = 0
+    desplazamientos = 0
+    state = 0
+
+    for i, char in enumerate(text):
+        comparaciones += 1
+        while state and char not in goto[state]:
+            state = fail[state]
+            desplazamientos += 1
+            comparaciones += 1
+        state = goto[state].get(char, 0)
+
+        for index in output[state]:
+            results.append((i - lengths[index] + 1, index))
+
+    return results, comparaciones, desplazamientos
+
+
+# Variantes contadas de los motores de un patrón, con la misma firma (texto, patrón, tabla)
+CONTADORES = {
+    "kmp": kmp_search_contado,
+    "boyer_moore": boyer_moore_search_contado,
+    "horspool": horspool_search_contado,
+    "sunday": sunday_search_contado,
+}
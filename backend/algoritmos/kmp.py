@@ -22,16 +22,17 @@ def compute_lps(pattern):
     return lps
 
 
-def kmp_search(text, pattern):
-    """Algoritmo KMP para búsqueda de patrones"""
+def kmp_search(text, pattern, lps=None):
+    """Algoritmo KMP para búsqueda de patrones (lps puede venir precalculada)"""
     n = len(text)
     m = len(pattern)
 
     if m == 0:
         return []
 
-    # Preprocesamiento: computar la tabla LPS
-    lps = compute_lps(pattern)
+    # Preprocesamiento: computar la tabla LPS si no se recibió
+    if lps is None:
+        lps = compute_lps(pattern)
 
     results = []
     i = 0  # índice para text
@@ -0,0 +1,137 @@
+# myers.py
+
+
+def myers_peq(pattern):
+    """
+    Máscaras de coincidencia del patrón: carácter -> bits de las posiciones donde aparece
+
+    Args:
+        pattern: cadena a buscar
+
+    Returns:
+        Diccionario carácter -> entero (bit i encendido si pattern[i] == carácter)
+    """
+    peq = {}
+    for i, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    return peq
+
+
+def dominance_radius(m, k):
+    """
+    Distancia entre finales dentro de la cual una coincidencia aproximada descarta a otra
+
+    Dos apariciones que no se solapan terminan al menos m - k caracteres aparte.
+    """
+    return max(1, m - 1 - k)
+
+
+def _best_start(text, end, pattern, k):
+    """
+    Inicio de la coincidencia aproximada que termina en end (exclusivo)
+
+    Programación dinámica anclada en end, recorriendo hacia atrás como mucho
+    m + k caracteres; entre los inicios con la distancia mínima se prefiere el
+    de longitud más parecida a la del patrón.
+    """
+    m = len(pattern)
+    lo = max(0, end - m - k)
+
+    # prev[i]: distancia entre pattern[m-i:] y los últimos j caracteres antes de end
+    prev = list(range(m + 1))
+    best_length = 0
+    best_distance = prev[m]
+
+    for j in range(1, end - lo + 1):
+        char = text[end - j]
+        cur = [j] + [0] * m
+        for i in range(1, m + 1):
+            cost = 0 if pattern[m - i] == char else 1
+            cur[i] = min(prev[i - 1] + cost, prev[i] + 1, cur[i - 1] + 1)
+
+        if cur[m] < best_distance or (cur[m] == best_distance and abs(j - m) < abs(best_length - m)):
+            best_distance = cur[m]
+            best_length = j
+        prev = cur
+
+    return end - best_length, best_distance
+
+
+def myers_search(text, pattern, k, peq=None):
+    """
+    Búsqueda aproximada con el algoritmo bit-paralelo de Myers
+
+    Encuentra las apariciones del patrón con distancia de edición (inserciones,
+    borrados y sustituciones) menor o igual a k. La columna de la matriz de
+    distancias se codifica en enteros de m bits, así que cada carácter del texto
+    cuesta O(⌈m/w⌉) operaciones de palabra: O(n·⌈m/w⌉) en total.
+
+    De los finales con distancia <= k se reporta solo el mínimo de su vecindario
+    (dominance_radius caracteres a cada lado), y su inicio se recupera con una
+    pequeña programación dinámica local.
+
+    Args:
+        text: texto donde buscar
+        pattern: patrón a buscar
+        k: distancia de edición máxima
+        peq: máscaras precalculadas con myers_peq (opcional)
+
+    Returns:
+        Lista de tuplas (posicion, longitud, distancia)
+    """
+    m = len(pattern)
+    if m == 0:
+        return []
+    if peq is None:
+        peq = myers_peq(pattern)
+
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv = full   # diferencias verticales +1
+    mv = 0      # diferencias verticales -1
+    score = m
+
+    # Finales con distancia <= k: (fin exclusivo, distancia)
+    hits = []
+    for j, char in enumerate(text):
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+
+        # La primera fila vale 0 en todas las columnas (el patrón puede empezar en cualquier lugar)
+        ph = (ph << 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+
+        if score <= k:
+            hits.append((j + 1, score))
+
+    # Se reporta un final solo si ningún otro final cercano tiene menor distancia
+    # (a igual distancia gana el último, que abarca más del patrón)
+    radius = dominance_radius(m, k)
+    results = []
+    lo = 0
+    hi = 0
+    for end, distance in hits:
+        while hits[lo][0] < end - radius:
+            lo += 1
+        while hi < len(hits) and hits[hi][0] <= end + radius:
+            hi += 1
+
+        if any(d < distance for e, d in hits[lo:hi] if e < end):
+            continue
+        if any(d <= distance for e, d in hits[lo:hi] if e > end):
+            continue
+
+        start, distance = _best_start(text, end, pattern, k)
+        results.append((start, end - start, distance))
+
+    return results
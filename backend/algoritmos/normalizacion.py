@@ -0,0 +1,60 @@
+# normalizacion.py
+import unicodedata
+from array import array
+
+
+# Sustituciones habituales de leetspeak
+SUSTITUCIONES_LEET = {'3': 'e', '@': 'a', '4': 'a', '0': 'o', '1': 'i', '$': 's', '5': 's'}
+
+
+def _construir_tabla():
+    """
+    Tabla única para str.translate: minúsculas, sin tildes y sin leetspeak
+
+    Todas las sustituciones son de un carácter por otro, de modo que las
+    posiciones se conservan; solo las marcas diacríticas combinantes sueltas
+    (texto en forma NFD) se eliminan.
+    """
+    tabla = {}
+
+    # Latín, griego y cirílico: letra base sin diacríticos y en minúscula
+    for codigo in range(0x500):
+        c = chr(codigo)
+        base = "".join(ch for ch in unicodedata.normalize('NFD', c) if not unicodedata.combining(ch))
+        base = base.casefold()
+        if len(base) == 1 and base != c:
+            tabla[codigo] = base
+
+    for codigo in range(0x300, 0x370):
+        tabla[codigo] = None
+
+    for origen, destino in SUSTITUCIONES_LEET.items():
+        tabla[ord(origen)] = destino
+
+    return tabla
+
+
+TABLA_NORMALIZACION = _construir_tabla()
+_ELIMINADOS = frozenset(codigo for codigo, valor in TABLA_NORMALIZACION.items() if valor is None)
+
+
+def normalizar_texto(texto):
+    """
+    Normaliza el texto para la búsqueda (ej. "Muérete" -> "muerete", "3stup1d0" -> "estupido")
+
+    Returns:
+        Tupla (normalizado, mapa). mapa es None si las posiciones no cambiaron;
+        si se eliminaron marcas combinantes, mapa[i] es la posición en el texto
+        original del carácter i del texto normalizado.
+    """
+    normalizado = texto.translate(TABLA_NORMALIZACION)
+    if len(normalizado) == len(texto):
+        return normalizado, None
+
+    mapa = array('l', (i for i, c in enumerate(texto) if ord(c) not in _ELIMINADOS))
+    return normalizado, mapa
+
+
+def normalizar_patron(patron):
+    """Normaliza un patrón con la misma tabla que el texto"""
+    return patron.translate(TABLA_NORMALIZACION)
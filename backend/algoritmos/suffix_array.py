@@ -0,0 +1,150 @@
+# suffix_array.py
+from array import array
+
+
+# Longitud de los prefijos con los que se hace la primera ordenación
+_PREFIJO_INICIAL = 16
+
+# Sufijos entre consultas de cancelación en build_lcp
+_PASOS_CANCELACION = 1 << 16
+
+
+def build_suffix_array(seq, progreso=None, cancelado=None):
+    """
+    Construye el arreglo de sufijos por duplicación de prefijos (Larsson-Sadakane)
+
+    Primero ordena los sufijos por sus primeros caracteres; después, en cada
+    ronda, reordena solo los grupos de sufijos aún empatados según el rango del
+    sufijo que empieza k posiciones más adelante, duplicando k. Así cada ronda
+    cuesta lo que miden los grupos pendientes y el total es O(n log n).
+
+    Args:
+        seq: cadena o arreglo de enteros (por ejemplo, identificadores de palabras)
+        progreso: función opcional que recibe, tras cada ronda, la fracción de
+                  sufijos que ya ocupan su posición definitiva
+        cancelado: función opcional sin argumentos que se consulta entre rondas;
+                   si retorna True la construcción se abandona
+
+    Returns:
+        array('l') con las posiciones iniciales de los sufijos en orden
+        lexicográfico, o None si se canceló
+    """
+    n = len(seq)
+    k = _PREFIJO_INICIAL
+    sa = sorted(range(n), key=lambda i: seq[i:i + k])
+
+    # rank[i]: última posición en sa del grupo de sufijos que comparten los
+    # primeros k elementos con el sufijo i
+    rank = [0] * n
+    groups = []
+    start = 0
+    for r in range(1, n + 1):
+        if r == n or seq[sa[r]:sa[r] + k] != seq[sa[r - 1]:sa[r - 1] + k]:
+            for p in sa[start:r]:
+                rank[p] = r - 1
+            if r - start > 1:
+                groups.append((start, r))
+            start = r
+
+    def second_key(i):
+        # Sin segunda mitad, el sufijo es menor que cualquiera que la tenga
+        return rank[i + k] if i + k < n else -1
+
+    while groups:
+        if cancelado is not None and cancelado():
+            return None
+        if progreso is not None:
+            progreso(1 - sum(b - a for a, b in groups) / n)
+
+        pending = []
+        for a, b in groups:
+            block = sorted(sa[a:b], key=second_key)
+            keys = [second_key(i) for i in block]
+            sa[a:b] = block
+
+            # Dividir el grupo según la segunda clave
+            start = 0
+            for r in range(1, b - a + 1):
+                if r == b - a or keys[r] != keys[r - 1]:
+                    for p in block[start:r]:
+                        rank[p] = a + r - 1
+                    if r - start > 1:
+                        pending.append((a + start, a + r))
+                    start = r
+        groups = pending
+        k *= 2
+
+    return array('l', sa)
+
+
+def build_lcp(seq, sa, cancelado=None):
+    """
+    Arreglo LCP con el algoritmo de Kasai en O(n)
+
+    cancelado es como en build_suffix_array; se consulta cada _PASOS_CANCELACION sufijos.
+
+    Returns:
+        array('l') donde lcp[r] es el prefijo común más largo entre los sufijos
+        sa[r - 1] y sa[r] (lcp[0] = 0), o None si se canceló
+    """
+    n = len(sa)
+    rank = [0] * n
+    for r, p in enumerate(sa):
+        rank[p] = r
+
+    lcp = array('l', bytes(n * array('l').itemsize))
+    h = 0
+    for i in range(n):
+        if cancelado is not None and not i % _PASOS_CANCELACION and cancelado():
+            return None
+        r = rank[i]
+        if r == 0:
+            h = 0
+            continue
+        j = sa[r - 1]
+        while i + h < n and j + h < n and seq[i + h] == seq[j + h]:
+            h += 1
+        lcp[r] = h
+        if h:
+            h -= 1
+
+    return lcp
+
+
+def suffix_array_search(seq, sa, lcp, pattern):
+    """
+    Busca todas las apariciones del patrón con búsqueda binaria sobre el arreglo de sufijos
+
+    La búsqueda binaria cuesta O(m log n) comparaciones; las demás apariciones
+    son los sufijos contiguos con lcp >= m, que se recorren sin comparar.
+
+    Args:
+        seq: la secuencia indexada (cadena o arreglo)
+        sa, lcp: arreglos construidos con build_suffix_array y build_lcp
+        pattern: subsecuencia a buscar, del mismo tipo que seq
+
+    Returns:
+        Lista ordenada de posiciones donde empieza el patrón
+    """
+    m = len(pattern)
+    n = len(sa)
+    if m == 0 or n == 0:
+        return []
+
+    lo = 0
+    hi = n
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if seq[sa[mid]:sa[mid] + m] < pattern:
+            lo = mid + 1
+        else:
+            hi = mid
+
+    if lo == n or seq[sa[lo]:sa[lo] + m] != pattern:
+        return []
+
+    end = lo + 1
+    while end < n and lcp[end] >= m:
+        end += 1
+
+    return sorted(sa[lo:end])
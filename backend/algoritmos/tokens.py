@@ -0,0 +1,72 @@
+# tokens.py
+from array import array
+import re
+
+from .aho_corasick import aho_corasick_search, build_automaton
+
+
+# Una palabra es una secuencia máxima de letras, dígitos o guiones bajos
+_PALABRA = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """
+    Divide el texto en palabras una sola vez
+
+    Returns:
+        Tupla (tokens, inicios, finales): la lista de palabras y dos arrays con
+        el offset de inicio y de fin (exclusivo) de cada una en el texto
+    """
+    tokens = []
+    starts = array('l')
+    ends = array('l')
+    for match in _PALABRA.finditer(text):
+        tokens.append(match.group())
+        starts.append(match.start())
+        ends.append(match.end())
+    return tokens, starts, ends
+
+
+def is_word_char(char):
+    """Indica si el carácter forma parte de una palabra"""
+    return _PALABRA.match(char) is not None
+
+
+def tokenize_pattern(pattern):
+    """Patrón como tupla de palabras ("te voy a matar" -> ("te", "voy", "a", "matar"))"""
+    return tuple(_PALABRA.findall(pattern))
+
+
+def word_search(text, patterns, automaton=None, partial_first=False, partial_last=False):
+    """
+    Busca patrones de palabras completas y frases sobre la secuencia de tokens
+
+    Como el autómata avanza palabra a palabra, "fea" nunca coincide dentro de
+    "fealdad" y "te voy a matar" coincide sin importar los espacios o signos
+    entre sus palabras: los límites de palabra los impone el propio motor.
+
+    Args:
+        text: texto a analizar
+        patterns: lista de tuplas de palabras (ver tokenize_pattern)
+        automaton: autómata construido con build_automaton sobre las mismas tuplas,
+            cuyo alfabeto son palabras en lugar de caracteres (opcional)
+        partial_first, partial_last: si el texto es un fragmento cortado a mitad
+            de palabra, la primera o la última palabra están incompletas y se ignoran
+
+    Returns:
+        Lista de tuplas (posicion, longitud, indice_patron) en caracteres del texto
+    """
+    if automaton is None:
+        automaton = build_automaton(patterns)
+
+    tokens, starts, ends = tokenize(text)
+    first = 1 if partial_first and tokens and starts[0] == 0 else 0
+    last = len(tokens) - 1 if partial_last and tokens and ends[-1] == len(text) else len(tokens)
+
+    results = []
+    for t, index in aho_corasick_search(tokens[first:last], patterns, automaton):
+        t += first
+        start = starts[t]
+        results.append((start, ends[t + len(patterns[index]) - 1] - start, index))
+
+    return results
@@ -1,2 +1,3 @@
 # Importaciones para facilitar el acceso a los modelos
-from .patrones import PatronesManager
\ No newline at end of file
+from .patrones import PatronesManager
+from .resultados import ResultadosColumnares, Coincidencia
\ No newline at end of file
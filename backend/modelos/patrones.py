@@ -1,19 +1,39 @@
 import pandas as pd
 import csv
+from backend.algoritmos.compiled_matcher import CompiledMatcher
 
 
 class PatronesManager:
-    def __init__(self, csv_path=None):
+    def __init__(self, csv_path=None, normalizar=True, palabras_completas=True):
         self.patrones = []
+        # Distancia de edición admitida para cada patrón (0 = coincidencia exacta)
+        self.tolerancias = []
+        # Buscar sin distinguir mayúsculas, tildes ni leetspeak ("Idi0ta" coincide con "idiota")
+        self.normalizar = normalizar
+        # Solo palabras o frases completas ("fea" no coincide dentro de "fealdad").
+        # Esta búsqueda tiene su propio motor: el modelo de costos y los motores de
+        # subcadenas (KMP, Boyer-Moore...) solo se usan con palabras_completas=False
+        self.palabras_completas = palabras_completas
+        self._matcher = None  # Matcher compilado en caché, se invalida al modificar patrones
         if csv_path:
             self.cargar_desde_csv(csv_path)
 
+    @staticmethod
+    def leer_csv(csv_path):
+        """Lee (patrones, tolerancias) de un archivo CSV (la columna Tolerancia es opcional)"""
+        df = pd.read_csv(csv_path)
+        patrones = list(zip(df['Patrón'], df['Tipo'], df['Nivel de Severidad']))
+        if 'Tolerancia' in df.columns:
+            tolerancias = [int(k) for k in df['Tolerancia'].fillna(0)]
+        else:
+            tolerancias = [0] * len(patrones)
+        return patrones, tolerancias
+
     def cargar_desde_csv(self, csv_path):
-        """Carga patrones desde un archivo CSV"""
+        """Carga patrones desde un archivo CSV, reemplazando los actuales"""
         try:
-            df = pd.read_csv(csv_path)
-            self.patrones = [(row['Patrón'], row['Tipo'], row['Nivel de Severidad'])
-                             for _, row in df.iterrows()]
+            self.patrones, self.tolerancias = self.leer_csv(csv_path)
+            self._matcher = None
             return True
         except Exception as e:
             print(f"Error al cargar CSV: {e}")
@@ -24,25 +44,52 @@ class PatronesManager:
         try:
             with open(csv_path, 'w', newline='', encoding='utf-8') as file:
                 writer = csv.writer(file)
-                writer.writerow(["Patrón", "Tipo", "Nivel de Severidad"])
-                for patron in self.patrones:
-                    writer.writerow(patron)
+                writer.writerow(["Patrón", "Tipo", "Nivel de Severidad", "Tolerancia"])
+                for patron, tolerancia in zip(self.patrones, self.tolerancias):
+                    writer.writerow((*patron, tolerancia))
             return True
         except Exception as e:
             print(f"Error al guardar CSV: {e}")
             return False
 
-    def agregar_patron(self, patron, tipo, nivel):
+    def agregar_patron(self, patron, tipo, nivel, tolerancia=0):
         """Agrega un nuevo patrón a la lista"""
         self.patrones.append((patron, tipo, nivel))
+        self.tolerancias.append(tolerancia)
+        self._matcher = None
+
+    def agregar_patrones(self, patrones, tolerancias=None):
+        """Agrega varios patrones (tuplas (patron, tipo, nivel)) de una sola vez"""
+        self.patrones.extend(patrones)
+        self.tolerancias.extend(tolerancias if tolerancias is not None else [0] * len(patrones))
+        self._matcher = None
 
     def eliminar_patron(self, indice):
         """Elimina un patrón por su índice"""
         if 0 <= indice < len(self.patrones):
             del self.patrones[indice]
+            del self.tolerancias[indice]
+            self._matcher = None
             return True
         return False
 
+    def cambiar_palabras_completas(self, palabras_completas):
+        """Elige entre buscar palabras completas o subcadenas en los próximos análisis"""
+        if palabras_completas != self.palabras_completas:
+            self.palabras_completas = palabras_completas
+            self._matcher = None
+
     def obtener_patrones(self):
         """Retorna la lista completa de patrones"""
-        return self.patrones
\ No newline at end of file
+        return self.patrones
+
+    def obtener_matcher(self):
+        """
+        Retorna el matcher compilado, construyéndolo solo si los patrones cambiaron
+
+        Los patrones se normalizan aquí, una vez por cada carga o modificación.
+        """
+        if self._matcher is None:
+            self._matcher = CompiledMatcher(self.patrones, self.normalizar, self.tolerancias,
+                                            self.palabras_completas)
+        return self._matcher
\ No newline at end of file
@@ -0,0 +1,274 @@
+from array import array
+from collections import Counter
+from collections.abc import Mapping
+
+
+CONTEXTO = 20  # caracteres de contexto a cada lado de una coincidencia
+
+# Motores que pueden reportar una coincidencia; la posición en la tupla es su id
+ALGORITMOS = ("kmp", "boyer_moore", "horspool", "sunday", "aho_corasick", "myers",
+              "palabras", "suffix_array", "horspool_bytes")
+_ID_ALGORITMO = {nombre: i for i, nombre in enumerate(ALGORITMOS)}
+
+# Claves de cada coincidencia vista como diccionario
+CLAVES = ('patron', 'tipo', 'nivel', 'posicion', 'longitud', 'contexto', 'algoritmo', 'distancia')
+_CAMPOS_PATRON = {'patron': 0, 'tipo': 1, 'nivel': 2}
+
+
+class Coincidencia(Mapping):
+    """
+    Vista de solo lectura de una fila de ResultadosColumnares
+
+    Se comporta como el diccionario de resultado de siempre ('patron', 'tipo',
+    'nivel', 'posicion', 'longitud', 'contexto', 'algoritmo', 'distancia'), pero
+    no copia nada: cada valor se lee de las columnas al consultarlo. 'longitud'
+    es la cantidad de caracteres del texto que cubre la coincidencia, que puede
+    diferir de la del patrón (normalización, tolerancias). Sigue siendo válida
+    mientras no se eliminen filas anteriores del contenedor.
+    """
+    __slots__ = ('resultados', 'indice')
+
+    def __init__(self, resultados, indice):
+        self.resultados = resultados
+        self.indice = indice
+
+    def __getitem__(self, clave):
+        resultados = self.resultados
+        i = self.indice
+        if clave in _CAMPOS_PATRON:
+            return resultados.patrones[resultados.id_patron[i]][_CAMPOS_PATRON[clave]]
+        if clave == 'posicion':
+            return resultados.posicion[i]
+        if clave == 'longitud':
+            return resultados.longitud[i]
+        if clave == 'contexto':
+            return resultados.contexto(i)
+        if clave == 'algoritmo':
+            return ALGORITMOS[resultados.id_algoritmo[i]]
+        if clave == 'distancia':
+            return resultados.distancia[i]
+        raise KeyError(clave)
+
+    def __iter__(self):
+        return iter(CLAVES)
+
+    def __len__(self):
+        return len(CLAVES)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class ResultadosColumnares:
+    """
+    Coincidencias guardadas por columnas en arrays compactos
+
+    Cada coincidencia ocupa unos 21 bytes en lugar de un diccionario con su propia
+    copia del contexto: id de patrón (int32, índice en la tabla de patrones),
+    offset absoluto (int64), id de algoritmo (int8, índice en ALGORITMOS),
+    longitud en el texto y distancia de edición (int32). Patrón, tipo y nivel
+    se guardan una sola vez en la tabla de patrones, y el contexto se extrae
+    del texto fuente solo cuando se pide.
+
+    Si el texto no se conserva (análisis por bloques de un archivo), el contexto
+    de cada fila se guarda al agregarla (contextos=True). Sin fuente ni contextos
+    (fragmentos de un worker paralelo), las filas toman el contexto del
+    contenedor al que se agregan con extend.
+
+    Se usa como una lista de diccionarios: len, índices e iteración devuelven
+    vistas Coincidencia.
+    """
+
+    def __init__(self, patrones=(), fuente=None, contextos=False):
+        self.patrones = list(patrones)
+        self.fuente = fuente
+        self.id_patron = array('i')
+        self.posicion = array('q')
+        self.id_algoritmo = array('b')
+        self.longitud = array('i')
+        self.distancia = array('i')
+        self.contextos = [] if contextos else None
+        self._ids_patron = None  # Tabla inversa patrón -> id, solo al combinar contenedores
+
+    def copia_vacia(self):
+        """Contenedor vacío con la misma tabla de patrones y la misma fuente"""
+        return ResultadosColumnares(self.patrones, self.fuente, self.contextos is not None)
+
+    def copia(self):
+        """Contenedor independiente con las mismas filas, sin recorrerlas una a una"""
+        nuevo = self.copia_vacia()
+        nuevo.id_patron = self.id_patron[:]
+        nuevo.posicion = self.posicion[:]
+        nuevo.id_algoritmo = self.id_algoritmo[:]
+        nuevo.longitud = self.longitud[:]
+        nuevo.distancia = self.distancia[:]
+        if self.contextos is not None:
+            nuevo.contextos = self.contextos[:]
+        return nuevo
+
+    def agregar(self, id_patron, posicion, longitud, algoritmo, distancia=0, contexto=None):
+        """Agrega una coincidencia (contexto solo se usa si el contenedor guarda contextos)"""
+        self.id_patron.append(id_patron)
+        self.posicion.append(posicion)
+        self.id_algoritmo.append(_ID_ALGORITMO[algoritmo])
+        self.longitud.append(longitud)
+        self.distancia.append(distancia)
+        if self.contextos is not None:
+            self.contextos.append(contexto)
+
+    def __len__(self):
+        return len(self.posicion)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.seleccionar(range(len(self))[i])
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("índice de coincidencia fuera de rango")
+        return Coincidencia(self, i)
+
+    def __iter__(self):
+        return (Coincidencia(self, i) for i in range(len(self)))
+
+    def patron(self, i):
+        """Tupla (patron, tipo, nivel) de la fila i"""
+        return self.patrones[self.id_patron[i]]
+
+    def contexto(self, i):
+        """
+        Texto alrededor de la coincidencia i
+
+        Sea extraído de la fuente o guardado al agregar la fila, la coincidencia
+        empieza en el carácter min(CONTEXTO, posicion) del contexto.
+        """
+        if self.contextos is not None:
+            return self.contextos[i]
+        if self.fuente is None:
+            raise ValueError("Los resultados no conservan el texto del que extraer el contexto")
+
+        pos = self.posicion[i]
+        return self.fuente[max(0, pos - CONTEXTO):pos + self.longitud[i] + CONTEXTO]
+
+    def fila(self, i):
+        """Diccionario independiente con los datos de la fila i"""
+        return dict(Coincidencia(self, i))
+
+    def clave(self, i):
+        """Identifica la fila i con independencia de la tabla de patrones del contenedor"""
+        return (self.patron(i), self.posicion[i], self.longitud[i],
+                self.id_algoritmo[i], self.distancia[i])
+
+    def contar(self, campo):
+        """Counter de los valores de 'patron', 'tipo', 'nivel' o 'algoritmo', sin recorrer vistas"""
+        conteo = Counter()
+        if campo == 'algoritmo':
+            for id_algoritmo, cantidad in Counter(self.id_algoritmo).items():
+                conteo[ALGORITMOS[id_algoritmo]] += cantidad
+        else:
+            j = _CAMPOS_PATRON[campo]
+            for id_patron, cantidad in Counter(self.id_patron).items():
+                conteo[self.patrones[id_patron][j]] += cantidad
+        return conteo
+
+    def materializar(self):
+        """Guarda el contexto de cada fila y suelta el texto fuente (p. ej. antes de enviarlo a otro proceso)"""
+        if self.contextos is None:
+            self.contextos = [self.contexto(i) for i in range(len(self))]
+        self.fuente = None
+
+    def _id_para(self, patron):
+        """Id de patron en la tabla del contenedor, agregándolo si no está"""
+        if self._ids_patron is None:
+            self._ids_patron = {}
+            for i, existente in enumerate(self.patrones):
+                self._ids_patron.setdefault(existente, i)
+
+        id_patron = self._ids_patron.get(patron)
+        if id_patron is None:
+            id_patron = len(self.patrones)
+            self.patrones.append(patron)
+            self._ids_patron[patron] = id_patron
+        return id_patron
+
+    def insertar(self, indice, otro):
+        """
+        Inserta las filas de otro contenedor antes de la fila indice
+
+        Los ids de patrón se traducen a la tabla de este contenedor. Un contenedor
+        vacío sin fuente adopta la fuente (o los contextos) del primero que recibe.
+        """
+        if not len(self) and self.fuente is None and self.contextos is None:
+            self.fuente = otro.fuente
+            if otro.contextos is not None:
+                self.contextos = []
+
+        if otro.patrones == self.patrones:
+            ids = otro.id_patron
+        else:
+            tabla = [self._id_para(patron) for patron in otro.patrones]
+            ids = array('i', [tabla[id_patron] for id_patron in otro.id_patron])
+
+        if self.contextos is None and otro.contextos is not None:
+            self.contextos = [self.contexto(i) for i in range(len(self))]
+        if self.contextos is not None:
+            contextos = otro.contextos
+            if contextos is None:
+                contextos = [otro.contexto(i) for i in range(len(otro))]
+            self.contextos[indice:indice] = contextos
+
+        self.id_patron[indice:indice] = ids
+        self.posicion[indice:indice] = otro.posicion
+        self.id_algoritmo[indice:indice] = otro.id_algoritmo
+        self.longitud[indice:indice] = otro.longitud
+        self.distancia[indice:indice] = otro.distancia
+
+    def extend(self, otro):
+        """Agrega al final las filas de otro contenedor"""
+        self.insertar(len(self), otro)
+
+    def seleccionar(self, indices):
+        """Nuevo contenedor con las filas indicadas, en ese orden"""
+        nuevo = self.copia_vacia()
+        nuevo.id_patron = array('i', [self.id_patron[i] for i in indices])
+        nuevo.posicion = array('q', [self.posicion[i] for i in indices])
+        nuevo.id_algoritmo = array('b', [self.id_algoritmo[i] for i in indices])
+        nuevo.longitud = array('i', [self.longitud[i] for i in indices])
+        nuevo.distancia = array('i', [self.distancia[i] for i in indices])
+        if self.contextos is not None:
+            nuevo.contextos = [self.contextos[i] for i in indices]
+        return nuevo
+
+    def ordenado(self):
+        """Nuevo contenedor con las filas ordenadas por posición (orden estable)"""
+        return self.seleccionar(sorted(range(len(self)), key=self.posicion.__getitem__))
+
+    def eliminar_rango(self, inicio, fin):
+        """Quita las filas [inicio, fin) y las retorna en un contenedor aparte"""
+        quitadas = self.seleccionar(range(inicio, fin))
+        for columna in (self.id_patron, self.posicion, self.id_algoritmo, self.longitud, self.distancia):
+            del columna[inicio:fin]
+        if self.contextos is not None:
+            del self.contextos[inicio:fin]
+        return quitadas
+
+    def eliminar(self, indices):
+        """Quita las filas indicadas"""
+        quitar = set(indices)
+        conservadas = self.seleccionar([i for i in range(len(self)) if i not in quitar])
+        self.id_patron = conservadas.id_patron
+        self.posicion = conservadas.posicion
+        self.id_algoritmo = conservadas.id_algoritmo
+        self.longitud = conservadas.longitud
+        self.distancia = conservadas.distancia
+        self.contextos = conservadas.contextos
+
+    def desplazar_filas(self, fila, delta):
+        """
+        Suma delta a la posición de las filas desde fila hasta el final
+
+        En un contenedor ordenado por posición son las coincidencias que empiezan
+        en bisect_left(posicion, desde) o después; las anteriores no se recorren.
+        """
+        if delta and fila < len(self):
+            self.posicion[fila:] = array('q', map(delta.__add__, self.posicion[fila:]))
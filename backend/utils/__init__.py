@@ -1,2 +1,6 @@
 # Importaciones para facilitar el acceso a las utilidades
-from .procesador_texto import detect_patterns, segment_text, select_search_algorithm
\ No newline at end of file
+from .procesador_texto import (detect_patterns, detect_patterns_stream, detect_patterns_mmap,
+                               iter_detect_patterns, iter_detect_patterns_stream,
+                               segment_text, select_search_algorithm)
+from .indice import IndiceSufijos, obtener_indice, detect_patterns_indexed
+from .sesion import SesionAnalisis
\ No newline at end of file
@@ -0,0 +1,130 @@
+from backend.modelos.resultados import ResultadosColumnares, ALGORITMOS
+from bisect import bisect_left, insort
+from backend.utils.metricas import percentiles_histograma
+from collections import Counter
+from datetime import datetime
+
+
+def contar_alertas(resultados):
+    """Counter de (tipo, nivel, algoritmo) -> alertas de un análisis"""
+    if isinstance(resultados, ResultadosColumnares):
+        # Se cuentan las columnas de ids; la tabla de patrones se consulta una vez por combinación
+        conteo = Counter()
+        for (id_patron, id_algoritmo), cantidad in Counter(zip(resultados.id_patron,
+                                                               resultados.id_algoritmo)).items():
+            _, tipo, nivel = resultados.patrones[id_patron]
+            conteo[(tipo, nivel, ALGORITMOS[id_algoritmo])] += cantidad
+        return conteo
+    return Counter((r['tipo'], r['nivel'], r['algoritmo']) for r in resultados)
+
+
+def inicio_de_hora(momento):
+    return momento.replace(minute=0, second=0, microsecond=0)
+
+
+class EstadisticasAgregadas:
+    """
+    Historial de alertas agregado por hora × tipo × nivel × algoritmo
+
+    No se guardan los resultados: cada análisis suma sus alertas a la cubeta de
+    su hora. Consultar un período es sumar las cubetas del rango, así que el
+    costo depende de las horas con datos y de las combinaciones distintas, no
+    del número de alertas acumuladas. La granularidad es de una hora: el
+    período incluye completa la hora en la que empieza.
+    """
+
+    def __init__(self):
+        self.horas = []    # inicios de hora con alertas, ordenados
+        self.cubetas = {}  # inicio de hora -> Counter((tipo, nivel, algoritmo) -> alertas)
+
+    def agregar(self, resultados, momento=None, al_guardar=None):
+        """Suma las alertas de un análisis a la cubeta de su hora y llama a al_guardar, si se indica"""
+        self.agregar_conteo(contar_alertas(resultados), momento)
+        if al_guardar is not None:
+            al_guardar()
+
+    def agregar_conteo(self, conteo, momento=None):
+        """Suma un conteo ya hecho (ver contar_alertas) a la cubeta de su hora"""
+        hora = inicio_de_hora(momento or datetime.now())
+        cubeta = self.cubetas.get(hora)
+        if cubeta is None:
+            cubeta = self.cubetas[hora] = Counter()
+            insort(self.horas, hora)
+        cubeta.update(conteo)
+
+    def totales(self, desde, hasta=None):
+        """
+        Suma las cubetas de [desde, hasta) (hasta=None: hasta ahora)
+
+        Returns:
+            Diccionario de Counter por 'tipo', 'nivel', 'algoritmo' y 'dia'
+            (día de la semana, 0 = lunes)
+        """
+        totales = {'tipo': Counter(), 'nivel': Counter(), 'algoritmo': Counter(), 'dia': Counter()}
+
+        inicio = bisect_left(self.horas, inicio_de_hora(desde))
+        fin = len(self.horas) if hasta is None else bisect_left(self.horas, hasta)
+        for hora in self.horas[inicio:fin]:
+            dia = hora.weekday()
+            for (tipo, nivel, algoritmo), cantidad in self.cubetas[hora].items():
+                totales['tipo'][tipo] += cantidad
+                totales['nivel'][nivel] += cantidad
+                totales['algoritmo'][algoritmo] += cantidad
+                totales['dia'][dia] += cantidad
+        return totales
+
+
+class LatenciasAgregadas:
+    """
+    Historial de latencias por llamada agregado por hora × motor en histogramas
+
+    Cada análisis suma el histograma de latencias de su objeto Metricas al de
+    su hora, así que la memoria queda acotada por las horas con datos, los
+    motores y las cubetas del histograma, y pedir los percentiles de un período
+    cuesta lo mismo sin importar cuántas llamadas se midieron. Las horas más antiguas que la retención se descartan.
+    """
+
+    def __init__(self, retencion=None):
+        self.retencion = retencion  # timedelta; None = sin límite
+        self.horas = []    # inicios de hora con latencias, ordenados
+        self.cubetas = {}  # inicio de hora -> {motor: Counter(cubeta -> llamadas)}
+
+    def agregar(self, metricas, momento=None, al_guardar=None):
+        """Suma al histograma de su hora las latencias de un objeto Metricas y llama a al_guardar, si se indica"""
+        momento = momento or datetime.now()
+        hora = inicio_de_hora(momento)
+        histogramas = self.cubetas.get(hora)
+        if histogramas is None:
+            histogramas = self.cubetas[hora] = {}
+            insort(self.horas, hora)
+
+        for motor, histograma in metricas.latencias.items():
+            histogramas.setdefault(motor, Counter()).update(histograma)
+
+        if self.retencion is not None:
+            self.descartar_anteriores(momento - self.retencion)
+        if al_guardar is not None:
+            al_guardar()
+
+    def descartar_anteriores(self, fecha):
+        """Elimina las horas que terminan antes de fecha"""
+        fin = bisect_left(self.horas, inicio_de_hora(fecha))
+        for hora in self.horas[:fin]:
+            del self.cubetas[hora]
+        del self.horas[:fin]
+
+    def percentiles(self, desde, ps=(50, 95, 99), hasta=None):
+        """
+        Percentiles (rango más cercano) de la latencia por llamada de cada motor en [desde, hasta)
+
+        Returns:
+            Diccionario motor -> lista de percentiles en segundos, con los motores
+            en orden de primera aparición
+        """
+        combinados = {}
+        inicio = bisect_left(self.horas, inicio_de_hora(desde))
+        fin = len(self.horas) if hasta is None else bisect_left(self.horas, hasta)
+        for hora in self.horas[inicio:fin]:
+            for motor, histograma in self.cubetas[hora].items():
+                combinados.setdefault(motor, Counter()).update(histograma)
+        return {motor: percentiles_histograma(histograma, ps) for motor, histograma in combinados.items()}
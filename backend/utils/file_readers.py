@@ -1,11 +1,14 @@
 
 import os
-import pytesseract
-from PIL import Image
-import PyPDF2
-import docx
 import csv
 
+# pytesseract, PIL, PyPDF2 y docx se importan en su lector: la interfaz usa este
+# módulo para los archivos de texto aunque esas dependencias no estén instaladas
+
+# Extensiones que read_file sabe procesar
+EXTENSIONES_IMAGEN = ['.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.gif']
+EXTENSIONES_SOPORTADAS = ['.txt', '.csv', '.pdf', '.docx'] + EXTENSIONES_IMAGEN
+
 def read_text_file(file_path):
     """Lee un archivo de texto plano."""
     try:
@@ -16,6 +19,24 @@ def read_text_file(file_path):
         with open(file_path, 'r', encoding='latin-1') as file:
             return file.read()
 
+def open_text_stream(file_path, sample_size=64 * 1024):
+    """
+    Abre un archivo de texto plano para leerlo por bloques sin cargarlo entero.
+
+    La codificación se decide con una muestra inicial: utf-8 si la muestra es
+    válida, latin-1 en caso contrario. Si más adelante aparece un byte que no es
+    utf-8 válido se sustituye por U+FFFD en lugar de interrumpir la lectura.
+    """
+    with open(file_path, 'rb') as file:
+        sample = file.read(sample_size)
+    try:
+        # Un carácter multibyte puede quedar cortado al final de la muestra
+        sample.decode('utf-8')
+        encoding = 'utf-8'
+    except UnicodeDecodeError as e:
+        encoding = 'utf-8' if e.start >= len(sample) - 3 and len(sample) == sample_size else 'latin-1'
+    return open(file_path, 'r', encoding=encoding, errors='replace')
+
 def read_csv_file(file_path):
     """Lee un archivo CSV y extrae el texto de la columna de mensajes."""
     messages = []
@@ -40,6 +61,7 @@ def read_csv_file(file_path):
 
 def read_pdf_file(file_path):
     """Extrae texto de un archivo PDF."""
+    import PyPDF2
     text = ""
     with open(file_path, 'rb') as file:
         pdf_reader = PyPDF2.PdfReader(file)
@@ -50,6 +72,7 @@ def read_pdf_file(file_path):
 
 def read_docx_file(file_path):
     """Extrae texto de un archivo DOCX."""
+    import docx
     doc = docx.Document(file_path)
     full_text = []
     for para in doc.paragraphs:
@@ -58,6 +81,8 @@ def read_docx_file(file_path):
 
 def read_image_file(file_path):
     """Extrae texto de una imagen usando OCR."""
+    import pytesseract
+    from PIL import Image
     try:
         image = Image.open(file_path)
         text = pytesseract.image_to_string(image, lang='spa+eng')
@@ -77,7 +102,7 @@ def read_file(file_path):
         return read_pdf_file(file_path)
     elif ext == '.docx':
         return read_docx_file(file_path)
-    elif ext in ['.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.gif']:
+    elif ext in EXTENSIONES_IMAGEN:
         return read_image_file(file_path)
     else:
         return f"Formato de archivo no soportado: {ext}"
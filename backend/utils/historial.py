@@ -0,0 +1,258 @@
+from backend.modelos.resultados import ResultadosColumnares, ALGORITMOS
+from backend.utils.estadisticas import EstadisticasAgregadas, contar_alertas, inicio_de_hora
+from backend.utils.metricas import percentiles_histograma
+from collections import Counter
+from datetime import datetime
+import atexit
+import queue
+import sqlite3
+import threading
+
+
+RUTA_HISTORIAL = "data/historial.db"
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS analisis (
+    id INTEGER PRIMARY KEY,
+    momento TEXT NOT NULL,
+    alertas INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS alertas (
+    analisis_id INTEGER NOT NULL REFERENCES analisis(id),
+    momento TEXT NOT NULL,
+    patron TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    nivel TEXT NOT NULL,
+    algoritmo TEXT NOT NULL,
+    posicion INTEGER NOT NULL,
+    distancia INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS alertas_momento ON alertas(momento);
+-- Los gráficos se leen de cubetas: tipo y nivel no necesitan índice en alertas
+DROP INDEX IF EXISTS alertas_tipo;
+DROP INDEX IF EXISTS alertas_nivel;
+CREATE TABLE IF NOT EXISTS cubetas (
+    hora TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    nivel TEXT NOT NULL,
+    algoritmo TEXT NOT NULL,
+    alertas INTEGER NOT NULL,
+    PRIMARY KEY (hora, tipo, nivel, algoritmo)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS latencias (
+    hora TEXT NOT NULL,
+    motor TEXT NOT NULL,
+    cubeta INTEGER NOT NULL,
+    llamadas INTEGER NOT NULL,
+    PRIMARY KEY (hora, motor, cubeta)
+) WITHOUT ROWID;
+"""
+
+
+def _texto(momento):
+    """Fecha local en ISO ('AAAA-MM-DD HH:MM:SS'): se ordena igual como texto que como fecha"""
+    return momento.isoformat(sep=' ', timespec='seconds')
+
+
+def _filas_alertas(resultados, analisis_id, momento):
+    """Genera las filas de la tabla alertas sin crear un diccionario por coincidencia"""
+    if isinstance(resultados, ResultadosColumnares):
+        patrones = resultados.patrones
+        for id_patron, posicion, id_algoritmo, distancia in zip(resultados.id_patron, resultados.posicion,
+                                                                 resultados.id_algoritmo, resultados.distancia):
+            patron, tipo, nivel = patrones[id_patron]
+            yield analisis_id, momento, patron, tipo, nivel, ALGORITMOS[id_algoritmo], posicion, distancia
+    else:
+        for r in resultados:
+            yield (analisis_id, momento, r['patron'], r['tipo'], r['nivel'], r['algoritmo'],
+                   r['posicion'], r.get('distancia', 0))
+
+
+def _guardar_analisis(conexion, resultados, momento):
+    """Inserta un análisis, sus alertas y la suma de sus alertas en la cubeta de su hora"""
+    texto = _texto(momento)
+    hora = _texto(inicio_de_hora(momento))
+    conteo = contar_alertas(resultados)
+
+    cursor = conexion.execute("INSERT INTO analisis (momento, alertas) VALUES (?, ?)",
+                              (texto, sum(conteo.values())))
+    analisis_id = cursor.lastrowid
+    # executemany consume el generador por lotes dentro de la misma transacción
+    conexion.executemany("INSERT INTO alertas VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                         _filas_alertas(resultados, analisis_id, texto))
+    conexion.executemany(
+        "INSERT INTO cubetas VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (hora, tipo, nivel, algoritmo) DO UPDATE SET alertas = alertas + excluded.alertas",
+        [(hora, tipo, nivel, algoritmo, cantidad) for (tipo, nivel, algoritmo), cantidad in conteo.items()])
+
+
+def _guardar_latencias(conexion, histogramas, momento):
+    """Suma los histogramas de latencia (motor -> Counter(cubeta -> llamadas)) a los de su hora"""
+    hora = _texto(inicio_de_hora(momento))
+    conexion.executemany(
+        "INSERT INTO latencias VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (hora, motor, cubeta) DO UPDATE SET llamadas = llamadas + excluded.llamadas",
+        [(hora, motor, cubeta, llamadas)
+         for motor, histograma in histogramas.items() for cubeta, llamadas in histograma.items()])
+
+
+class HistorialAnalisis:
+    """
+    Historial persistente de análisis y alertas en una base SQLite local
+
+    Cada análisis se guarda en una sola transacción: una fila en analisis, una
+    por alerta en alertas y la suma de sus alertas en la cubeta de su hora
+    (tabla cubetas), de la que salen los gráficos con un GROUP BY. Al abrir no
+    se carga nada en memoria: cada consulta pide a SQLite solo los agregados
+    del período.
+
+    Las escrituras no bloquean a quien llama (la interfaz): agregar copia los
+    resultados y los encola para un hilo de escritura con su propia conexión,
+    que los guarda en orden y avisa con al_guardar. Las consultas usan la
+    conexión del hilo que abrió el historial; con WAL no esperan a las
+    escrituras, pero solo ven los análisis ya guardados.
+
+    Tiene la misma interfaz que EstadisticasAgregadas (agregar y totales); las
+    latencias por motor se guardan en la misma base (atributo latencias, con la
+    interfaz de LatenciasAgregadas).
+    """
+
+    def __init__(self, ruta=RUTA_HISTORIAL):
+        self.ruta = ruta
+        self.conexion = self._conectar()
+        self.conexion.executescript(_ESQUEMA)
+        self.latencias = LatenciasHistorial(self)
+
+        self._pendientes = queue.Queue()
+        self._escritor = threading.Thread(target=self._escribir, name="historial", daemon=True)
+        self._escritor.start()
+        # Lo encolado al salir de la aplicación se guarda antes de terminar
+        atexit.register(self.cerrar)
+
+    def _conectar(self):
+        conexion = sqlite3.connect(self.ruta)
+        # WAL: las escrituras no bloquean las lecturas y cada transacción cuesta menos
+        conexion.execute("PRAGMA journal_mode=WAL")
+        conexion.execute("PRAGMA synchronous=NORMAL")
+        return conexion
+
+    def _escribir(self):
+        """Hilo de escritura: guarda lo encolado en orden, una transacción por elemento"""
+        conexion = self._conectar()
+        while True:
+            tarea = self._pendientes.get()
+            try:
+                if tarea is None:
+                    break
+                guardar, datos, momento, al_guardar = tarea
+                try:
+                    with conexion:
+                        guardar(conexion, datos, momento)
+                except sqlite3.Error as e:
+                    print(f"Error al guardar en el historial: {e}")
+                    continue
+                if al_guardar is not None:
+                    al_guardar()
+            finally:
+                self._pendientes.task_done()
+        conexion.close()
+
+    def _encolar(self, guardar, datos, momento, al_guardar):
+        if self._escritor.is_alive():
+            self._pendientes.put((guardar, datos, momento or datetime.now(), al_guardar))
+
+    def agregar(self, resultados, momento=None, al_guardar=None):
+        """
+        Encola un análisis con todas sus alertas para guardarlo en segundo plano
+
+        Los resultados se copian (en un ResultadosColumnares, solo sus columnas),
+        así que pueden seguir modificándose. al_guardar se llama sin argumentos
+        desde el hilo de escritura una vez guardado el análisis.
+        """
+        if isinstance(resultados, ResultadosColumnares):
+            copia = resultados.copia()
+        else:
+            copia = [dict(r) for r in resultados]
+        self._encolar(_guardar_analisis, copia, momento, al_guardar)
+
+    def esperar(self):
+        """Espera a que se guarde todo lo encolado"""
+        self._pendientes.join()
+
+    def totales(self, desde, hasta=None):
+        """
+        Suma las cubetas de [desde, hasta) (hasta=None: hasta ahora)
+
+        Returns:
+            Diccionario de Counter por 'tipo', 'nivel', 'algoritmo' y 'dia'
+            (día de la semana, 0 = lunes), como EstadisticasAgregadas.totales
+        """
+        consulta = ("SELECT tipo, nivel, algoritmo, CAST(strftime('%w', hora) AS INTEGER), SUM(alertas) "
+                    "FROM cubetas WHERE hora >= ?")
+        parametros = [_texto(inicio_de_hora(desde))]
+        if hasta is not None:
+            consulta += " AND hora < ?"
+            parametros.append(_texto(hasta))
+        consulta += " GROUP BY 1, 2, 3, 4"
+
+        totales = {'tipo': Counter(), 'nivel': Counter(), 'algoritmo': Counter(), 'dia': Counter()}
+        for tipo, nivel, algoritmo, dia, cantidad in self.conexion.execute(consulta, parametros):
+            totales['tipo'][tipo] += cantidad
+            totales['nivel'][nivel] += cantidad
+            totales['algoritmo'][algoritmo] += cantidad
+            totales['dia'][(dia + 6) % 7] += cantidad  # SQLite: 0 = domingo
+        return totales
+
+    def cerrar(self):
+        """Guarda lo pendiente y cierra las conexiones (se puede llamar más de una vez)"""
+        if self._escritor.is_alive():
+            self._pendientes.put(None)
+            self._escritor.join()
+        self.conexion.close()
+
+
+class LatenciasHistorial:
+    """
+    Histogramas de latencia por hora y motor guardados en la base del historial
+
+    Misma interfaz que LatenciasAgregadas (agregar y percentiles), pero las
+    cubetas viven en la tabla latencias y se escriben en el hilo de escritura
+    del historial, así que sobreviven al cierre de la aplicación.
+    """
+
+    def __init__(self, historial):
+        self.historial = historial
+
+    def agregar(self, metricas, momento=None, al_guardar=None):
+        """Encola los histogramas de latencia de un objeto Metricas para sumarlos a los de su hora"""
+        histogramas = {motor: Counter(histograma) for motor, histograma in metricas.latencias.items()}
+        self.historial._encolar(_guardar_latencias, histogramas, momento, al_guardar)
+
+    def percentiles(self, desde, ps=(50, 95, 99), hasta=None):
+        """
+        Percentiles de la latencia por llamada de cada motor en [desde, hasta)
+
+        Returns:
+            Diccionario motor -> lista de percentiles en segundos, como
+            LatenciasAgregadas.percentiles
+        """
+        consulta = "SELECT motor, cubeta, SUM(llamadas) FROM latencias WHERE hora >= ?"
+        parametros = [_texto(inicio_de_hora(desde))]
+        if hasta is not None:
+            consulta += " AND hora < ?"
+            parametros.append(_texto(hasta))
+        consulta += " GROUP BY motor, cubeta ORDER BY MIN(hora), motor"
+
+        histogramas = {}
+        for motor, cubeta, llamadas in self.historial.conexion.execute(consulta, parametros):
+            histogramas.setdefault(motor, Counter())[cubeta] = llamadas
+        return {motor: percentiles_histograma(histograma, ps) for motor, histograma in histogramas.items()}
+
+
+def abrir_historial(ruta=RUTA_HISTORIAL):
+    """Historial persistente en ruta o, si no se puede abrir la base, uno en memoria"""
+    try:
+        return HistorialAnalisis(ruta)
+    except sqlite3.Error as e:
+        print(f"Error al abrir el historial: {e}")
+        return EstadisticasAgregadas()
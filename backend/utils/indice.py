@@ -0,0 +1,250 @@
+from backend.algoritmos.compiled_matcher import CompiledMatcher
+from backend.algoritmos.normalizacion import normalizar_texto
+from backend.algoritmos.suffix_array import build_suffix_array, build_lcp, suffix_array_search
+from backend.algoritmos.tokens import tokenize
+from backend.utils.procesador_texto import _agregar_resultado, _nuevos_resultados, _ubicar
+from array import array
+import hashlib
+import struct
+import time
+
+
+# Cabecera del archivo de índice: marca, normalizar, palabras_completas, tamaño
+# de los enteros, SHA-1 del texto, longitud de la secuencia indexada y bytes del
+# vocabulario (solo con palabras completas)
+_MARCA = b'SUFIJOS1'
+_CABECERA = struct.Struct('<8sBBB20sqq')
+
+EXTENSION_INDICE = '.sufijos'
+
+# Textos más largos no se indexan: el índice en disco ocupa unas 7 veces el
+# texto (más con palabras completas) y construirlo en Python tarda minutos
+TAMANO_MAXIMO_INDICE = 4 * 1024 * 1024  # caracteres
+
+
+def _huella(texto):
+    return hashlib.sha1(texto.encode('utf-8', 'surrogatepass')).digest()
+
+
+class IndiceSufijos:
+    """
+    Índice de un texto ya analizado: arreglo de sufijos con su arreglo LCP
+
+    Construirlo cuesta O(n log n) una sola vez; después cada patrón se busca
+    en O(m log n) en lugar de recorrer todo el texto, lo que conviene cuando se
+    vuelve a analizar el mismo historial tras editar los patrones.
+
+    El índice se construye sobre el texto tal como lo ve el matcher: normalizado
+    si normalizar=True, y como secuencia de palabras si palabras_completas=True
+    (cada palabra distinta recibe un identificador entero).
+    """
+
+    def __init__(self, texto, normalizar=False, palabras_completas=False):
+        self._preparar(texto, normalizar, palabras_completas)
+        self._indexar()
+
+    @classmethod
+    def construir(cls, texto, normalizar=False, palabras_completas=False, progreso=None, cancelado=None):
+        """
+        Construye el índice informando el avance y atendiendo cancelaciones
+
+        progreso y cancelado se pasan a build_suffix_array (cancelado también a
+        build_lcp). Retorna el índice, o None si se canceló antes de terminar.
+        """
+        indice = cls.__new__(cls)
+        indice._preparar(texto, normalizar, palabras_completas)
+        return indice if indice._indexar(progreso, cancelado) else None
+
+    def _indexar(self, progreso=None, cancelado=None):
+        """Construye la secuencia indexada y los arreglos; retorna False si se canceló"""
+        if self.palabras_completas:
+            tokens, self.inicios, self.finales = tokenize(self.normalizado)
+            # Identificadores por orden de primera aparición
+            self.ids = {}
+            self.secuencia = array('l', (self.ids.setdefault(token, len(self.ids)) for token in tokens))
+        else:
+            self.secuencia = self.normalizado
+
+        self.sa = build_suffix_array(self.secuencia, progreso, cancelado)
+        if self.sa is None:
+            return False
+        self.lcp = build_lcp(self.secuencia, self.sa, cancelado)
+        return self.lcp is not None
+
+    def _preparar(self, texto, normalizar, palabras_completas):
+        self.texto = texto
+        self.normalizar = normalizar
+        self.palabras_completas = palabras_completas
+        self.huella = _huella(texto)
+
+        if normalizar:
+            self.normalizado, self.mapa = normalizar_texto(texto)
+        else:
+            self.normalizado, self.mapa = texto, None
+
+    def compatible(self, matcher):
+        """Indica si el índice se construyó con las mismas opciones que el matcher"""
+        return (self.normalizar == matcher.normalizar
+                and self.palabras_completas == matcher.palabras_completas)
+
+    def buscar(self, index, matcher):
+        """
+        Apariciones exactas del patrón de índice dado
+
+        Returns:
+            Lista de tuplas (posicion, longitud) en caracteres del texto normalizado
+        """
+        if self.palabras_completas:
+            palabras = matcher.word_patterns[index]
+            if not palabras or any(palabra not in self.ids for palabra in palabras):
+                return []
+            patron = array('l', (self.ids[palabra] for palabra in palabras))
+            return [(self.inicios[t], self.finales[t + len(patron) - 1] - self.inicios[t])
+                    for t in suffix_array_search(self.secuencia, self.sa, self.lcp, patron)]
+
+        patron = matcher.strings[index]
+        return [(pos, len(patron)) for pos in suffix_array_search(self.secuencia, self.sa, self.lcp, patron)]
+
+    def guardar(self, ruta):
+        """
+        Guarda los arreglos en disco; del texto solo se guarda su huella
+
+        Con palabras completas se guardan también las palabras y sus offsets,
+        para no volver a dividir el texto al cargarlo.
+        """
+        vocabulario = b''
+        if self.palabras_completas:
+            vocabulario = '\n'.join(self.ids).encode('utf-8', 'surrogatepass')
+
+        with open(ruta, 'wb') as archivo:
+            archivo.write(_CABECERA.pack(_MARCA, self.normalizar, self.palabras_completas,
+                                         self.sa.itemsize, self.huella, len(self.sa), len(vocabulario)))
+            self.sa.tofile(archivo)
+            self.lcp.tofile(archivo)
+            if self.palabras_completas:
+                self.secuencia.tofile(archivo)
+                self.inicios.tofile(archivo)
+                self.finales.tofile(archivo)
+                archivo.write(vocabulario)
+
+    @classmethod
+    def cargar(cls, ruta, texto, normalizar=False, palabras_completas=False):
+        """
+        Carga un índice guardado con guardar()
+
+        Returns:
+            El índice, o None si no existe, está dañado, se construyó con otras
+            opciones o el texto cambió desde que se guardó
+        """
+        indice = cls.__new__(cls)
+        try:
+            with open(ruta, 'rb') as archivo:
+                marca, norm, palabras, tamano, huella, n, bytes_vocabulario = _CABECERA.unpack(
+                    archivo.read(_CABECERA.size))
+                if (marca != _MARCA or bool(norm) != normalizar or bool(palabras) != palabras_completas
+                        or tamano != array('l').itemsize or huella != _huella(texto)):
+                    return None
+
+                indice._preparar(texto, normalizar, palabras_completas)
+                indice.sa = array('l')
+                indice.sa.fromfile(archivo, n)
+                indice.lcp = array('l')
+                indice.lcp.fromfile(archivo, n)
+
+                if palabras_completas:
+                    for nombre in ('secuencia', 'inicios', 'finales'):
+                        arreglo = array('l')
+                        arreglo.fromfile(archivo, n)
+                        setattr(indice, nombre, arreglo)
+                    vocabulario = archivo.read(bytes_vocabulario).decode('utf-8', 'surrogatepass')
+                    indice.ids = {palabra: i for i, palabra in enumerate(vocabulario.split('\n'))} if n else {}
+                else:
+                    indice.secuencia = indice.normalizado
+        except (OSError, EOFError, UnicodeDecodeError, struct.error):
+            return None
+
+        return indice
+
+
+def ruta_indice(ruta):
+    """Ruta del índice que acompaña a un archivo (chat.txt -> chat.txt.sufijos)"""
+    return ruta + EXTENSION_INDICE
+
+
+def obtener_indice(ruta, texto, matcher, progreso=None, cancelado=None):
+    """
+    Retorna el índice del archivo, cargándolo de disco o construyéndolo y guardándolo
+
+    Args:
+        ruta: archivo del que proviene el texto; el índice se guarda a su lado
+        texto: contenido del archivo
+        matcher: CompiledMatcher cuyas opciones (normalizar, palabras completas) debe respetar
+        progreso, cancelado: como en IndiceSufijos.construir
+
+    Returns:
+        El índice, o None si el texto supera TAMANO_MAXIMO_INDICE o se canceló
+        la construcción; el llamador debe entonces recorrer el texto
+    """
+    if len(texto) > TAMANO_MAXIMO_INDICE:
+        return None
+
+    indice = IndiceSufijos.cargar(ruta_indice(ruta), texto, matcher.normalizar, matcher.palabras_completas)
+    if indice is None:
+        indice = IndiceSufijos.construir(texto, matcher.normalizar, matcher.palabras_completas,
+                                         progreso, cancelado)
+        if indice is None:
+            return None
+        try:
+            indice.guardar(ruta_indice(ruta))
+        except OSError:
+            pass  # Sin permiso de escritura: se usa el índice solo en memoria
+    return indice
+
+
+def detect_patterns_indexed(indice, patterns, metricas=None):
+    """
+    Igual que detect_patterns, pero consultando el índice en lugar de recorrer el texto
+
+    Los patrones exactos se buscan en O(m log n) cada uno; los que tienen
+    tolerancia (búsqueda aproximada) requieren igualmente una pasada de Myers.
+
+    Args:
+        indice: IndiceSufijos del texto (ver obtener_indice)
+        patterns: lista de tuplas (patron, tipo, nivel) o un CompiledMatcher con
+                  las mismas opciones con que se construyó el índice
+        metricas: igual que en detect_patterns
+
+    Returns:
+        Las mismas coincidencias que detect_patterns, agrupadas por patrón
+    """
+    matcher = patterns if isinstance(patterns, CompiledMatcher) else CompiledMatcher(
+        patterns, indice.normalizar, palabras_completas=indice.palabras_completas)
+    if not indice.compatible(matcher):
+        raise ValueError("El índice se construyó con otras opciones de normalización o de palabras completas")
+
+    if metricas is not None:
+        inicio_total = time.perf_counter()
+
+    texto = indice.texto
+    results = _nuevos_resultados(texto, matcher)
+    for index in range(len(matcher.patterns)):
+        k = matcher.tolerancias[index]
+        inicio = time.perf_counter()
+        if k:
+            matches = matcher.search_approximate(indice.normalizado, index)
+            motor = "myers"
+        else:
+            matches = [(pos, longitud, 0) for pos, longitud in indice.buscar(index, matcher)]
+            motor = "suffix_array"
+        if metricas is not None:
+            caracteres = len(indice.normalizado) if k else len(matcher.strings[index])
+            metricas.registrar_llamada(motor, time.perf_counter() - inicio, caracteres)
+
+        for pos, longitud, distancia in matches:
+            start, end = _ubicar(pos, longitud, indice.mapa)
+            _agregar_resultado(results, texto, start, index, motor, 0, end - start, distancia)
+
+    if metricas is not None:
+        metricas.tiempo_total += time.perf_counter() - inicio_total
+
+    return results
@@ -0,0 +1,118 @@
+from collections import Counter
+import math
+
+
+# Histograma de latencias: cubetas logarítmicas de 1/DIVISIONES_OCTAVA de octava
+# a partir de LATENCIA_MINIMA; el valor que representa a cada cubeta se aleja a
+# lo sumo un 4,4 % de las latencias que contiene
+LATENCIA_MINIMA = 1e-7  # segundos
+DIVISIONES_OCTAVA = 8
+
+
+def cubeta_latencia(segundos):
+    """Índice de la cubeta del histograma donde cae una latencia"""
+    if segundos <= LATENCIA_MINIMA:
+        return 0
+    return int(math.log2(segundos / LATENCIA_MINIMA) * DIVISIONES_OCTAVA)
+
+
+def valor_cubeta(indice):
+    """Latencia que representa a una cubeta (su centro geométrico), en segundos"""
+    return LATENCIA_MINIMA * 2 ** ((indice + 0.5) / DIVISIONES_OCTAVA)
+
+
+def percentiles_histograma(histograma, ps=(50, 95, 99)):
+    """Percentiles (rango más cercano) de un Counter(cubeta -> llamadas), en segundos"""
+    total = sum(histograma.values())
+    if not total:
+        return [0.0 for _ in ps]
+    cubetas = sorted(histograma.items())
+    valores = []
+    for p in ps:
+        rango = min(total, max(1, -(-p * total // 100)))
+        acumulado = 0
+        for indice, llamadas in cubetas:
+            acumulado += llamadas
+            if acumulado >= rango:
+                valores.append(valor_cubeta(indice))
+                break
+    return valores
+
+
+class Metricas:
+    """
+    Tiempos por llamada, comparaciones de caracteres y desplazamientos por motor
+
+    Se pasa como argumento metricas= a detect_patterns y sus variantes. Cuando
+    no se pasa (None) el análisis no mide nada y usa los motores sin contadores,
+    así que desactivarlas no tiene costo. Las latencias se acumulan en un
+    histograma por motor (ver cubeta_latencia), de modo que la memoria no crece
+    con el número de llamadas. Contar comparaciones requiere repetir cada
+    búsqueda con la variante instrumentada, por eso solo se hace con
+    contar_operaciones=True; el tiempo medido es siempre el del motor real.
+    """
+
+    def __init__(self, contar_operaciones=False):
+        self.contar_operaciones = contar_operaciones
+        self.latencias = {}        # motor -> Counter(cubeta -> llamadas)
+        self.llamadas = {}         # motor -> llamadas registradas
+        self.tiempos = {}          # motor -> segundos sumados de todas sus llamadas
+        self.caracteres = {}       # motor -> caracteres recorridos
+        self.comparaciones = {}    # motor -> comparaciones de caracteres
+        self.desplazamientos = {}  # motor -> desplazamientos del patrón / enlaces de fallo
+        self.tiempo_total = 0.0    # segundos de análisis completo (segmentación incluida)
+
+    def _motor(self, motor):
+        if motor not in self.latencias:
+            self.latencias[motor] = Counter()
+            self.llamadas[motor] = 0
+            self.tiempos[motor] = 0.0
+            self.caracteres[motor] = 0
+
+    def registrar_llamada(self, motor, segundos, caracteres):
+        """Registra una búsqueda (un patrón en un segmento, o una pasada de Aho-Corasick)"""
+        self._motor(motor)
+        self.latencias[motor][cubeta_latencia(segundos)] += 1
+        self.llamadas[motor] += 1
+        self.tiempos[motor] += segundos
+        self.caracteres[motor] += caracteres
+
+    def registrar_operaciones(self, motor, comparaciones, desplazamientos):
+        self.comparaciones[motor] = self.comparaciones.get(motor, 0) + comparaciones
+        self.desplazamientos[motor] = self.desplazamientos.get(motor, 0) + desplazamientos
+
+    def combinar(self, otra):
+        """Suma las métricas de otro objeto (por ejemplo, de un proceso worker)"""
+        for motor, histograma in otra.latencias.items():
+            self._motor(motor)
+            self.latencias[motor].update(histograma)
+            self.llamadas[motor] += otra.llamadas[motor]
+            self.tiempos[motor] += otra.tiempos[motor]
+            self.caracteres[motor] += otra.caracteres[motor]
+        for motor in otra.comparaciones:
+            self.registrar_operaciones(motor, otra.comparaciones[motor], otra.desplazamientos[motor])
+        self.tiempo_total += otra.tiempo_total
+
+    def motores(self):
+        return list(self.latencias)
+
+    def percentiles(self, motor, ps=(50, 95, 99)):
+        """Percentiles de la latencia por llamada, en segundos (con la resolución del histograma)"""
+        return percentiles_histograma(self.latencias.get(motor, Counter()), ps)
+
+    def resumen(self):
+        """Diccionario serializable con los totales y percentiles de cada motor"""
+        resumen = {}
+        for motor in self.latencias:
+            p50, p95, p99 = self.percentiles(motor)
+            resumen[motor] = {
+                'llamadas': self.llamadas[motor],
+                'tiempo_s': self.tiempos[motor],
+                'caracteres': self.caracteres[motor],
+                'comparaciones': self.comparaciones.get(motor),
+                'desplazamientos': self.desplazamientos.get(motor),
+                'p50_ms': p50 * 1000,
+                'p95_ms': p95 * 1000,
+                'p99_ms': p99 * 1000,
+            }
+        return resumen
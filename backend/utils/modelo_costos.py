@@ -0,0 +1,165 @@
+from backend.algoritmos.compiled_matcher import ENGINES
+from backend.algoritmos.aho_corasick import aho_corasick_search, build_automaton
+import json
+import random
+import string
+import time
+
+
+# Parámetros del micro-benchmark de calibración
+TAMANO_MUESTRA = 10_000
+ALFABETOS_CALIBRACION = (4, 26)
+LONGITUDES_CALIBRACION = (3, 6, 12)
+PATRONES_CALIBRACION_AC = 20
+
+
+class ModeloCostos:
+    """
+    Modelo de costo para elegir el motor de búsqueda de cada segmento
+
+    Para los motores de un patrón el tiempo estimado de buscar un patrón de
+    longitud m en n caracteres con un alfabeto de tamaño sigma es
+
+        llamada + n * (base + salto / min(m, sigma))
+
+    (los motores tipo Boyer-Moore saltan más cuanto más largo es el patrón y más
+    variado el texto; KMP tiene salto ~ 0). Aho-Corasick cuesta
+    llamada + n * base para todos los patrones a la vez. Los coeficientes se
+    obtienen con un micro-benchmark (calibrar) o se cargan de un JSON.
+    """
+
+    def __init__(self, coeficientes):
+        # motor -> {'llamada': ns, 'base': ns/carácter, 'salto': ns/carácter}
+        self.coeficientes = coeficientes
+        self._mejor_motor = {}  # caché (m, sigma) -> (motor, ns por carácter)
+
+    def costo_por_caracter(self, motor, m, sigma):
+        c = self.coeficientes[motor]
+        return c['base'] + c['salto'] / max(1, min(m, sigma))
+
+    def mejor_motor(self, m, sigma):
+        """Motor de un patrón más barato para esa longitud y alfabeto: (nombre, ns/carácter)"""
+        clave = (m, sigma)
+        if clave not in self._mejor_motor:
+            self._mejor_motor[clave] = min(
+                ((motor, self.costo_por_caracter(motor, m, sigma)) for motor in ENGINES),
+                key=lambda item: item[1])
+        return self._mejor_motor[clave]
+
+    def planificar(self, n, sigma, longitudes):
+        """
+        Decide cómo analizar un segmento
+
+        Args:
+            n: longitud del segmento
+            sigma: número de caracteres distintos del segmento
+            longitudes: dict longitud de patrón -> cantidad de patrones
+
+        Returns:
+            "aho_corasick" si una sola pasada es más barata, o un dict
+            longitud -> motor para buscar cada patrón por separado
+        """
+        plan = {}
+        costo_individual = 0.0
+        for m, cantidad in longitudes.items():
+            motor, por_caracter = self.mejor_motor(m, sigma)
+            plan[m] = motor
+            costo_individual += cantidad * (self.coeficientes[motor]['llamada'] + n * por_caracter)
+
+        ac = self.coeficientes.get("aho_corasick")
+        if ac and ac['llamada'] + n * ac['base'] < costo_individual:
+            return "aho_corasick"
+        return plan
+
+    def guardar(self, path):
+        """Guarda los coeficientes para reutilizarlos sin recalibrar"""
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.coeficientes, file, indent=2)
+
+    @classmethod
+    def cargar(cls, path):
+        with open(path, 'r', encoding='utf-8') as file:
+            return cls(json.load(file))
+
+    @classmethod
+    def calibrar(cls, repeticiones=3, seed=0):
+        """Mide cada motor sobre textos sintéticos y ajusta los coeficientes"""
+        rng = random.Random(seed)
+        puntos = {motor: [] for motor in ENGINES}
+        llamadas = {motor: [] for motor in ENGINES}
+        ac_por_caracter = []
+        ac_llamadas = []
+
+        for sigma in ALFABETOS_CALIBRACION:
+            alfabeto = string.ascii_lowercase[:sigma]
+            texto = "".join(rng.choice(alfabeto) for _ in range(TAMANO_MUESTRA))
+            corto = texto[:32]
+
+            for m in LONGITUDES_CALIBRACION:
+                patron = "".join(rng.choice(alfabeto) for _ in range(m))
+                for motor, (search, preprocess) in ENGINES.items():
+                    tabla = preprocess(patron)
+                    total = _medir(lambda: search(texto, patron, tabla), repeticiones)
+                    fijo = _medir(lambda: search(corto, patron, tabla), repeticiones)
+                    puntos[motor].append((1 / min(m, sigma), (total - fijo) / len(texto)))
+                    llamadas[motor].append(fijo)
+
+            patrones = ["".join(rng.choice(alfabeto) for _ in range(rng.choice(LONGITUDES_CALIBRACION)))
+                        for _ in range(PATRONES_CALIBRACION_AC)]
+            automaton = build_automaton(patrones)
+            total = _medir(lambda: aho_corasick_search(texto, patrones, automaton), repeticiones)
+            fijo = _medir(lambda: aho_corasick_search(corto, patrones, automaton), repeticiones)
+            ac_por_caracter.append((total - fijo) / len(texto))
+            ac_llamadas.append(fijo)
+
+        coeficientes = {}
+        for motor in ENGINES:
+            base, salto = _ajustar_recta(puntos[motor])
+            coeficientes[motor] = {'llamada': min(llamadas[motor]), 'base': base, 'salto': salto}
+        coeficientes["aho_corasick"] = {'llamada': min(ac_llamadas),
+                                        'base': sum(ac_por_caracter) / len(ac_por_caracter),
+                                        'salto': 0.0}
+        return cls(coeficientes)
+
+
+def _medir(funcion, repeticiones):
+    """Mejor tiempo en nanosegundos de varias ejecuciones"""
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter_ns()
+        funcion()
+        duracion = time.perf_counter_ns() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor
+
+
+def _ajustar_recta(puntos):
+    """Mínimos cuadrados y = base + salto * x, sin coeficientes negativos"""
+    n = len(puntos)
+    media_x = sum(x for x, _ in puntos) / n
+    media_y = sum(y for _, y in puntos) / n
+    varianza = sum((x - media_x) ** 2 for x, _ in puntos)
+    if varianza == 0:
+        return max(0.0, media_y), 0.0
+
+    salto = sum((x - media_x) * (y - media_y) for x, y in puntos) / varianza
+    if salto < 0:
+        return max(0.0, media_y), 0.0
+    return max(0.0, media_y - salto * media_x), salto
+
+
+_modelo = None
+
+
+def obtener_modelo():
+    """Retorna el modelo de costos del proceso, calibrándolo en el primer uso"""
+    global _modelo
+    if _modelo is None:
+        _modelo = ModeloCostos.calibrar()
+    return _modelo
+
+
+def establecer_modelo(modelo):
+    """Sustituye el modelo del proceso (por ejemplo, uno cargado de un JSON calibrado offline)"""
+    global _modelo
+    _modelo = modelo
@@ -0,0 +1,190 @@
+from backend.algoritmos.compiled_matcher import CompiledMatcher
+from backend.utils.metricas import Metricas
+from backend.utils.procesador_texto import (_detectar_en_ventana, _detectar_rango, _nuevos_resultados,
+                                            _validar_algoritmo, detect_patterns, segment_text, CONTEXTO)
+from concurrent.futures import ProcessPoolExecutor
+import atexit
+import os
+
+
+# Por debajo de este tamaño no compensa repartir el texto entre procesos
+TAMANO_MINIMO_PARALELO = 200_000
+
+# Fragmentos por worker: más de uno para equilibrar la carga entre procesos
+FRAGMENTOS_POR_WORKER = 4
+
+# Pool persistente entre análisis y la clave (patrones, opciones, workers) con la que se creó
+_pool = None
+_pool_clave = None
+
+# Matcher compilado dentro de cada proceso worker (lo crea el inicializador)
+_matcher_worker = None
+
+
+def _inicializar_worker(patterns, opciones):
+    """Compila los patrones una sola vez por proceso worker"""
+    global _matcher_worker
+    _matcher_worker = CompiledMatcher(patterns, **opciones)
+
+
+def _crear_metricas(contar):
+    """Métricas locales del worker (None si el llamador no pidió métricas)"""
+    return None if contar is None else Metricas(contar_operaciones=contar)
+
+
+def _analizar_fragmento(args):
+    """
+    Analiza un fragmento de texto en el worker; las posiciones salen absolutas
+
+    ventanas son las (inicio, fin, fin_anterior) que detect_patterns recorrería
+    en ese tramo, relativas al fragmento: así el orden de las filas y el motor
+    elegido en cada ventana coinciden con los del análisis secuencial.
+
+    Solo vuelven las columnas de los resultados: el contexto lo extrae el
+    proceso principal del texto completo.
+    """
+    chunk, base, ventanas, algoritmo, contar = args
+    metricas = _crear_metricas(contar)
+    results = _nuevos_resultados(chunk, _matcher_worker, base)
+    for start, end, prev_end in ventanas:
+        _detectar_en_ventana(chunk, start, end, prev_end, _matcher_worker, algoritmo, base, metricas, results)
+    results.fuente = None
+    return results, metricas
+
+
+def _analizar_archivo(args):
+    """Lee y analiza un archivo completo en el worker; un error se devuelve como mensaje"""
+    path, algoritmo, contar = args
+    # Importación diferida: los lectores de PDF/DOCX/OCR solo se cargan en los workers
+    from backend.utils.file_readers import read_file
+
+    try:
+        text = read_file(path)
+        metricas = _crear_metricas(contar)
+        results = _detectar_rango(text, 0, len(text), 0, _matcher_worker, algoritmo, metricas=metricas)
+    except Exception as e:
+        return path, None, None, str(e)
+    # El texto no viaja de vuelta: se envían los contextos ya extraídos
+    results.materializar()
+    return path, results, metricas, None
+
+
+def obtener_pool(matcher, workers=None):
+    """
+    Retorna el pool de procesos, reutilizándolo mientras no cambien los patrones
+
+    Los patrones se envían a cada worker una sola vez, a través del inicializador,
+    en lugar de viajar con cada fragmento.
+    """
+    global _pool, _pool_clave
+
+    workers = workers or os.cpu_count() or 1
+    opciones = matcher.opciones()
+    clave = (matcher.patterns, tuple(opciones.items()), workers)
+
+    if _pool is None or _pool_clave != clave:
+        cerrar_pool()
+        _pool = ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker,
+                                    initargs=(matcher.patterns, opciones))
+        _pool_clave = clave
+
+    return _pool
+
+
+def cerrar_pool():
+    """Libera los procesos del pool persistente"""
+    global _pool, _pool_clave
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+    _pool = None
+    _pool_clave = None
+
+
+atexit.register(cerrar_pool)
+
+
+def detect_patterns_parallel(text, patterns, algoritmo="auto", workers=None, metricas=None):
+    """
+    Versión paralela de detect_patterns: reparte el texto entre varios procesos
+
+    El texto se segmenta en las mismas ventanas que usa detect_patterns y cada
+    fragmento agrupa ventanas consecutivas, con el contexto necesario a ambos
+    lados. Los resultados se combinan en orden con posiciones absolutas: las
+    filas, su orden y el motor de cada una ('auto' se decide por ventana) son
+    idénticos a los de detect_patterns.
+
+    Args:
+        text: texto a analizar
+        patterns: lista de tuplas (patron, tipo, nivel) o un CompiledMatcher
+        algoritmo: igual que en detect_patterns
+        workers: número de procesos (por defecto, uno por núcleo)
+        metricas: objeto Metricas donde combinar lo medido en cada worker (opcional)
+
+    Returns:
+        ResultadosColumnares con las coincidencias, como detect_patterns
+    """
+    matcher = patterns if isinstance(patterns, CompiledMatcher) else CompiledMatcher(patterns)
+    _validar_algoritmo(algoritmo, matcher)
+    workers = workers or os.cpu_count() or 1
+
+    # Trabajos pequeños: el coste de enviar el texto supera la ganancia
+    if workers == 1 or len(text) < TAMANO_MINIMO_PARALELO:
+        return detect_patterns(text, matcher, algoritmo, metricas)
+
+    contar = None if metricas is None else metricas.contar_operaciones
+    overlap = matcher.overlap
+    tamano = -(-len(text) // (workers * FRAGMENTOS_POR_WORKER))
+
+    # Agrupar las ventanas de detect_patterns en fragmentos de unos `tamano` caracteres
+    grupos = []
+    ventanas = []
+    prev_end = 0
+    for start, end in segment_text(text, overlap=overlap):
+        if ventanas and start - ventanas[0][0] >= tamano:
+            grupos.append(ventanas)
+            ventanas = []
+        ventanas.append((start, end, prev_end))
+        prev_end = end
+    if ventanas:
+        grupos.append(ventanas)
+
+    tareas = []
+    for ventanas in grupos:
+        # Cada fragmento incluye el contexto de ambos lados
+        lo = max(0, ventanas[0][0] - CONTEXTO)
+        hi = min(len(text), ventanas[-1][1] + CONTEXTO)
+        relativas = [(start - lo, end - lo, prev_end - lo) for start, end, prev_end in ventanas]
+        tareas.append((text[lo:hi], lo, relativas, algoritmo, contar))
+
+    pool = obtener_pool(matcher, workers)
+
+    results = _nuevos_resultados(text, matcher)
+    for parcial, metricas_worker in pool.map(_analizar_fragmento, tareas):
+        results.extend(parcial)
+        if metricas_worker is not None:
+            metricas.combinar(metricas_worker)
+
+    return results
+
+
+def detect_files_parallel(paths, patterns, algoritmo="auto", workers=None, metricas=None):
+    """
+    Analiza una lista de archivos repartiéndolos entre varios procesos
+
+    Si se pasa un objeto Metricas, se le suman las métricas de cada archivo.
+
+    Yields:
+        Tuplas (ruta, resultados, error) en el mismo orden que paths; si el
+        archivo no se pudo leer o analizar, resultados es None y error el
+        mensaje (el resto de los archivos se analiza igual)
+    """
+    matcher = patterns if isinstance(patterns, CompiledMatcher) else CompiledMatcher(patterns)
+    _validar_algoritmo(algoritmo, matcher)
+    pool = obtener_pool(matcher, workers)
+    contar = None if metricas is None else metricas.contar_operaciones
+
+    tareas = [(path, algoritmo, contar) for path in paths]
+    for path, results, metricas_worker, error in pool.map(_analizar_archivo, tareas):
+        if metricas_worker is not None:
+            metricas.combinar(metricas_worker)
+        yield path, results, error
@@ -1,79 +1,456 @@
-from backend.algoritmos.kmp import kmp_search
-from backend.algoritmos.boyer_moore import boyer_moore_search
-import re
+from backend.algoritmos.aho_corasick import aho_corasick_search
+from backend.algoritmos.compiled_matcher import CompiledMatcher, ENGINES
+from backend.algoritmos.byte_search import byte_horspool_search
+from backend.algoritmos.instrumentados import CONTADORES, aho_corasick_search_contado
+from backend.algoritmos.normalizacion import normalizar_texto, normalizar_patron
+from backend.algoritmos.tokens import is_word_char
+from backend.modelos.resultados import ResultadosColumnares, CONTEXTO
+from backend.utils.modelo_costos import obtener_modelo
+import mmap
+import os
+import time
 
+# Bytes de continuación UTF-8 (10xxxxxx): no inician carácter
+_UTF8_CONTINUACION = bytes(range(0x80, 0xC0))
 
-def select_search_algorithm(text, pattern):
-    """Selecciona automáticamente entre KMP y Boyer-Moore basado en características del texto y patrón"""
-    text_complexity = len(set(text)) / len(text)  # Complejidad como proporción de caracteres únicos
 
-    # Si el alfabeto es grande (texto variado) y el patrón no es muy corto, Boyer-Moore es más eficiente
-    if text_complexity > 0.3 and len(pattern) > 3:
-        return "boyer_moore", boyer_moore_search
-    # En otros casos, KMP puede ser más adecuado
+def select_search_algorithm(text, pattern, sigma=None):
+    """
+    Selecciona el motor de un patrón más barato según el modelo de costos calibrado
+
+    sigma (caracteres distintos del texto) puede pasarse ya calculado para no
+    recorrer el texto una vez por patrón.
+    """
+    if sigma is None:
+        sigma = len(set(text))
+
+    algorithm_name, _ = obtener_modelo().mejor_motor(len(pattern), sigma)
+    return algorithm_name, ENGINES[algorithm_name][0]
+
+
+def segment_text(text, max_segment_size=1000, overlap=0, start=0, end=None):
+    """
+    Segmenta el texto en ventanas para procesamiento eficiente, sin copiar el texto
+
+    Los cortes se hacen preferentemente en saltos de línea. Cada ventana se
+    extiende `overlap` caracteres sobre la siguiente para que una coincidencia
+    de hasta overlap + 1 caracteres nunca quede partida entre dos segmentos.
+
+    Args:
+        text: texto completo
+        max_segment_size: tamaño máximo de la parte propia de cada segmento
+        overlap: caracteres de solapamiento (normalmente longitud máxima de patrón - 1)
+        start, end: rango del texto a segmentar (por defecto, todo el texto)
+
+    Yields:
+        Tuplas (inicio, fin) con offsets absolutos en el texto original
+    """
+    n = len(text) if end is None else end
+
+    while start < n:
+        cut = start + max_segment_size
+        if cut >= n:
+            cut = n
+        else:
+            # Cortar después del último salto de línea de la ventana, si lo hay
+            newline = text.rfind('\n', start, cut)
+            if newline >= start:
+                cut = newline + 1
+
+        yield start, min(n, cut + overlap)
+        start = cut
+
+
+def _nuevos_resultados(text, matcher, base=0):
+    """Contenedor de resultados del matcher; si text es el texto completo, el contexto se extrae de él al pedirlo"""
+    return ResultadosColumnares(matcher.patterns, text if base == 0 else None)
+
+
+def _agregar_resultado(resultados, text, pos, index, algorithm_name, base, longitud, distancia=0):
+    """
+    Agrega una coincidencia del patrón index (base + pos es el offset absoluto)
+
+    longitud es lo que ocupa la coincidencia en text, que puede diferir de la del
+    patrón (coincidencia aproximada, o texto normalizado con marcas combinantes
+    eliminadas); distancia es la distancia de edición al patrón (0 en las
+    coincidencias exactas). El contexto solo se copia si el contenedor no
+    conserva el texto (análisis por bloques).
+    """
+    contexto = None
+    if resultados.contextos is not None:
+        contexto = text[max(0, pos - CONTEXTO):pos + longitud + CONTEXTO]
+    resultados.agregar(index, base + pos, longitud, algorithm_name, distancia, contexto)
+
+
+def _validar_algoritmo(algoritmo, matcher):
+    if algoritmo != "auto" and algoritmo != "aho_corasick" and algoritmo not in ENGINES:
+        raise ValueError(f"Algoritmo no soportado: {algoritmo}")
+    # Las palabras completas se buscan siempre sobre las palabras de la ventana:
+    # un motor explícito no tendría ningún efecto
+    if matcher.palabras_completas and algoritmo != "auto":
+        raise ValueError(f"El algoritmo {algoritmo} solo se aplica a la búsqueda de subcadenas; "
+                         "con palabras_completas use algoritmo='auto'")
+
+
+def _buscar_medido(segment, matcher, index, engine, metricas):
+    """matcher.search registrando latencia y, si se pide, comparaciones y desplazamientos"""
+    inicio = time.perf_counter()
+    positions = matcher.search(segment, index, engine)
+    metricas.registrar_llamada(engine, time.perf_counter() - inicio, len(segment))
+
+    if metricas.contar_operaciones and matcher.strings[index]:
+        _, comparaciones, desplazamientos = CONTADORES[engine](
+            segment, matcher.strings[index], matcher.tables[engine][index])
+        metricas.registrar_operaciones(engine, comparaciones, desplazamientos)
+
+    return positions
+
+
+def _buscar_todos_medido(segment, matcher, metricas):
+    """aho_corasick_search registrando latencia y, si se pide, operaciones"""
+    inicio = time.perf_counter()
+    matches = aho_corasick_search(segment, matcher.strings, matcher.automaton)
+    metricas.registrar_llamada("aho_corasick", time.perf_counter() - inicio, len(segment))
+
+    if metricas.contar_operaciones:
+        _, comparaciones, desplazamientos = aho_corasick_search_contado(
+            segment, matcher.strings, matcher.automaton)
+        metricas.registrar_operaciones("aho_corasick", comparaciones, desplazamientos)
+
+    return matches
+
+
+def _buscar_aproximado_medido(segment, matcher, index, metricas):
+    """matcher.search_approximate registrando su latencia (el motor bit-paralelo no compara caracteres)"""
+    inicio = time.perf_counter()
+    matches = matcher.search_approximate(segment, index)
+    metricas.registrar_llamada("myers", time.perf_counter() - inicio, len(segment))
+    return matches
+
+
+def _buscar_palabras_medido(segment, matcher, partial_first, partial_last, metricas):
+    """matcher.search_words registrando su latencia (tokenización incluida)"""
+    inicio = time.perf_counter()
+    matches = matcher.search_words(segment, partial_first, partial_last)
+    metricas.registrar_llamada("palabras", time.perf_counter() - inicio, len(segment))
+    return matches
+
+
+def _continua_palabra(char, matcher):
+    """Indica si char, vecino a un borde de la ventana, forma palabra con el carácter del otro lado"""
+    if matcher.normalizar:
+        char = normalizar_patron(char)
+    # Una marca combinante suelta se elimina al normalizar: pertenece a la letra anterior
+    return not char or is_word_char(char)
+
+
+def _ubicar(pos, longitud, mapa):
+    """Inicio y fin en el segmento original de una coincidencia en el segmento normalizado"""
+    if mapa is None:
+        return pos, pos + longitud
+    return mapa[pos], mapa[pos + longitud - 1] + 1
+
+
+def _detectar_en_ventana(text, seg_start, seg_end, prev_end, matcher, algoritmo, base=0, metricas=None,
+                         results=None):
+    """
+    Busca todos los patrones en la ventana text[seg_start:seg_end]
+
+    Se descartan las coincidencias que terminan antes de prev_end (fin de la
+    ventana anterior), porque ya se reportaron allí. Si el matcher normaliza,
+    se busca sobre la ventana normalizada y las posiciones y el contexto se
+    traducen al texto original. Si busca palabras completas, los patrones
+    exactos se buscan sobre las palabras de la ventana (los llamadores públicos
+    solo admiten algoritmo "auto" en ese modo; ver _validar_algoritmo).
+
+    Las coincidencias se agregan a results (un ResultadosColumnares nuevo si no
+    se indica), que se retorna.
+    """
+    if metricas is not None:
+        inicio_ventana = time.perf_counter()
+
+    segment = text[seg_start:seg_end]
+    mapa = None
+    if matcher.normalizar:
+        segment, mapa = normalizar_texto(segment)
+    if results is None:
+        results = _nuevos_resultados(text, matcher, base)
+
+    plan = None
+    if matcher.palabras_completas:
+        algoritmo = "palabras"
+    elif algoritmo == "auto":
+        # Estadísticas del segmento una sola vez; el modelo decide entre una pasada
+        # de Aho-Corasick o el mejor motor individual para cada longitud de patrón
+        plan = obtener_modelo().planificar(len(segment), len(set(segment)), matcher.length_counts)
+        if plan == "aho_corasick":
+            algoritmo = plan
+
+    if algoritmo == "palabras":
+        # Si la ventana corta una palabra, la palabra del borde está incompleta
+        partial_first = seg_start > 0 and _continua_palabra(text[seg_start - 1], matcher)
+        partial_last = seg_end < len(text) and _continua_palabra(text[seg_end], matcher)
+        if metricas is None:
+            matches = matcher.search_words(segment, partial_first, partial_last)
+        else:
+            matches = _buscar_palabras_medido(segment, matcher, partial_first, partial_last, metricas)
+
+        for pos, longitud, index in matches:
+            start, end = _ubicar(pos, longitud, mapa)
+            if seg_start + end > prev_end:
+                _agregar_resultado(results, text, seg_start + start, index, "palabras", base, end - start)
+    elif algoritmo == "aho_corasick":
+        if metricas is None:
+            matches = aho_corasick_search(segment, matcher.strings, matcher.automaton)
+        else:
+            matches = _buscar_todos_medido(segment, matcher, metricas)
+
+        for pos, index in matches:
+            start, end = _ubicar(pos, len(matcher.strings[index]), mapa)
+            # Si la coincidencia cabía en la ventana anterior, ya se reportó
+            if seg_start + end > prev_end:
+                _agregar_resultado(results, text, seg_start + start, index, "aho_corasick", base, end - start)
     else:
-        return "kmp", kmp_search
+        for index in range(len(matcher.patterns)):
+            if matcher.tolerancias[index]:
+                continue
+            longitud = len(matcher.strings[index])
 
+            # Seleccionar algoritmo
+            if plan is not None:
+                algorithm_name = plan.get(longitud, "kmp")
+            else:
+                algorithm_name = algoritmo
 
-def segment_text(text, max_segment_size=1000):
-    """Segmenta el texto en partes más pequeñas para procesamiento eficiente"""
-    # Dividir por párrafos
-    paragraphs = text.split('\n')
-    segments = []
+            # Buscar patrón con su tabla precalculada
+            if metricas is None:
+                positions = matcher.search(segment, index, algorithm_name)
+            else:
+                positions = _buscar_medido(segment, matcher, index, algorithm_name, metricas)
 
-    current_segment = ""
-    for paragraph in paragraphs:
-        if len(current_segment) + len(paragraph) <= max_segment_size:
-            current_segment += paragraph + "\n"
+            # Procesar resultados
+            for pos in positions:
+                start, end = _ubicar(pos, longitud, mapa)
+                if seg_start + end > prev_end:
+                    _agregar_resultado(results, text, seg_start + start, index, algorithm_name, base, end - start)
+
+    # Patrones con tolerancia: búsqueda aproximada, sea cual sea el algoritmo elegido
+    for index in matcher.aproximados:
+        if metricas is None:
+            matches = matcher.search_approximate(segment, index)
         else:
-            segments.append(current_segment)
-            current_segment = paragraph + "\n"
+            matches = _buscar_aproximado_medido(segment, matcher, index, metricas)
+
+        # Cada final se reporta en una sola ventana: en la que tiene su vecindario
+        # completo a ambos lados, para que el resultado no dependa de los cortes
+        # (la ventana que llega al final del texto se queda con todos los finales)
+        margen = matcher.margenes[index]
+        desde = prev_end - margen if prev_end < len(text) else prev_end + 1
+        hasta = seg_end - margen if seg_end < len(text) else seg_end + 1
+
+        for pos, longitud, distancia in matches:
+            start, end = _ubicar(pos, longitud, mapa)
+            if desde <= seg_start + end < hasta:
+                _agregar_resultado(results, text, seg_start + start, index, "myers", base, end - start, distancia)
 
-    if current_segment:
-        segments.append(current_segment)
+    if metricas is not None:
+        metricas.tiempo_total += time.perf_counter() - inicio_ventana
 
-    return segments
+    return results
 
 
-def detect_patterns(text, patterns):
+def detect_patterns(text, patterns, algoritmo="auto", metricas=None):
     """
     Detecta patrones en el texto usando el algoritmo más apropiado
 
     Args:
         text: texto a analizar
-        patterns: lista de tuplas (patron, tipo, nivel)
+        patterns: lista de tuplas (patron, tipo, nivel) o un CompiledMatcher ya construido
+                  (por ejemplo PatronesManager.obtener_matcher()) para no repetir el
+                  preprocesamiento en cada análisis
+        algoritmo: "auto" (elección por segmento según el modelo de costos), "kmp", "boyer_moore",
+                   "horspool", "sunday" o "aho_corasick" (todos los patrones en una sola pasada);
+                   si el matcher busca palabras completas solo se admite "auto", porque
+                   esa búsqueda tiene su propio motor y no usa el modelo de costos
+        metricas: objeto Metricas donde registrar tiempos y contadores (None = sin medir)
 
     Returns:
-        Lista de coincidencias con información contextual
+        ResultadosColumnares con las coincidencias, que se recorre como una lista de
+        diccionarios con información contextual; 'posicion' es el offset absoluto
+        en el texto original y 'distancia' la distancia de edición al patrón
+        (mayor que 0 solo en patrones con tolerancia)
     """
-    # Segmentar texto si es muy largo
-    segments = segment_text(text) if len(text) > 1000 else [text]
+    matcher = patterns if isinstance(patterns, CompiledMatcher) else CompiledMatcher(patterns)
+    _validar_algoritmo(algoritmo, matcher)
 
-    results = []
+    return _detectar_rango(text, 0, len(text), 0, matcher, algoritmo, metricas=metricas)
 
-    for segment in segments:
-        for pattern, tipo, nivel in patterns:
-            # Seleccionar algoritmo
-            algorithm_name, search_function = select_search_algorithm(segment, pattern)
 
-            # Buscar patrón
-            positions = search_function(segment, pattern)
+def iter_detect_patterns(text, patterns, algoritmo="auto", metricas=None):
+    """
+    Versión incremental de detect_patterns, segmento a segmento
 
-            # Procesar resultados
-            for pos in positions:
-                # Extraer contexto (texto alrededor del patrón)
-                start = max(0, pos - 20)
-                end = min(len(segment), pos + len(pattern) + 20)
-                context = segment[start:end]
-
-                # Añadir a resultados
-                results.append({
-                    'patron': pattern,
-                    'tipo': tipo,
-                    'nivel': nivel,
-                    'posicion': pos,
-                    'contexto': context,
-                    'algoritmo': algorithm_name
-                })
-
-    return results
\ No newline at end of file
+    Yields:
+        Tuplas (fin_del_segmento, resultados_del_segmento); la concatenación de
+        todos los resultados es igual a detect_patterns(text, patterns, algoritmo)
+    """
+    matcher = patterns if isinstance(patterns, CompiledMatcher) else CompiledMatcher(patterns)
+    _validar_algoritmo(algoritmo, matcher)
+
+    overlap = matcher.overlap
+    prev_end = 0
+    for seg_start, seg_end in segment_text(text, overlap=overlap):
+        yield seg_end, _detectar_en_ventana(text, seg_start, seg_end, prev_end, matcher, algoritmo,
+                                            metricas=metricas)
+        prev_end = seg_end
+
+
+def _detectar_rango(text, start, end, prev_end, matcher, algoritmo, base=0, metricas=None):
+    """
+    Segmenta text[start:end] y busca los patrones en cada ventana
+
+    prev_end es el fin de la ventana analizada justo antes de este rango (o start
+    si no hay ninguna), para descartar coincidencias repetidas en el solapamiento.
+    """
+    # Segmentar con solapamiento suficiente para el patrón más largo
+    overlap = matcher.overlap
+
+    results = _nuevos_resultados(text, matcher, base)
+    for seg_start, seg_end in segment_text(text, overlap=overlap, start=start, end=end):
+        _detectar_en_ventana(text, seg_start, seg_end, prev_end, matcher, algoritmo, base, metricas, results)
+        prev_end = seg_end
+
+    return results
+
+
+def detect_patterns_stream(file_obj, patterns, algoritmo="auto", chunk_size=1024 * 1024, metricas=None):
+    """
+    Detecta patrones leyendo el texto por bloques, con memoria constante
+
+    Entre bloques se conserva solo la cola necesaria para no perder coincidencias
+    que cruzan el corte y para extraer el contexto, de modo que el consumo de
+    memoria no depende del tamaño del archivo.
+
+    Args:
+        file_obj: objeto de archivo en modo texto (cualquier cosa con read(n))
+        patterns: lista de tuplas (patron, tipo, nivel) o un CompiledMatcher
+        algoritmo: igual que en detect_patterns
+        chunk_size: caracteres leídos en cada bloque
+        metricas: igual que en detect_patterns
+
+    Yields:
+        Las mismas coincidencias que detect_patterns, con 'posicion' absoluta
+    """
+    for _, resultados in iter_detect_patterns_stream(file_obj, patterns, algoritmo, chunk_size, metricas):
+        yield from resultados
+
+
+def iter_detect_patterns_stream(file_obj, patterns, algoritmo="auto", chunk_size=1024 * 1024,
+                                metricas=None):
+    """
+    Igual que detect_patterns_stream, pero agrupando las coincidencias por bloque leído
+
+    Yields:
+        Tuplas (caracteres_leidos, resultados_del_bloque), útiles para informar progreso
+    """
+    matcher = patterns if isinstance(patterns, CompiledMatcher) else CompiledMatcher(patterns)
+    _validar_algoritmo(algoritmo, matcher)
+
+    overlap = matcher.overlap
+    reserva = overlap + CONTEXTO  # caracteres que deben seguir a una coincidencia antes de reportarla
+
+    buffer = ""
+    base = 0       # offset absoluto de buffer[0]
+    scanned = 0    # offset absoluto desde el que aún no se han reportado inicios de coincidencia
+    prev_end = 0   # fin absoluto de la ventana anterior
+
+    while True:
+        chunk = file_obj.read(chunk_size)
+        buffer += chunk
+        total = base + len(buffer)
+
+        # Las coincidencias que empiezan antes de limit ya tienen todo su texto y contexto
+        limit = total if not chunk else total - reserva
+        # El buffer se descarta a medida que avanza: cada coincidencia guarda su contexto
+        resultados = ResultadosColumnares(matcher.patterns, contextos=True)
+        if limit > scanned:
+            seg_end = min(total, limit + overlap)
+            _detectar_en_ventana(buffer, scanned - base, seg_end - base, prev_end - base,
+                                 matcher, algoritmo, base, metricas, resultados)
+            prev_end = seg_end
+            scanned = limit
+
+            # Conservar solo el contexto izquierdo y lo que falta por analizar
+            trim = max(0, scanned - CONTEXTO - base)
+            buffer = buffer[trim:]
+            base += trim
+
+        yield total, resultados
+
+        if not chunk:
+            break
+
+
+def detect_patterns_mmap(file_path, patterns, metricas=None):
+    """
+    Detecta patrones en un archivo de texto UTF-8 buscando directamente sobre sus bytes
+
+    El archivo se mapea en memoria (mmap), así que no se decodifica ni se copia:
+    el sistema operativo carga las páginas bajo demanda y las mantiene en caché
+    si se vuelve a analizar el mismo archivo. Solo se traducen a offsets de
+    caracteres las posiciones de las coincidencias reportadas.
+
+    Args:
+        file_path: ruta del archivo .txt (UTF-8)
+        patterns: lista de tuplas (patron, tipo, nivel) o un CompiledMatcher
+        metricas: Metricas opcional donde registrar la latencia de la búsqueda
+
+    Returns:
+        ResultadosColumnares como detect_patterns; 'posicion' cuenta los
+        caracteres del archivo tal cual ("\\r\\n" cuenta como dos)
+
+    Raises:
+        ValueError: si el matcher normaliza, busca palabras completas o tiene
+            tolerancias: sobre los bytes solo se puede buscar la subcadena exacta
+    """
+    matcher = patterns if isinstance(patterns, CompiledMatcher) else CompiledMatcher(patterns)
+    if matcher.normalizar or matcher.palabras_completas or matcher.aproximados:
+        raise ValueError("La búsqueda sobre bytes solo admite subcadenas exactas: "
+                         "sin normalización, palabras completas ni tolerancias")
+    encoded, tables = matcher.byte_tables()
+    results = ResultadosColumnares(matcher.patterns, contextos=True)
+
+    with open(file_path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return results
+
+        inicio = time.perf_counter()
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # (offset en bytes, índice de patrón) de todas las coincidencias
+            matches = []
+            for index, pattern in enumerate(encoded):
+                for pos in byte_horspool_search(data, pattern, tables[index]):
+                    matches.append((pos, index))
+            matches.sort()
+
+            byte_pos = 0
+            char_pos = 0
+            for pos, index in matches:
+                # Avanzar el offset de caracteres contando solo los bytes que inician carácter
+                char_pos += len(data[byte_pos:pos].translate(None, _UTF8_CONTINUACION))
+                byte_pos = pos
+
+                pattern = matcher.patterns[index][0]
+                end = pos + len(encoded[index])
+                # Hasta 4 bytes por carácter, más los de un carácter cortado en el borde,
+                # que se descarta: siempre quedan CONTEXTO caracteres a la izquierda si los hay
+                left = data[max(0, pos - 4 * CONTEXTO - 3):pos].decode('utf-8', 'ignore')[-CONTEXTO:]
+                right = data[end:end + 4 * CONTEXTO].decode('utf-8', 'ignore')[:CONTEXTO]
+
+                results.agregar(index, char_pos, len(pattern), "horspool_bytes", 0, left + pattern + right)
+
+        if metricas is not None:
+            metricas.registrar_llamada("horspool_bytes", time.perf_counter() - inicio, size)
+
+    return results
@@ -0,0 +1,138 @@
+from backend.algoritmos.compiled_matcher import CompiledMatcher
+from backend.utils.procesador_texto import _detectar_rango, detect_patterns, CONTEXTO
+from bisect import bisect_left
+from collections import Counter
+
+
+class SesionAnalisis:
+    """
+    Análisis incremental de un texto que se sigue editando
+
+    Conserva los resultados del último análisis y, ante un cambio, solo vuelve
+    a buscar lo necesario:
+      - patrones agregados: se buscan solo los nuevos;
+      - patrones eliminados: se descartan sus coincidencias;
+      - texto editado: se vuelve a analizar el rango modificado más un margen
+        de una coincidencia y su contexto a cada lado, y se desplazan las
+        posiciones de las coincidencias posteriores.
+
+    Las operaciones retornan (eliminados, agregados, desde, delta) para que la
+    interfaz actualice su vista sin rehacerla. Al editar el texto, eliminados
+    son las filas contiguas que empezaban en bisect_left(posicion, desde) de
+    self.resultados (ordenado por posición), agregados ocupa su lugar y las
+    filas posteriores se desplazaron delta caracteres.
+    """
+
+    def __init__(self, texto, matcher, algoritmo="auto", resultados=None):
+        self.texto = texto
+        self.matcher = matcher
+        self.algoritmo = algoritmo
+        if resultados is None:
+            resultados = detect_patterns(texto, matcher, algoritmo)
+        # Copia propia ordenada por posición: se modifica en el lugar en cada edición
+        self.resultados = resultados.ordenado()
+
+    @staticmethod
+    def _claves(matcher):
+        """Multiconjunto de (patron, tipo, nivel, tolerancia) del matcher"""
+        return Counter(pattern + (k,) for pattern, k in zip(matcher.patterns, matcher.tolerancias))
+
+    def actualizar_patrones(self, matcher):
+        """
+        Cambia el conjunto de patrones buscando solo los que cambiaron
+
+        Returns:
+            Tupla (eliminados, agregados, desde, delta) con las coincidencias afectadas
+        """
+        anterior = self.matcher
+        self.matcher = matcher
+
+        if (anterior.normalizar != matcher.normalizar
+                or anterior.palabras_completas != matcher.palabras_completas):
+            # Cambió la forma de buscar: hay que repetir todo el análisis
+            eliminados = self.resultados
+            self.resultados = detect_patterns(self.texto, matcher, self.algoritmo).ordenado()
+            return eliminados, self.resultados.ordenado(), 0, 0
+
+        antes = self._claves(anterior)
+        despues = self._claves(matcher)
+        cambiados = {clave[:3] for clave in (antes - despues) + (despues - antes)}
+        if not cambiados:
+            return self.resultados.copia_vacia(), self.resultados.copia_vacia(), 0, 0
+
+        # Se descartan todas las coincidencias de un patrón cambiado y se vuelven a
+        # buscar las que correspondan a sus apariciones actuales (tolerancia incluida)
+        ids = {i for i, pattern in enumerate(self.resultados.patrones) if pattern in cambiados}
+        id_patron = self.resultados.id_patron
+        quitar = [i for i in range(len(id_patron)) if id_patron[i] in ids]
+        eliminados = self.resultados.seleccionar(quitar)
+        self.resultados.eliminar(quitar)
+
+        nuevos = [pattern + (k,) for pattern, k in zip(matcher.patterns, matcher.tolerancias)
+                  if pattern in cambiados]
+        agregados = self.resultados.copia_vacia()
+        if nuevos:
+            parcial = CompiledMatcher([clave[:3] for clave in nuevos], matcher.normalizar,
+                                      [clave[3] for clave in nuevos], matcher.palabras_completas)
+            agregados = detect_patterns(self.texto, parcial, self.algoritmo)
+
+        self.resultados.extend(agregados)
+        self.resultados = self.resultados.ordenado()
+        return eliminados, agregados, 0, 0
+
+    def editar_texto(self, texto, posicion, eliminados, insertados):
+        """
+        Aplica una edición del texto (como QTextDocument.contentsChange)
+
+        Args:
+            texto: texto completo después de la edición
+            posicion: offset donde empieza la edición
+            eliminados: caracteres eliminados en esa posición
+            insertados: caracteres insertados en esa posición
+
+        Los offsets cuentan caracteres de Python (puntos de código), no las
+        unidades UTF-16 de Qt. Si la edición no cuadra con el texto se repite
+        el análisis completo.
+
+        Returns:
+            Tupla (eliminados, agregados, desde, delta) con las coincidencias afectadas
+        """
+        delta = insertados - eliminados
+        if (eliminados < 0 or insertados < 0 or posicion < 0 or posicion + eliminados > len(self.texto)
+                or len(texto) != len(self.texto) + delta):
+            # La edición informada no cuadra con el texto: análisis completo
+            self.texto = texto
+            anteriores = self.resultados
+            self.resultados = detect_patterns(texto, self.matcher, self.algoritmo).ordenado()
+            return anteriores, self.resultados.ordenado(), 0, 0
+
+        self.texto = texto
+        overlap = self.matcher.overlap
+
+        # Una coincidencia que empieza antes de inicio no llega, ni con su contexto,
+        # a la edición; una que empieza en fin o después tampoco (en el texto
+        # anterior). El margen cubre también el vecindario de las aproximadas
+        margen = overlap + 1 + CONTEXTO
+        inicio = max(0, posicion - margen)
+        fin = posicion + eliminados + margen
+
+        # Las coincidencias están ordenadas: las afectadas forman un rango contiguo
+        # y todas las que quedan detrás de él se desplazan
+        primera = bisect_left(self.resultados.posicion, inicio)
+        quitados = self.resultados.eliminar_rango(primera, bisect_left(self.resultados.posicion, fin))
+        self.resultados.desplazar_filas(primera, delta)
+        self.resultados.fuente = texto
+
+        # Volver a buscar las coincidencias que empiezan en el rango afectado del
+        # texto nuevo, dando a cada lado el margen que necesitan los motores
+        fin_nuevo = min(len(texto), fin + delta)
+        desde = max(0, inicio - overlap)
+        hasta = min(len(texto), fin_nuevo + 2 * overlap + 1)
+        encontrados = _detectar_rango(texto, desde, hasta, desde, self.matcher, self.algoritmo)
+        posiciones = encontrados.posicion
+        agregados = encontrados.seleccionar(sorted((i for i in range(len(posiciones))
+                                                    if inicio <= posiciones[i] < fin_nuevo),
+                                                   key=posiciones.__getitem__))
+
+        self.resultados.insertar(primera, agregados)
+        return quitados, agregados, inicio, delta
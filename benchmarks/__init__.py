@@ -0,0 +1 @@
+# Este archivo permite ejecutar los benchmarks como módulos (python -m benchmarks.<nombre>)
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""
+Compara las variantes de Boyer-Moore sobre texto repetitivo y texto aleatorio
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_boyer_moore
+"""
+import random
+import string
+import timeit
+
+from backend.algoritmos.boyer_moore import (boyer_moore_bad_char_search, boyer_moore_search,
+                                            horspool_search, sunday_search)
+
+
+VARIANTES = [
+    ("mal carácter (anterior)", boyer_moore_bad_char_search),
+    ("BM completo + Galil", boyer_moore_search),
+    ("Horspool", horspool_search),
+    ("Sunday", sunday_search),
+]
+
+
+def generar_casos(n=200_000, seed=42):
+    """Genera los textos de prueba: (nombre, texto, patrón)"""
+    rng = random.Random(seed)
+    alfabeto = string.ascii_lowercase + " "
+    aleatorio = "".join(rng.choice(alfabeto) for _ in range(n))
+
+    return [
+        ("repetitivo 'ja'", "ja" * (n // 2), "jajajajaja"),
+        ("repetitivo 'a'", "a" * n, "aaaaaaaa"),
+        ("aleatorio", aleatorio, "estupido"),
+    ]
+
+
+def medir(funcion, texto, patron, repeticiones=3):
+    """Devuelve el mejor tiempo (s) de varias ejecuciones"""
+    return min(timeit.repeat(lambda: funcion(texto, patron), number=1, repeat=repeticiones))
+
+
+def main():
+    for nombre_caso, texto, patron in generar_casos():
+        print(f"\n{nombre_caso} (n={len(texto)}, m={len(patron)})")
+        base = None
+        esperado = None
+
+        for nombre, funcion in VARIANTES:
+            tiempo = medir(funcion, texto, patron)
+            coincidencias = funcion(texto, patron)
+
+            if esperado is None:
+                esperado = coincidencias
+                base = tiempo
+            elif coincidencias != esperado:
+                raise AssertionError(f"{nombre} devolvió resultados distintos en '{nombre_caso}'")
+
+            print(f"  {nombre:<26} {tiempo * 1000:9.2f} ms   x{base / tiempo:5.2f}")
+
+
+if __name__ == "__main__":
+    main()
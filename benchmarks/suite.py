@@ -0,0 +1,232 @@
+"""
+Suite de benchmarks de los motores de búsqueda y de detect_patterns
+
+Barre tamaño de texto, alfabeto (entropía), longitud de patrón y cantidad de
+patrones, variando una dimensión a la vez alrededor de una configuración base.
+Para cada motor reporta ns/carácter y coincidencias/s (los motores de un patrón
+buscan todo el conjunto, un patrón tras otro), guarda los resultados en
+JSON y los compara con la línea base: falla cuando algún motor empeora más
+que el umbral indicado, y también si no hay línea base (salvo con
+--guardar-base, que la crea). detect_patterns se mide buscando subcadenas y
+también en el modo por defecto de la aplicación ("detect_patterns_palabras":
+palabras completas con normalización), este sobre un texto de palabras
+separadas por espacios con el mismo tamaño y alfabeto.
+
+La línea base depende de la máquina, así que no se versiona: se genera en la
+máquina donde se va a comparar con --guardar-base.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.suite                      # medir y comparar con la línea base
+    python -m benchmarks.suite --guardar-base       # medir y guardar como nueva línea base
+    python -m benchmarks.suite --umbral 0.10 --rapido
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import string
+import sys
+import time
+
+from backend.algoritmos.aho_corasick import aho_corasick_search
+from backend.algoritmos.compiled_matcher import CompiledMatcher, ENGINES
+from backend.utils.procesador_texto import detect_patterns
+
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+BASE_POR_DEFECTO = os.path.join(DIRECTORIO, "baseline.json")
+SALIDA_POR_DEFECTO = os.path.join(DIRECTORIO, "resultados.json")
+
+# Configuración base y valores a barrer en cada dimensión
+CONFIG_BASE = {'n': 50_000, 'sigma': 26, 'm': 8, 'patrones': 10}
+BARRIDOS = {
+    'n': [10_000, 50_000, 200_000],
+    'sigma': [2, 4, 26, 64],
+    'm': [4, 8, 16, 32],
+    'patrones': [1, 10, 100],
+}
+
+ALFABETO = string.ascii_letters + string.digits + " ."
+
+
+def configuraciones(rapido=False):
+    """Genera las configuraciones únicas del barrido (una dimensión a la vez)"""
+    vistas = []
+    for dimension, valores in BARRIDOS.items():
+        for valor in valores:
+            config = dict(CONFIG_BASE, **{dimension: valor})
+            if rapido:
+                config['n'] = max(1000, config['n'] // 10)
+            if config not in vistas:
+                vistas.append(config)
+    return vistas
+
+
+def clave(config):
+    return f"n={config['n']},sigma={config['sigma']},m={config['m']},patrones={config['patrones']}"
+
+
+def generar_caso(config, seed=0):
+    """Texto aleatorio del alfabeto indicado y patrones tomados del propio texto"""
+    rng = random.Random(seed)
+    alfabeto = ALFABETO[:config['sigma']]
+    texto = "".join(rng.choice(alfabeto) for _ in range(config['n']))
+
+    patrones = []
+    for _ in range(config['patrones']):
+        inicio = rng.randrange(0, len(texto) - config['m'])
+        patrones.append((texto[inicio:inicio + config['m']], "Benchmark", "Bajo"))
+    return texto, CompiledMatcher(patrones)
+
+
+def motores(matcher):
+    """Funciones a medir: cada una recibe el texto y retorna el número de coincidencias"""
+    funciones = {}
+
+    for nombre in ENGINES:
+        def buscar(texto, nombre=nombre):
+            return sum(len(matcher.search(texto, i, nombre)) for i in range(len(matcher)))
+        funciones[nombre] = buscar
+
+    funciones["aho_corasick"] = lambda texto: len(
+        aho_corasick_search(texto, matcher.strings, matcher.automaton))
+    funciones["detect_patterns"] = lambda texto: len(detect_patterns(texto, matcher))
+    return funciones
+
+
+def generar_caso_palabras(config, seed=0):
+    """
+    Texto de palabras separadas por espacios y patrones que son palabras completas
+
+    Los patrones (de m caracteres) aparecen en el 5 % de las palabras; el resto
+    son palabras de relleno de 2 a 12 caracteres del mismo alfabeto.
+    """
+    rng = random.Random(seed)
+    alfabeto = ALFABETO[:min(config['sigma'], len(ALFABETO) - 2)]  # sin espacio ni punto
+
+    def palabra(longitud):
+        return "".join(rng.choice(alfabeto) for _ in range(longitud))
+
+    buscadas = [palabra(config['m']) for _ in range(config['patrones'])]
+    relleno = [palabra(rng.randint(2, 12)) for _ in range(50)]
+    palabras = []
+    longitud = 0
+    while longitud < config['n']:
+        palabras.append(rng.choice(buscadas if rng.random() < 0.05 else relleno))
+        longitud += len(palabras[-1]) + 1
+    texto = " ".join(palabras)[:config['n']]
+
+    patrones = [(buscada, "Benchmark", "Bajo") for buscada in buscadas]
+    return texto, CompiledMatcher(patrones, normalizar=True, palabras_completas=True)
+
+
+def medir(funcion, texto, repeticiones):
+    """Mejor tiempo (ns) y número de coincidencias"""
+    mejor = None
+    coincidencias = 0
+    for _ in range(repeticiones):
+        inicio = time.perf_counter_ns()
+        coincidencias = funcion(texto)
+        duracion = time.perf_counter_ns() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor, coincidencias
+
+
+def medida(funcion, texto, repeticiones):
+    """Diccionario de resultados de un motor sobre un texto"""
+    ns, coincidencias = medir(funcion, texto, repeticiones)
+    return {
+        'ns_por_caracter': ns / len(texto),
+        'coincidencias_por_s': coincidencias / (ns / 1e9) if ns else 0.0,
+        'coincidencias': coincidencias,
+    }
+
+
+def ejecutar(rapido=False, repeticiones=3):
+    resultados = {}
+    for config in configuraciones(rapido):
+        texto, matcher = generar_caso(config)
+        fila = {}
+        for nombre, funcion in motores(matcher).items():
+            fila[nombre] = medida(funcion, texto, repeticiones)
+
+        # Camino por defecto de la interfaz y de la CLI (PatronesManager)
+        texto_palabras, palabras = generar_caso_palabras(config)
+        fila["detect_patterns_palabras"] = medida(lambda texto: len(detect_patterns(texto, palabras)),
+                                                  texto_palabras, repeticiones)
+        resultados[clave(config)] = dict(config, entropia_bits=math.log2(config['sigma']), motores=fila)
+        print(f"{clave(config)}")
+        for nombre, datos in fila.items():
+            print(f"  {nombre:<24} {datos['ns_por_caracter']:10.1f} ns/car {datos['coincidencias_por_s']:14.0f} coinc/s")
+    return resultados
+
+
+def comparar(resultados, base, umbral):
+    """Lista de regresiones (clave, motor, base, actual) que superan el umbral"""
+    regresiones = []
+    for nombre_config, datos in resultados.items():
+        anterior = base.get(nombre_config)
+        if not anterior:
+            continue
+        for motor, medida in datos['motores'].items():
+            referencia = anterior['motores'].get(motor)
+            if not referencia:
+                continue
+            if medida['ns_por_caracter'] > referencia['ns_por_caracter'] * (1 + umbral):
+                regresiones.append((nombre_config, motor, referencia['ns_por_caracter'],
+                                    medida['ns_por_caracter']))
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    parser.add_argument("--salida", default=SALIDA_POR_DEFECTO, help="JSON de resultados")
+    parser.add_argument("--base", default=BASE_POR_DEFECTO, help="JSON de línea base")
+    parser.add_argument("--umbral", type=float, default=0.20,
+                        help="empeoramiento relativo tolerado en ns/carácter (por defecto: %(default)s)")
+    parser.add_argument("--guardar-base", action="store_true", help="guardar los resultados como línea base")
+    parser.add_argument("--rapido", action="store_true", help="textos 10 veces más pequeños")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.rapido, args.repeticiones)
+    documento = {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'fecha': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'resultados': resultados,
+    }
+
+    with open(args.salida, 'w', encoding='utf-8') as file:
+        json.dump(documento, file, indent=2)
+    print(f"\nResultados guardados en {args.salida}")
+
+    if args.guardar_base:
+        with open(args.base, 'w', encoding='utf-8') as file:
+            json.dump(documento, file, indent=2)
+        print(f"Línea base guardada en {args.base}")
+        return 0
+
+    if not os.path.exists(args.base):
+        print(f"No hay línea base en {args.base}; ejecute con --guardar-base para crearla")
+        return 2
+
+    with open(args.base, 'r', encoding='utf-8') as file:
+        base = json.load(file)['resultados']
+
+    regresiones = comparar(resultados, base, args.umbral)
+    for nombre_config, motor, antes, ahora in regresiones:
+        print(f"REGRESIÓN {nombre_config} {motor}: {antes:.1f} -> {ahora:.1f} ns/car "
+              f"(+{(ahora / antes - 1) * 100:.0f}%)")
+
+    if regresiones:
+        return 1
+
+    print(f"Sin regresiones por encima del {args.umbral:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
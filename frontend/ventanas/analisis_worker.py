@@ -0,0 +1,125 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+from backend.utils.procesador_texto import iter_detect_patterns, iter_detect_patterns_stream
+from backend.utils.metricas import Metricas
+from backend.utils.indice import obtener_indice, detect_patterns_indexed
+from backend.utils.file_readers import open_text_stream
+from backend.modelos.resultados import ResultadosColumnares
+import os
+import time
+
+
+# Intervalo mínimo entre envíos de resultados parciales a la interfaz
+INTERVALO_PARCIALES = 0.1  # segundos
+
+# Parte de la barra de progreso que ocupa la construcción del índice de sufijos
+PROGRESO_INDICE = 90
+
+
+class AnalisisWorker(QObject):
+    """
+    Ejecuta la detección de patrones fuera del hilo de la interfaz
+
+    Se mueve a un QThread y se arranca conectando QThread.started a ejecutar().
+    Analiza segmento a segmento (o bloque a bloque si es un archivo grande),
+    informa el progreso y revisa entre segmentos si se pidió cancelar.
+
+    Si se indica archivo_indice (el archivo del que proviene texto), se consulta
+    el índice de sufijos guardado junto a él en lugar de recorrer el texto; si
+    el texto es demasiado grande para indexarlo, se recorre igualmente.
+    """
+    progreso = pyqtSignal(int)  # Porcentaje completado
+    resultados_parciales = pyqtSignal(object)  # ResultadosColumnares
+    terminado = pyqtSignal(object)  # Todos los resultados del análisis
+    cancelado = pyqtSignal()
+    error = pyqtSignal(str)
+
+    def __init__(self, matcher, texto=None, archivo=None, archivo_indice=None):
+        super().__init__()
+        self.matcher = matcher
+        self.texto = texto
+        self.archivo = archivo
+        self.archivo_indice = archivo_indice
+        # Solo latencias: contar comparaciones obligaría a repetir cada búsqueda
+        self.metricas = Metricas(contar_operaciones=False)
+        self._cancelar = False
+
+    def cancelar(self):
+        """Pide detener el análisis; se atiende al terminar el segmento en curso"""
+        self._cancelar = True
+
+    def ejecutar(self):
+        """Recorre los segmentos emitiendo progreso y resultados parciales"""
+        try:
+            if self.archivo:
+                with open_text_stream(self.archivo) as file:
+                    # El tamaño en bytes aproxima el número de caracteres
+                    self._procesar(iter_detect_patterns_stream(file, self.matcher, metricas=self.metricas),
+                                   os.path.getsize(self.archivo))
+            else:
+                if self.archivo_indice and self._procesar_con_indice():
+                    return
+                self._procesar(iter_detect_patterns(self.texto, self.matcher, metricas=self.metricas),
+                               len(self.texto))
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def _procesar_con_indice(self):
+        """
+        Consulta el índice de sufijos del archivo, construyéndolo si falta
+
+        Mientras se construye, el progreso llega hasta PROGRESO_INDICE y se
+        atienden las cancelaciones entre rondas. Retorna False si el texto es
+        demasiado grande para indexarlo y debe recorrerse sin índice.
+        """
+        ultimo = [-1]
+
+        def progreso(fraccion):
+            porcentaje = int(PROGRESO_INDICE * fraccion)
+            if porcentaje != ultimo[0]:
+                self.progreso.emit(porcentaje)
+                ultimo[0] = porcentaje
+
+        indice = obtener_indice(self.archivo_indice, self.texto, self.matcher,
+                                progreso, lambda: self._cancelar)
+        if indice is None:
+            if not self._cancelar:
+                return False
+            self.cancelado.emit()
+            return True
+
+        resultados = detect_patterns_indexed(indice, self.matcher, self.metricas)
+        self._procesar(iter([(len(self.texto), resultados)]), len(self.texto))
+        return True
+
+    def _procesar(self, iterador, total):
+        resultados = ResultadosColumnares()
+        pendientes = ResultadosColumnares()
+        ultimo_envio = time.monotonic()
+        ultimo_porcentaje = -1
+
+        for procesado, parciales in iterador:
+            if self._cancelar:
+                if pendientes:
+                    self.resultados_parciales.emit(pendientes)
+                self.cancelado.emit()
+                return
+
+            resultados.extend(parciales)
+            pendientes.extend(parciales)
+
+            # Agrupar los envíos para no saturar el hilo de la interfaz
+            ahora = time.monotonic()
+            if pendientes and ahora - ultimo_envio >= INTERVALO_PARCIALES:
+                self.resultados_parciales.emit(pendientes)
+                pendientes = ResultadosColumnares()
+                ultimo_envio = ahora
+
+            porcentaje = min(100, int(100 * procesado / total)) if total else 100
+            if porcentaje != ultimo_porcentaje:
+                self.progreso.emit(porcentaje)
+                ultimo_porcentaje = porcentaje
+
+        if pendientes:
+            self.resultados_parciales.emit(pendientes)
+        self.progreso.emit(100)
+        self.terminado.emit(resultados)
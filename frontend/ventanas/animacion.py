@@ -16,6 +16,132 @@ class MatplotlibCanvas(FigureCanvas):
         super(MatplotlibCanvas, self).__init__(self.fig)
 
 
+VENTANA_TEXTO = 40   # caracteres del texto visibles a la vez
+VENTANA_PATRON = 25  # caracteres del patrón (y de su tabla) visibles a la vez
+
+
+def mover_ventana(inicio, desde, hasta, foco, total, casillas):
+    """
+    Nuevo inicio de una ventana de casillas posiciones sobre total elementos
+
+    La ventana se desplaza lo mínimo para mostrar [desde, hasta) y, sobre todo,
+    la posición foco; si ya se ven, no se mueve.
+    """
+    if desde < inicio:
+        inicio = desde
+    if hasta > inicio + casillas:
+        inicio = hasta - casillas
+    if foco < inicio:
+        inicio = foco
+    elif foco >= inicio + casillas:
+        inicio = foco - casillas + 1
+    return max(0, min(inicio, total - casillas))
+
+
+class FilaCaracteres:
+    """
+    Fila de caracteres vista a través de una ventana de ancho fijo
+
+    Hay un texto y un rectángulo de fondo animados por casilla de la ventana, no
+    por carácter: desplazar la ventana solo cambia el contenido de las casillas,
+    así que el costo de cada frame no depende del largo del texto. Unos puntos
+    suspensivos indican que quedan caracteres fuera de la ventana.
+    """
+
+    def __init__(self, blit, ax, x0, paso, y, y_fondo, alto_fondo, casillas, marcas=True):
+        self.x0 = x0
+        self.paso = paso
+        self.inicio = 0
+        self.fondos = [blit.agregar(ax.add_patch(patches.Rectangle((x0 + k * paso - paso / 2, y_fondo), paso,
+                                                                   alto_fondo, alpha=0.7, visible=False)))
+                       for k in range(casillas)]
+        self.textos = [blit.agregar(ax.text(x0 + k * paso, y, '', ha='center', va='center', fontsize=10))
+                       for k in range(casillas)]
+        self.marcas = None
+        if marcas:
+            self.marcas = [blit.agregar(ax.text(x, y, '…', ha='center', va='center', fontsize=10,
+                                                color='#9E9E9E', visible=False))
+                           for x in (x0 - paso, x0 + casillas * paso)]
+
+    def x(self, indice):
+        """Coordenada x del carácter indice según la posición actual de la ventana"""
+        return self.x0 + (indice - self.inicio) * self.paso
+
+    def mostrar(self, inicio, total, contenido):
+        """
+        Muestra las posiciones [inicio, inicio + casillas) de una fila de total caracteres
+
+        contenido(indice) retorna (carácter, color, color de fondo o None), o None
+        si esa casilla queda vacía.
+        """
+        self.inicio = inicio
+        for k, (texto, fondo) in enumerate(zip(self.textos, self.fondos)):
+            celda = contenido(inicio + k) if inicio + k < total else None
+            if celda is None:
+                texto.set_text('')
+                fondo.set_visible(False)
+                continue
+
+            char, color, background = celda
+            texto.set_text(char)
+            texto.set_color(color)
+            fondo.set_visible(background is not None)
+            if background is not None:
+                fondo.set_facecolor(background)
+
+        if self.marcas is not None:
+            self.marcas[0].set_visible(inicio > 0)
+            self.marcas[1].set_visible(inicio + len(self.textos) < total)
+
+
+class GestorBlit:
+    """
+    Redibuja solo los artistas animados de una figura (blitting)
+
+    Tras cada dibujo completo del canvas (primer frame, cambio de tamaño) se
+    guarda como imagen todo lo que no cambia entre frames. Cada frame restaura
+    esa imagen y dibuja encima solo los artistas registrados como animados.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.artistas = []
+        self.fondo = None
+        canvas.mpl_connect('draw_event', self.al_dibujar)
+
+    def agregar(self, artista):
+        """Registra un artista como animado (queda fuera del fondo) y lo retorna"""
+        artista.set_animated(True)
+        self.artistas.append(artista)
+        return artista
+
+    def limpiar(self):
+        """Olvida los artistas y el fondo de la visualización anterior"""
+        self.artistas = []
+        self.fondo = None
+
+    def al_dibujar(self, event):
+        """Guarda el fondo recién dibujado y pinta encima los artistas animados"""
+        self.fondo = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        # Mismo orden que un dibujo normal: rectángulos y flechas debajo de los textos
+        self.artistas.sort(key=lambda artista: artista.get_zorder())
+        self.dibujar_artistas()
+
+    def dibujar_artistas(self):
+        for artista in self.artistas:
+            self.canvas.figure.draw_artist(artista)
+
+    def actualizar(self):
+        """Muestra el estado actual de los artistas animados"""
+        if self.fondo is None:
+            self.canvas.draw()  # Dibujo completo: guarda el fondo (ver al_dibujar)
+        else:
+            self.canvas.restore_region(self.fondo)
+            self.dibujar_artistas()
+            self.canvas.blit(self.canvas.figure.bbox)
+        self.canvas.flush_events()
+
+
 class AnimacionWidget(QWidget):
     def __init__(self):
         super().__init__()
@@ -24,7 +150,9 @@ class AnimacionWidget(QWidget):
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_animation)
         self.current_frame = 0
-        self.max_frames = 20
+        self.generar_pasos = lambda: iter(())  # Sin visualización no hay pasos
+        self.pasos = self.generar_pasos()
+        self.total_pasos = None
         self.animation_speed = 1000  # ms
 
     def init_ui(self):
@@ -131,6 +259,7 @@ class AnimacionWidget(QWidget):
 
         # Área de visualización
         self.canvas = MatplotlibCanvas(self, width=10, height=6, dpi=100)
+        self.blit = GestorBlit(self.canvas)
         main_layout.addWidget(self.canvas)
 
         # Explicación
@@ -174,6 +303,9 @@ class AnimacionWidget(QWidget):
 
         # Limpiar canvas
         self.canvas.fig.clear()
+        self.blit.limpiar()
+        self.generar_pasos = lambda: iter(())
+        self.pasos = self.generar_pasos()
 
         # Obtener texto y patrón
         text = self.text_input.toPlainText()
@@ -190,28 +322,135 @@ class AnimacionWidget(QWidget):
         else:  # Algoritmo Voraz
             self.setup_greedy_visualization()
 
-        # Reiniciar animación
+        # Reiniciar animación (el primer frame hace el dibujo completo)
         self.reset_animation()
-        self.canvas.draw()
 
-    def setup_kmp_visualization(self, text, pattern):
-        """Configura la visualización del algoritmo KMP"""
+    def crear_ejes(self, height_ratios, titulo):
+        """Crea los ejes (sin marcos) y el título de la visualización"""
         # Configuración
         self.canvas.fig.patch.set_facecolor('#f5f5f5')
 
         # Crear layout con GridSpec
-        gs = plt.GridSpec(5, 1, height_ratios=[1, 1, 0.7, 0.7, 2], hspace=0.4, figure=self.canvas.fig)
+        gs = plt.GridSpec(len(height_ratios), 1, height_ratios=height_ratios, hspace=0.4, figure=self.canvas.fig)
 
         # Crear los ejes
         self.axes = []
-        for i in range(5):
+        for i in range(len(height_ratios)):
             ax = self.canvas.fig.add_subplot(gs[i])
             ax.set_facecolor('#f5f5f5')
             ax.axis('off')
+            # Límites fijos: el fondo guardado para el blitting no puede cambiar de escala
+            ax.set_xlim(0, 1)
+            ax.set_ylim(0, 1)
+            ax.set_autoscale_on(False)
             self.axes.append(ax)
 
         # Título
-        self.canvas.fig.suptitle('Visualización del Algoritmo KMP', fontsize=14, weight='bold')
+        self.canvas.fig.suptitle(titulo, fontsize=14, weight='bold')
+
+    def colores_comparacion(self, match):
+        """(color del carácter, color de fondo) para una comparación"""
+        if match:
+            return '#4CAF50', '#E8F5E9'  # Verde para coincidencia
+        return '#F44336', '#FFEBEE'  # Rojo para no coincidencia
+
+    def crear_artistas_comparacion(self, titulo_tabla):
+        """
+        Crea los artistas comunes de KMP y Boyer-Moore
+
+        Lo fijo (títulos, etiquetas y tabla de preprocesamiento) se dibuja una vez
+        en el fondo; las filas de caracteres, el estado y las flechas son animados.
+        """
+        # Paso 1: Texto original
+        self.axes[0].text(0.05, 0.7, 'Texto:', ha='left', va='center', fontsize=12, weight='bold')
+        self.fila_texto = FilaCaracteres(self.blit, self.axes[0], 0.05, 0.02, 0.6, 0.45, 0.3, VENTANA_TEXTO)
+
+        # Paso 2: Patrón
+        self.axes[1].text(0.05, 0.7, 'Patrón:', ha='left', va='center', fontsize=12, weight='bold')
+        self.fila_patron = FilaCaracteres(self.blit, self.axes[1], 0.15, 0.03, 0.6, 0.45, 0.3, VENTANA_PATRON)
+
+        # Paso 3: Tabla de preprocesamiento
+        self.axes[2].text(0.05, 0.7, titulo_tabla, ha='left', va='center', fontsize=12, weight='bold')
+
+        # Paso 4: Estado actual
+        self.axes[3].text(0.05, 0.7, 'Estado:', ha='left', va='center', fontsize=12, weight='bold')
+        self.texto_estado = self.blit.agregar(self.axes[3].text(0.15, 0.7, '', ha='left', va='center', fontsize=11))
+        self.axes[3].text(0.05, 0.3, 'Explicación:', ha='left', va='center', fontsize=12, weight='bold')
+        self.texto_explicacion = self.blit.agregar(self.axes[3].text(0.15, 0.3, '', ha='left', va='center',
+                                                                     fontsize=11))
+
+        # Paso 5: Visualización de la comparación (el patrón alineado comparte la ventana del texto)
+        self.axes[4].text(0.05, 0.9, 'Ejecución:', ha='left', va='center', fontsize=12, weight='bold')
+        self.fila_ejecucion = FilaCaracteres(self.blit, self.axes[4], 0.05, 0.02, 0.8, 0.75, 0.1, VENTANA_TEXTO)
+        self.fila_alineado = FilaCaracteres(self.blit, self.axes[4], 0.05, 0.02, 0.6, 0.55, 0.1, VENTANA_TEXTO,
+                                            marcas=False)
+
+        # Línea conectora
+        self.linea_conectora, = self.axes[4].plot([0.05, 0.05], [0.72, 0.68], 'k-', alpha=0.5)
+        self.blit.agregar(self.linea_conectora)
+
+        # Explicación y flecha del salto
+        self.texto_salto = self.blit.agregar(self.axes[4].text(0.05, 0.4, '', ha='left', va='center',
+                                                               fontsize=11, color='#2196F3'))
+        self.flecha_salto = self.blit.agregar(self.axes[4].add_patch(
+            patches.FancyArrowPatch((0.05, 0.45), (0.05, 0.45), mutation_scale=15,
+                                    facecolor='#2196F3', edgecolor='#2196F3')))
+
+        # Información del paso
+        self.texto_paso = self.blit.agregar(self.axes[4].text(0.05, 0.3, '', ha='left', va='center',
+                                                              fontsize=10, color='#9E9E9E'))
+
+    def pintar_comparacion(self, step, comparado, procesados, inicio_patron, colores_alineado):
+        """
+        Dibuja las filas de caracteres de KMP y Boyer-Moore para un paso
+
+        Las ventanas se desplazan para mostrar el patrón alineado y, sobre todo,
+        el carácter comparado. colores_alineado(i) da (color, fondo) del
+        carácter i del patrón alineado desde inicio_patron.
+        """
+        text, pattern = self.text, self.pattern
+        color, background = self.colores_comparacion(step['match'])
+
+        # Ventana del texto (pasos 1 y 5) y del patrón (paso 2 y tabla)
+        inicio = mover_ventana(self.fila_texto.inicio, max(0, inicio_patron), inicio_patron + len(pattern),
+                               comparado, len(text), VENTANA_TEXTO)
+        inicio_tabla = mover_ventana(self.fila_patron.inicio, step['pattern_pos'] - 1, step['pattern_pos'] + 1,
+                                     step['pattern_pos'], len(pattern), VENTANA_PATRON)
+
+        # Paso 1: solo el carácter comparado
+        self.fila_texto.mostrar(inicio, len(text), lambda i: (text[i], color, background) if i == comparado
+                                else (text[i], 'black', None))
+
+        # Paso 2: carácter del patrón comparado
+        self.fila_patron.mostrar(inicio_tabla, len(pattern),
+                                 lambda i: (pattern[i], color, background) if i == step['pattern_pos']
+                                 else (pattern[i], 'black', None))
+
+        # Paso 5: caracteres ya procesados en gris
+        def ejecucion(i):
+            if i < procesados:
+                return text[i], '#9E9E9E', None  # Gris
+            if i == comparado:
+                return text[i], color, background
+            return text[i], 'black', None
+
+        self.fila_ejecucion.mostrar(inicio, len(text), ejecucion)
+
+        # Patrón alineado con la posición actual
+        def alineado(i):
+            if 0 <= i - inicio_patron < len(pattern):
+                return (pattern[i - inicio_patron],) + colores_alineado(i - inicio_patron)
+            return None
+
+        self.fila_alineado.mostrar(inicio, len(text), alineado)
+
+        # Línea conectora
+        x = self.fila_ejecucion.x(comparado)
+        self.linea_conectora.set_xdata([x, x])
+
+    def setup_kmp_visualization(self, text, pattern):
+        """Configura la visualización del algoritmo KMP"""
+        self.crear_ejes([1, 1, 0.7, 0.7, 2], 'Visualización del Algoritmo KMP')
 
         # Preprocesamiento: computar la tabla LPS
         def compute_lps(pattern):
@@ -239,22 +478,32 @@ class AnimacionWidget(QWidget):
         self.text = text
         self.pattern = pattern
 
-        # Generar pasos de ejecución del algoritmo KMP
-        self.steps = []
+        # Los pasos se generan a medida que se reproducen
+        self.generar_pasos = self.generar_pasos_kmp
+        self.actualizar_frame = self.update_kmp_frame
+        self.total_pasos = None
+
+        # Artistas de la visualización
+        self.crear_artistas_comparacion('Tabla LPS:')
+        self.fila_lps = FilaCaracteres(self.blit, self.axes[2], 0.15, 0.03, 0.6, 0.45, 0.3, VENTANA_PATRON)
+
+    def generar_pasos_kmp(self):
+        """Genera los pasos de ejecución del algoritmo KMP, uno por comparación"""
+        text, pattern = self.text, self.pattern
 
         # Simulación del algoritmo KMP
         i = 0  # índice para text
         j = 0  # índice para pattern
 
         while i < len(text):
-            self.steps.append({
+            step = {
                 'text_pos': i,
                 'pattern_pos': j,
                 'status': f'Comparando texto[{i}]="{text[i]}" con patrón[{j}]="{pattern[j] if j < len(pattern) else ""}"',
                 'match': i < len(text) and j < len(pattern) and text[i] == pattern[j],
                 'skip': 0,
                 'explanation': ''
-            })
+            }
 
             # Coincidencia de caracteres
             if j < len(pattern) and i < len(text) and pattern[j] == text[i]:
@@ -263,206 +512,61 @@ class AnimacionWidget(QWidget):
 
                 # Si encontramos el patrón completo
                 if j == len(pattern):
-                    self.steps[-1]['status'] = f'¡Patrón encontrado en posición {i - j}!'
-                    self.steps[-1]['explanation'] = f'Se ha encontrado el patrón completo "{pattern}" en el texto.'
+                    step['status'] = f'¡Patrón encontrado en posición {i - j}!'
+                    step['explanation'] = f'Se ha encontrado el patrón completo "{pattern}" en el texto.'
                     j = self.lps[j - 1]
             # Si hay una no coincidencia
             elif i < len(text):
                 if j != 0:
-                    self.steps[-1]['skip'] = j - self.lps[j - 1]
-                    self.steps[-1]['explanation'] = f'No coincide. Usando tabla LPS, saltamos a j={self.lps[j - 1]}.'
+                    step['skip'] = j - self.lps[j - 1]
+                    step['explanation'] = f'No coincide. Usando tabla LPS, saltamos a j={self.lps[j - 1]}.'
                     j = self.lps[j - 1]
                 else:
-                    self.steps[-1]['explanation'] = 'No coincide. Avanzamos al siguiente carácter en el texto.'
+                    step['explanation'] = 'No coincide. Avanzamos al siguiente carácter en el texto.'
                     i += 1
 
-        # Limitar número de pasos para la animación
-        self.max_frames = min(20, len(self.steps))
-
-        # Dibujar primer frame
-        self.update_kmp_frame(0)
-
-    def update_kmp_frame(self, frame):
-        """Actualiza la visualización del algoritmo KMP para el frame actual"""
-        # Limpiar todos los ejes
-        for ax in self.axes:
-            ax.clear()
-            ax.set_facecolor('#f5f5f5')
-            ax.axis('off')
-
-        # Obtener el paso actual
-        if frame < len(self.steps):
-            step = self.steps[frame]
-        else:
-            step = self.steps[-1]
-
-        # Paso 1: Texto original
-        self.axes[0].text(0.05, 0.7, 'Texto:', ha='left', va='center', fontsize=12, weight='bold')
-        for i, char in enumerate(self.text):
-            color = 'black'
-            background = 'none'
-
-            # Colorear caracteres según comparación actual
-            if i == step['text_pos']:
-                if step['match']:
-                    color = '#4CAF50'  # Verde para coincidencia
-                    background = '#E8F5E9'
-                else:
-                    color = '#F44336'  # Rojo para no coincidencia
-                    background = '#FFEBEE'
-
-            # Dibujar fondo si es necesario
-            if background != 'none':
-                rect = patches.Rectangle((0.05 + i * 0.02 - 0.01, 0.45), 0.02, 0.3,
-                                         facecolor=background, alpha=0.7)
-                self.axes[0].add_patch(rect)
-
-            # Dibujar carácter
-            self.axes[0].text(0.05 + i * 0.02, 0.6, char, ha='center', va='center', fontsize=10, color=color)
+            yield step
 
-        # Paso 2: Patrón
-        self.axes[1].text(0.05, 0.7, 'Patrón:', ha='left', va='center', fontsize=12, weight='bold')
-        for i, char in enumerate(self.pattern):
-            color = 'black'
-            background = 'none'
+    def update_kmp_frame(self, frame, step):
+        """Actualiza los artistas animados del algoritmo KMP para el paso actual"""
+        # Pasos 1, 2 y 5: carácter comparado, caracteres ya procesados y patrón alineado
+        pattern_start = step['text_pos'] - step['pattern_pos']
 
-            # Colorear caracteres según comparación actual
+        def colores_alineado(i):
+            if i < step['pattern_pos']:
+                # Caracteres ya comparados
+                return self.colores_comparacion(self.text[pattern_start + i] == self.pattern[i])
             if i == step['pattern_pos']:
-                if step['match']:
-                    color = '#4CAF50'  # Verde para coincidencia
-                    background = '#E8F5E9'
-                else:
-                    color = '#F44336'  # Rojo para no coincidencia
-                    background = '#FFEBEE'
-
-            # Dibujar fondo si es necesario
-            if background != 'none':
-                rect = patches.Rectangle((0.15 + i * 0.03 - 0.015, 0.45), 0.03, 0.3,
-                                         facecolor=background, alpha=0.7)
-                self.axes[1].add_patch(rect)
+                # Carácter actual en comparación
+                return self.colores_comparacion(step['match'])
+            return 'black', None
 
-            # Dibujar carácter
-            self.axes[1].text(0.15 + i * 0.03, 0.6, char, ha='center', va='center', fontsize=10, color=color)
+        self.pintar_comparacion(step, step['text_pos'], step['text_pos'], pattern_start, colores_alineado)
 
-        # Paso 3: Tabla LPS
-        self.axes[2].text(0.05, 0.7, 'Tabla LPS:', ha='left', va='center', fontsize=12, weight='bold')
-        for i, val in enumerate(self.lps):
-            self.axes[2].text(0.15 + i * 0.03, 0.6, str(val), ha='center', va='center', fontsize=10)
-
-            # Resaltar valor actual si estamos usando la tabla
-            if step['skip'] > 0 and i == step['pattern_pos'] - 1:
-                rect = patches.Rectangle((0.15 + i * 0.03 - 0.015, 0.45), 0.03, 0.3,
-                                         facecolor='#E3F2FD', alpha=0.7)
-                self.axes[2].add_patch(rect)
+        # Paso 3: Resaltar valor actual si estamos usando la tabla
+        usa_tabla = step['skip'] > 0
+        self.fila_lps.mostrar(self.fila_patron.inicio, len(self.lps),
+                              lambda i: (str(self.lps[i]), 'black',
+                                         '#E3F2FD' if usa_tabla and i == step['pattern_pos'] - 1 else None))
 
         # Paso 4: Estado actual
-        self.axes[3].text(0.05, 0.7, 'Estado:', ha='left', va='center', fontsize=12, weight='bold')
-        self.axes[3].text(0.15, 0.7, step['status'], ha='left', va='center', fontsize=11)
-        self.axes[3].text(0.05, 0.3, 'Explicación:', ha='left', va='center', fontsize=12, weight='bold')
-        self.axes[3].text(0.15, 0.3, step['explanation'], ha='left', va='center', fontsize=11)
-
-        # Paso 5: Visualización de la comparación
-        self.axes[4].text(0.05, 0.9, 'Ejecución:', ha='left', va='center', fontsize=12, weight='bold')
-
-        # Mostrar texto
-        for i, char in enumerate(self.text):
-            color = 'black'
-            background = 'none'
-
-            # Colorear caracteres según comparación actual
-            if i < step['text_pos']:
-                # Caracteres ya procesados
-                color = '#9E9E9E'  # Gris
-            elif i == step['text_pos']:
-                if step['match']:
-                    color = '#4CAF50'  # Verde para coincidencia
-                    background = '#E8F5E9'
-                else:
-                    color = '#F44336'  # Rojo para no coincidencia
-                    background = '#FFEBEE'
-
-            # Dibujar fondo si es necesario
-            if background != 'none':
-                rect = patches.Rectangle((0.05 + i * 0.02 - 0.01, 0.75), 0.02, 0.1,
-                                         facecolor=background, alpha=0.7)
-                self.axes[4].add_patch(rect)
-
-            # Dibujar carácter
-            self.axes[4].text(0.05 + i * 0.02, 0.8, char, ha='center', va='center', fontsize=10, color=color)
-
-        # Mostrar patrón alineado con la posición actual
-        pattern_start = step['text_pos'] - step['pattern_pos']
-        if pattern_start >= 0:
-            for i, char in enumerate(self.pattern):
-                if pattern_start + i < len(self.text):
-                    color = 'black'
-                    background = 'none'
-
-                    # Colorear caracteres según comparación actual
-                    if i < step['pattern_pos']:
-                        # Caracteres ya comparados
-                        if self.text[pattern_start + i] == self.pattern[i]:
-                            color = '#4CAF50'  # Verde para coincidencias
-                            background = '#E8F5E9'
-                        else:
-                            color = '#F44336'  # Rojo para no coincidencias
-                            background = '#FFEBEE'
-                    elif i == step['pattern_pos']:
-                        # Carácter actual en comparación
-                        if step['match']:
-                            color = '#4CAF50'  # Verde para coincidencia
-                            background = '#E8F5E9'
-                        else:
-                            color = '#F44336'  # Rojo para no coincidencia
-                            background = '#FFEBEE'
-
-                    # Dibujar fondo si es necesario
-                    if background != 'none':
-                        rect = patches.Rectangle((0.05 + (pattern_start + i) * 0.02 - 0.01, 0.55), 0.02, 0.1,
-                                                 facecolor=background, alpha=0.7)
-                        self.axes[4].add_patch(rect)
-
-                    # Dibujar carácter
-                    self.axes[4].text(0.05 + (pattern_start + i) * 0.02, 0.6, char, ha='center', va='center',
-                                      fontsize=10, color=color)
-
-        # Línea conectora
-        self.axes[4].plot([0.05 + step['text_pos'] * 0.02, 0.05 + step['text_pos'] * 0.02],
-                          [0.72, 0.68], 'k-', alpha=0.5)
+        self.texto_estado.set_text(step['status'])
+        self.texto_explicacion.set_text(step['explanation'])
 
-        # Explicación del salto
+        # Explicación y flecha del salto
+        self.texto_salto.set_visible(step['skip'] > 0)
+        self.flecha_salto.set_visible(step['skip'] > 0)
         if step['skip'] > 0:
-            self.axes[4].text(0.05, 0.4, f"Salto: {step['skip']} posición(es) en el patrón", ha='left', va='center',
-                              fontsize=11, color='#2196F3')
-
-            # Flecha de salto
-            arrow = patches.FancyArrowPatch((0.05 + step['text_pos'] * 0.02, 0.45),
-                                            (0.05 + step['text_pos'] * 0.02, 0.45),
-                                            mutation_scale=15, facecolor='#2196F3', edgecolor='#2196F3')
-            self.axes[4].add_patch(arrow)
+            self.texto_salto.set_text(f"Salto: {step['skip']} posición(es) en el patrón")
+            x = self.fila_ejecucion.x(step['text_pos'])
+            self.flecha_salto.set_positions((x, 0.45), (x, 0.45))
 
         # Información del paso
-        self.axes[4].text(0.05, 0.3, f"Paso {frame + 1} de {len(self.steps)}", ha='left', va='center',
-                          fontsize=10, color='#9E9E9E')
+        self.texto_paso.set_text(self.texto_numero_paso(frame))
 
     def setup_boyer_moore_visualization(self, text, pattern):
         """Configura la visualización del algoritmo Boyer-Moore"""
-        # Configuración
-        self.canvas.fig.patch.set_facecolor('#f5f5f5')
-
-        # Crear layout con GridSpec
-        gs = plt.GridSpec(5, 1, height_ratios=[1, 1, 0.7, 0.7, 2], hspace=0.4, figure=self.canvas.fig)
-
-        # Crear los ejes
-        self.axes = []
-        for i in range(5):
-            ax = self.canvas.fig.add_subplot(gs[i])
-            ax.set_facecolor('#f5f5f5')
-            ax.axis('off')
-            self.axes.append(ax)
-
-        # Título
-        self.canvas.fig.suptitle('Visualización del Algoritmo Boyer-Moore', fontsize=14, weight='bold')
+        self.crear_ejes([1, 1, 0.7, 0.7, 2], 'Visualización del Algoritmo Boyer-Moore')
 
         # Preprocesamiento para Boyer-Moore
         def bad_character_heuristic(pattern):
@@ -480,8 +584,24 @@ class AnimacionWidget(QWidget):
         self.text = text
         self.pattern = pattern
 
-        # Generar pasos de ejecución del algoritmo Boyer-Moore
-        self.steps = []
+        # Los pasos se generan a medida que se reproducen
+        self.generar_pasos = self.generar_pasos_boyer_moore
+        self.actualizar_frame = self.update_boyer_moore_frame
+        self.total_pasos = None
+
+        # Artistas de la visualización
+        self.crear_artistas_comparacion('Tabla de mal carácter:')
+        bad_char_str = ", ".join([f"'{c}': {self.bad_char[c]}" for c in sorted(self.bad_char.keys())])
+        self.axes[2].text(0.28, 0.6, bad_char_str, ha='left', va='center', fontsize=10)
+
+        # Flecha de dirección de comparación (de derecha a izquierda)
+        self.flecha_direccion = self.blit.agregar(self.axes[4].arrow(0.08, 0.6, -0.03, 0, head_width=0.02,
+                                                                     head_length=0.01, fc='#2196F3', ec='#2196F3',
+                                                                     alpha=0.7))
+
+    def generar_pasos_boyer_moore(self):
+        """Genera los pasos de ejecución del algoritmo Boyer-Moore, uno por comparación"""
+        text, pattern = self.text, self.pattern
 
         # Simulación del algoritmo Boyer-Moore
         s = 0  # s es el desplazamiento del patrón con respecto al texto
@@ -489,37 +609,37 @@ class AnimacionWidget(QWidget):
         while s <= len(text) - len(pattern):
             j = len(pattern) - 1  # Empezamos desde el final del patrón
 
-            self.steps.append({
+            yield {
                 'text_pos': s,
                 'pattern_pos': j,
                 'status': f'Comparando texto[{s + j}]="{text[s + j]}" con patrón[{j}]="{pattern[j]}"',
                 'match': False,
                 'skip': 0,
                 'explanation': 'Comenzando comparación desde el final del patrón'
-            })
+            }
 
             # Coincidencia de caracteres de derecha a izquierda
             while j >= 0 and pattern[j] == text[s + j]:
-                self.steps.append({
+                yield {
                     'text_pos': s,
                     'pattern_pos': j,
                     'status': f'Coincidencia: texto[{s + j}]="{text[s + j]}" con patrón[{j}]="{pattern[j]}"',
                     'match': True,
                     'skip': 0,
                     'explanation': 'Caracteres coinciden. Continuamos comparando hacia la izquierda.'
-                })
+                }
                 j -= 1
 
             # Si el patrón se encontró completamente
             if j < 0:
-                self.steps.append({
+                yield {
                     'text_pos': s,
                     'pattern_pos': 0,
                     'status': f'¡Patrón encontrado en posición {s}!',
                     'match': True,
                     'skip': 1,
                     'explanation': f'Se ha encontrado el patrón completo "{pattern}" en el texto.'
-                })
+                }
                 s += 1
             else:
                 # Aplicamos la regla del mal carácter
@@ -529,206 +649,62 @@ class AnimacionWidget(QWidget):
                 else:
                     skip = max(1, j + 1)
 
-                self.steps.append({
+                yield {
                     'text_pos': s,
                     'pattern_pos': j,
                     'status': f'No coincide: texto[{s + j}]="{text[s + j]}" con patrón[{j}]="{pattern[j]}"',
                     'match': False,
                     'skip': skip,
                     'explanation': f'Usando regla del mal carácter, saltamos {skip} posición(es).'
-                })
+                }
 
                 s += skip
 
-        # Limitar número de pasos para la animación
-        self.max_frames = min(20, len(self.steps))
-
-        # Dibujar primer frame
-        self.update_boyer_moore_frame(0)
-
-    def update_boyer_moore_frame(self, frame):
-        """Actualiza la visualización del algoritmo Boyer-Moore para el frame actual"""
-        # Limpiar todos los ejes
-        for ax in self.axes:
-            ax.clear()
-            ax.set_facecolor('#f5f5f5')
-            ax.axis('off')
-
-        # Obtener el paso actual
-        if frame < len(self.steps):
-            step = self.steps[frame]
-        else:
-            step = self.steps[-1]
-
-        # Paso 1: Texto original
-        self.axes[0].text(0.05, 0.7, 'Texto:', ha='left', va='center', fontsize=12, weight='bold')
-        for i, char in enumerate(self.text):
-            color = 'black'
-            background = 'none'
-
-            # Colorear caracteres según comparación actual
-            if i == step['text_pos'] + step['pattern_pos']:
-                if step['match']:
-                    color = '#4CAF50'  # Verde para coincidencia
-                    background = '#E8F5E9'
-                else:
-                    color = '#F44336'  # Rojo para no coincidencia
-                    background = '#FFEBEE'
-
-            # Dibujar fondo si es necesario
-            if background != 'none':
-                rect = patches.Rectangle((0.05 + i * 0.02 - 0.01, 0.45), 0.02, 0.3,
-                                         facecolor=background, alpha=0.7)
-                self.axes[0].add_patch(rect)
-
-            # Dibujar carácter
-            self.axes[0].text(0.05 + i * 0.02, 0.6, char, ha='center', va='center', fontsize=10, color=color)
-
-        # Paso 2: Patrón
-        self.axes[1].text(0.05, 0.7, 'Patrón:', ha='left', va='center', fontsize=12, weight='bold')
-        for i, char in enumerate(self.pattern):
-            color = 'black'
-            background = 'none'
+    def update_boyer_moore_frame(self, frame, step):
+        """Actualiza los artistas animados del algoritmo Boyer-Moore para el paso actual"""
+        # Pasos 1, 2 y 5: carácter comparado, caracteres ya procesados y patrón alineado
+        comparado = step['text_pos'] + step['pattern_pos']
 
-            # Colorear caracteres según comparación actual
+        def colores_alineado(i):
+            if i > step['pattern_pos']:
+                # Caracteres aún no comparados
+                return '#9E9E9E', None  # Gris
             if i == step['pattern_pos']:
-                if step['match']:
-                    color = '#4CAF50'  # Verde para coincidencia
-                    background = '#E8F5E9'
-                else:
-                    color = '#F44336'  # Rojo para no coincidencia
-                    background = '#FFEBEE'
-
-            # Dibujar fondo si es necesario
-            if background != 'none':
-                rect = patches.Rectangle((0.15 + i * 0.03 - 0.015, 0.45), 0.03, 0.3,
-                                         facecolor=background, alpha=0.7)
-                self.axes[1].add_patch(rect)
-
-            # Dibujar carácter
-            self.axes[1].text(0.15 + i * 0.03, 0.6, char, ha='center', va='center', fontsize=10, color=color)
+                # Carácter actual en comparación
+                return self.colores_comparacion(step['match'])
+            # Caracteres ya comparados (desde el final)
+            return self.colores_comparacion(self.text[step['text_pos'] + i] == self.pattern[i])
 
-        # Paso 3: Tabla de mal carácter
-        self.axes[2].text(0.05, 0.7, 'Tabla de mal carácter:', ha='left', va='center', fontsize=12, weight='bold')
-        bad_char_str = ", ".join([f"'{c}': {self.bad_char[c]}" for c in sorted(self.bad_char.keys())])
-        self.axes[2].text(0.28, 0.6, bad_char_str, ha='left', va='center', fontsize=10)
+        self.pintar_comparacion(step, comparado, step['text_pos'], step['text_pos'], colores_alineado)
 
         # Paso 4: Estado actual
-        self.axes[3].text(0.05, 0.7, 'Estado:', ha='left', va='center', fontsize=12, weight='bold')
-        self.axes[3].text(0.15, 0.7, step['status'], ha='left', va='center', fontsize=11)
-        self.axes[3].text(0.05, 0.3, 'Explicación:', ha='left', va='center', fontsize=12, weight='bold')
-        self.axes[3].text(0.15, 0.3, step['explanation'], ha='left', va='center', fontsize=11)
-
-        # Paso 5: Visualización de la comparación
-        self.axes[4].text(0.05, 0.9, 'Ejecución:', ha='left', va='center', fontsize=12, weight='bold')
-
-        # Mostrar texto
-        for i, char in enumerate(self.text):
-            color = 'black'
-            background = 'none'
-
-            # Colorear caracteres según comparación actual
-            if i < step['text_pos']:
-                # Caracteres ya procesados
-                color = '#9E9E9E'  # Gris
-            elif i == step['text_pos'] + step['pattern_pos']:
-                if step['match']:
-                    color = '#4CAF50'  # Verde para coincidencia
-                    background = '#E8F5E9'
-                else:
-                    color = '#F44336'  # Rojo para no coincidencia
-                    background = '#FFEBEE'
-
-            # Dibujar fondo si es necesario
-            if background != 'none':
-                rect = patches.Rectangle((0.05 + i * 0.02 - 0.01, 0.75), 0.02, 0.1,
-                                         facecolor=background, alpha=0.7)
-                self.axes[4].add_patch(rect)
-
-            # Dibujar carácter
-            self.axes[4].text(0.05 + i * 0.02, 0.8, char, ha='center', va='center', fontsize=10, color=color)
-
-        # Mostrar patrón alineado con la posición actual
-        for i, char in enumerate(self.pattern):
-            if step['text_pos'] + i < len(self.text):
-                color = 'black'
-                background = 'none'
-
-                # Colorear caracteres según comparación actual
-                if i > step['pattern_pos']:
-                    # Caracteres aún no comparados
-                    color = '#9E9E9E'  # Gris
-                elif i == step['pattern_pos']:
-                    # Carácter actual en comparación
-                    if step['match']:
-                        color = '#4CAF50'  # Verde para coincidencia
-                        background = '#E8F5E9'
-                    else:
-                        color = '#F44336'  # Rojo para no coincidencia
-                        background = '#FFEBEE'
-                else:
-                    # Caracteres ya comparados (desde el final)
-                    if self.text[step['text_pos'] + i] == self.pattern[i]:
-                        color = '#4CAF50'  # Verde para coincidencias
-                        background = '#E8F5E9'
-                    else:
-                        color = '#F44336'  # Rojo para no coincidencias
-                        background = '#FFEBEE'
-
-                # Dibujar fondo si es necesario
-                if background != 'none':
-                    rect = patches.Rectangle((0.05 + (step['text_pos'] + i) * 0.02 - 0.01, 0.55), 0.02, 0.1,
-                                             facecolor=background, alpha=0.7)
-                    self.axes[4].add_patch(rect)
-
-                # Dibujar carácter
-                self.axes[4].text(0.05 + (step['text_pos'] + i) * 0.02, 0.6, char, ha='center', va='center',
-                                  fontsize=10, color=color)
-
-        # Línea conectora
-        self.axes[4].plot([0.05 + (step['text_pos'] + step['pattern_pos']) * 0.02,
-                           0.05 + (step['text_pos'] + step['pattern_pos']) * 0.02],
-                          [0.72, 0.68], 'k-', alpha=0.5)
+        self.texto_estado.set_text(step['status'])
+        self.texto_explicacion.set_text(step['explanation'])
 
         # Flecha de dirección de comparación (de derecha a izquierda)
-        if step['pattern_pos'] < len(self.pattern) - 1:
-            self.axes[4].arrow(0.05 + (step['text_pos'] + step['pattern_pos']) * 0.02 + 0.03, 0.6,
-                               -0.03, 0, head_width=0.02, head_length=0.01,
-                               fc='#2196F3', ec='#2196F3', alpha=0.7)
+        self.flecha_direccion.set_visible(step['pattern_pos'] < len(self.pattern) - 1)
+        self.flecha_direccion.set_data(x=self.fila_ejecucion.x(comparado) + 0.03)
 
-        # Explicación del salto
+        # Explicación y flecha del salto
+        self.texto_salto.set_visible(step['skip'] > 0)
+        self.flecha_salto.set_visible(step['skip'] > 0)
         if step['skip'] > 0:
-            self.axes[4].text(0.05, 0.4, f"Salto: {step['skip']} posición(es)", ha='left', va='center',
-                              fontsize=11, color='#2196F3')
-
-            # Flecha de salto
-            arrow = patches.FancyArrowPatch((0.05 + step['text_pos'] * 0.02, 0.45),
-                                            (0.05 + (step['text_pos'] + step['skip']) * 0.02, 0.45),
-                                            mutation_scale=15, facecolor='#2196F3', edgecolor='#2196F3')
-            self.axes[4].add_patch(arrow)
+            self.texto_salto.set_text(f"Salto: {step['skip']} posición(es)")
+            self.flecha_salto.set_positions((self.fila_ejecucion.x(step['text_pos']), 0.45),
+                                            (self.fila_ejecucion.x(step['text_pos'] + step['skip']), 0.45))
 
         # Información del paso
-        self.axes[4].text(0.05, 0.3, f"Paso {frame + 1} de {len(self.steps)}", ha='left', va='center',
-                          fontsize=10, color='#9E9E9E')
+        self.texto_paso.set_text(self.texto_numero_paso(frame))
+
+    def texto_numero_paso(self, frame):
+        """'Paso k de N'; N se conoce recién al terminar la primera pasada por los pasos"""
+        if self.total_pasos is None:
+            return f"Paso {frame + 1}"
+        return f"Paso {frame + 1} de {self.total_pasos}"
 
     def setup_greedy_visualization(self):
         """Configura la visualización del algoritmo voraz"""
-        # Configuración
-        self.canvas.fig.patch.set_facecolor('#f5f5f5')
-
-        # Crear layout con GridSpec
-        gs = plt.GridSpec(4, 1, height_ratios=[1, 1, 0.7, 2], hspace=0.4, figure=self.canvas.fig)
-
-        # Crear los ejes
-        self.axes = []
-        for i in range(4):
-            ax = self.canvas.fig.add_subplot(gs[i])
-            ax.set_facecolor('#f5f5f5')
-            ax.axis('off')
-            self.axes.append(ax)
-
-        # Título
-        self.canvas.fig.suptitle('Visualización del Algoritmo Voraz para Priorización', fontsize=14, weight='bold')
+        self.crear_ejes([1, 1, 0.7, 2], 'Visualización del Algoritmo Voraz para Priorización')
 
         # Datos de alertas
         self.alerts = [
@@ -817,27 +793,12 @@ class AnimacionWidget(QWidget):
             'selected_alerts': selected_alerts
         })
 
-        # Limitar número de pasos para la animación
-        self.max_frames = len(self.steps)
-
-        # Dibujar primer frame
-        self.update_greedy_frame(0)
-
-    def update_greedy_frame(self, frame):
-        """Actualiza la visualización del algoritmo voraz para el frame actual"""
-        # Limpiar todos los ejes
-        for ax in self.axes:
-            ax.clear()
-            ax.set_facecolor('#f5f5f5')
-            ax.axis('off')
-
-        # Obtener el paso actual
-        if frame < len(self.steps):
-            step = self.steps[frame]
-        else:
-            step = self.steps[-1]
+        # Pocos pasos (uno por alerta): se generan juntos y se recorren igual que los demás
+        self.generar_pasos = self.steps.__iter__
+        self.actualizar_frame = self.update_greedy_frame
+        self.total_pasos = len(self.steps)
 
-        # Paso 1: Alertas detectadas
+        # Paso 1: Alertas detectadas (no cambia entre frames)
         self.axes[0].text(0.05, 0.7, 'Alertas detectadas:', ha='left', va='center', fontsize=12, weight='bold')
 
         # Mostrar tabla de alertas
@@ -858,7 +819,7 @@ class AnimacionWidget(QWidget):
 
                 self.axes[0].text(0.05 + i * 0.18, 0.4 - j * 0.1, data, ha='left', va='center', fontsize=9, color=color)
 
-        # Paso 2: Alertas ordenadas por ratio valor/peso
+        # Paso 2: Alertas ordenadas por ratio valor/peso (no cambia entre frames)
         self.axes[1].text(0.05, 0.7, 'Alertas ordenadas por ratio valor/peso (descendente):',
                           ha='left', va='center', fontsize=12, weight='bold')
 
@@ -878,41 +839,70 @@ class AnimacionWidget(QWidget):
                 self.axes[1].text(0.05 + i * 0.15, 0.4 - j * 0.1, data, ha='left', va='center', fontsize=9, color=color)
 
         # Paso 3: Estado actual
-        self.axes[2].text(0.05, 0.5, f'Estado: {step["status"]} (paso {step["step"]} de {len(self.steps)})',
-                          ha='left', va='center', fontsize=12, weight='bold')
+        self.texto_estado = self.blit.agregar(self.axes[2].text(0.05, 0.5, '', ha='left', va='center', fontsize=12,
+                                                                weight='bold'))
 
         # Paso 4: Visualización de la mochila
-        self.axes[3].text(0.05, 0.9, step['explanation'], ha='left', va='top', fontsize=10, wrap=True)
+        self.texto_explicacion = self.blit.agregar(self.axes[3].text(0.05, 0.9, '', ha='left', va='top', fontsize=10,
+                                                                     wrap=True))
 
-        # Dibujar mochila
+        # Mochila vacía y su capacidad
         self.axes[3].add_patch(patches.Rectangle((0.1, 0.2), 0.8, 0.3, linewidth=2,
                                                  edgecolor='#3F51B5', facecolor='none', alpha=0.8))
         self.axes[3].text(0.5, 0.15, f'Capacidad: {self.max_capacity}', ha='center', va='center', fontsize=10)
 
+        # Un bloque (y su texto) por alerta que pueda entrar en la mochila
+        self.bloques_mochila = [self.blit.agregar(self.axes[3].add_patch(
+            patches.Rectangle((0.1, 0.2), 0, 0.3, linewidth=1, edgecolor='white', alpha=0.7, visible=False)))
+            for _ in self.alerts]
+        self.textos_bloques = [self.blit.agregar(self.axes[3].text(0, 0.35, '', ha='center', va='center',
+                                                                   fontsize=9, color='white'))
+                               for _ in self.alerts]
+
+        # Información de capacidad utilizada
+        self.texto_capacidad = self.blit.agregar(self.axes[3].text(0.1, 0.1, '', ha='left', va='center',
+                                                                   fontsize=10, color='#3F51B5'))
+        self.texto_valor = self.blit.agregar(self.axes[3].text(0.5, 0.1, '', ha='left', va='center', fontsize=10,
+                                                               fontweight='bold', color='#3F51B5'))
+
+    def update_greedy_frame(self, frame, step):
+        """Actualiza los artistas animados del algoritmo voraz para el paso actual"""
+        # Paso 3: Estado actual
+        self.texto_estado.set_text(f'Estado: {step["status"]} (paso {step["step"]} de {len(self.steps)})')
+
+        # Paso 4: Explicación
+        self.texto_explicacion.set_text(step['explanation'])
+
         # Llenar la mochila con las alertas seleccionadas
         current_x = 0.1
-        for value, weight, pattern, tipo, nivel, fraction in step['selected_alerts']:
+        for k, (bloque, texto) in enumerate(zip(self.bloques_mochila, self.textos_bloques)):
+            if k >= len(step['selected_alerts']):
+                bloque.set_visible(False)
+                texto.set_visible(False)
+                continue
+
+            value, weight, pattern, tipo, nivel, fraction = step['selected_alerts'][k]
             width = (weight * fraction / self.max_capacity) * 0.8
 
             # Color según nivel
             color = '#F44336' if nivel == "Alto" else '#FF9800' if nivel == "Moderado" else '#4CAF50'
 
-            # Dibujar bloque en la mochila
-            self.axes[3].add_patch(patches.Rectangle((current_x, 0.2), width, 0.3, linewidth=1,
-                                                     edgecolor='white', facecolor=color, alpha=0.7))
+            # Bloque en la mochila
+            bloque.set_x(current_x)
+            bloque.set_width(width)
+            bloque.set_facecolor(color)
+            bloque.set_visible(True)
 
             # Texto en el bloque
-            if width > 0.1:
-                self.axes[3].text(current_x + width / 2, 0.35, f"{pattern[:5]}...\n{fraction * 100:.0f}%",
-                                  ha='center', va='center', fontsize=9, color='white')
+            texto.set_visible(width > 0.1)
+            texto.set_position((current_x + width / 2, 0.35))
+            texto.set_text(f"{pattern[:5]}...\n{fraction * 100:.0f}%")
 
             current_x += width
 
         # Información de capacidad utilizada
-        self.axes[3].text(0.1, 0.1, f"Capacidad utilizada: {step['current_capacity']:.1f}/{self.max_capacity}",
-                          ha='left', va='center', fontsize=10, color='#3F51B5')
-        self.axes[3].text(0.5, 0.1, f"Valor total: {step['current_value']:.2f}",
-                          ha='left', va='center', fontsize=10, fontweight='bold', color='#3F51B5')
+        self.texto_capacidad.set_text(f"Capacidad utilizada: {step['current_capacity']:.1f}/{self.max_capacity}")
+        self.texto_valor.set_text(f"Valor total: {step['current_value']:.2f}")
 
     def toggle_animation(self):
         """Inicia o pausa la animación"""
@@ -933,6 +923,7 @@ class AnimacionWidget(QWidget):
 
     def reset_animation(self):
         """Reinicia la animación"""
+        self.pasos = self.generar_pasos()
         self.current_frame = 0
         self.update_animation()
 
@@ -944,17 +935,21 @@ class AnimacionWidget(QWidget):
             self.timer.start(self.animation_speed)
 
     def update_animation(self):
-        """Actualiza el frame de la animación"""
-        if self.kmp_radio.isChecked():
-            self.update_kmp_frame(self.current_frame)
-        elif self.boyer_moore_radio.isChecked():
-            self.update_boyer_moore_frame(self.current_frame)
-        else:  # Algoritmo Voraz
-            self.update_greedy_frame(self.current_frame)
-
-        self.canvas.draw()
+        """Muestra el siguiente paso de la animación"""
+        step = next(self.pasos, None)
+        if step is None:
+            # Fin de los pasos: ya se sabe cuántos son y se vuelve a empezar
+            self.total_pasos = self.current_frame
+            self.pasos = self.generar_pasos()
+            self.current_frame = 0
+            step = next(self.pasos, None)
+            if step is None:  # Sin pasos (p. ej. patrón más largo que el texto)
+                return
+
+        self.actualizar_frame(self.current_frame, step)
+
+        # Solo se redibujan los artistas animados sobre el fondo guardado
+        self.blit.actualizar()
 
         # Avanzar al siguiente frame
         self.current_frame += 1
-        if self.current_frame >= self.max_frames:
-            self.current_frame = 0
\ No newline at end of file
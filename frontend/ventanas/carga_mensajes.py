@@ -1,16 +1,56 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-                             QTextEdit, QFileDialog, QGroupBox)
-from PyQt5.QtCore import pyqtSignal
-from backend.utils.procesador_texto import detect_patterns
+                             QTextEdit, QFileDialog, QGroupBox, QProgressBar, QCheckBox)
+from PyQt5.QtCore import pyqtSignal, QThread
+from frontend.ventanas.analisis_worker import AnalisisWorker
+from backend.utils.sesion import SesionAnalisis
+from backend.utils.file_readers import read_text_file, open_text_stream
+import os
+
+
+# Los archivos más grandes no se cargan en el editor: se analizan en streaming
+TAMANO_MAXIMO_EDITOR = 1024 * 1024  # bytes
+CARACTERES_VISTA_PREVIA = 10000
+
+
+def _edicion_en_caracteres(texto, longitud_anterior, posicion, insertados):
+    """
+    Traduce una edición de QTextDocument.contentsChange a caracteres de Python
+
+    Qt da la posición y las longitudes en unidades UTF-16. El texto anterior a
+    la posición no cambió, así que se traduce sobre el texto nuevo, igual que lo
+    insertado; lo eliminado se deduce de la diferencia de longitudes.
+
+    Returns:
+        Tupla (posicion, eliminados, insertados) en caracteres
+    """
+    utf16 = texto.encode('utf-16-le', 'surrogatepass')
+    inicio = len(utf16[:2 * posicion].decode('utf-16-le', 'surrogatepass'))
+    agregados = len(utf16[2 * posicion:2 * (posicion + insertados)].decode('utf-16-le', 'surrogatepass'))
+    return inicio, longitud_anterior - len(texto) + agregados, agregados
 
 
 class CargaMensajesWidget(QWidget):
-    # Señal para comunicar que el análisis ha terminado
-    analisis_completado = pyqtSignal(list)
+    # Señales del ciclo de vida del análisis
+    analisis_iniciado = pyqtSignal()
+    resultados_parciales = pyqtSignal(object)  # ResultadosColumnares
+    metricas_disponibles = pyqtSignal(object)  # Metricas del análisis, antes de analisis_completado
+    analisis_completado = pyqtSignal(object)
+    # Cambios por una edición del texto: (eliminados, agregados, desde, delta); las
+    # coincidencias que empiezan en desde o después se desplazaron delta caracteres
+    resultados_actualizados = pyqtSignal(object, object, int, int)
+    # Copia de los resultados de la sesión incremental, ordenados por posición: al
+    # terminar el análisis del editor y al cambiar los patrones
+    resultados_reemplazados = pyqtSignal(object)
 
     def __init__(self, patrones_manager):
         super().__init__()
         self.patrones_manager = patrones_manager
+        self.archivo_stream = None  # Ruta del archivo grande a analizar en streaming
+        self.archivo_cargado = None  # Ruta del archivo mostrado en el editor, para su índice
+        self.hilo = None
+        self.worker = None
+        # Sesión incremental del último texto analizado en el editor
+        self.sesion = None
         self.init_ui()
 
     def init_ui(self):
@@ -25,8 +65,19 @@ class CargaMensajesWidget(QWidget):
         self.file_button = QPushButton("Seleccionar archivo")
         self.file_button.clicked.connect(self.seleccionar_archivo)
 
+        # El índice ocupa en disco varias veces el archivo: solo se crea si se pide
+        self.indice_check = QCheckBox("Guardar un índice de sufijos junto al archivo (acelera los reanálisis)")
+        self.indice_check.setChecked(False)
+
+        # Sin marcar, los patrones también coinciden dentro de otras palabras ("fea" en "fealdad")
+        self.palabras_check = QCheckBox("Buscar solo palabras completas")
+        self.palabras_check.setChecked(self.patrones_manager.palabras_completas)
+        self.palabras_check.toggled.connect(self.cambiar_palabras_completas)
+
         file_layout.addWidget(self.file_label)
         file_layout.addWidget(self.file_button)
+        file_layout.addWidget(self.indice_check)
+        file_layout.addWidget(self.palabras_check)
         file_group.setLayout(file_layout)
 
         # Sección de ingreso manual
@@ -34,6 +85,7 @@ class CargaMensajesWidget(QWidget):
         text_layout = QVBoxLayout()
 
         self.text_edit = QTextEdit()
+        self.text_edit.document().contentsChange.connect(self.texto_editado)
         text_layout.addWidget(self.text_edit)
         text_group.setLayout(text_layout)
 
@@ -42,10 +94,25 @@ class CargaMensajesWidget(QWidget):
         self.analyze_button.setStyleSheet("background-color: #4CAF50; color: white; font-weight: bold; padding: 10px;")
         self.analyze_button.clicked.connect(self.analizar_texto)
 
+        # Progreso y cancelación del análisis en curso
+        progress_layout = QHBoxLayout()
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setVisible(False)
+
+        self.cancel_button = QPushButton("Cancelar")
+        self.cancel_button.setVisible(False)
+        self.cancel_button.clicked.connect(self.cancelar_analisis)
+
+        progress_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.cancel_button)
+
         # Añadir todo al layout principal
         main_layout.addWidget(file_group)
         main_layout.addWidget(text_group)
         main_layout.addWidget(self.analyze_button)
+        main_layout.addLayout(progress_layout)
 
         self.setLayout(main_layout)
 
@@ -56,24 +123,139 @@ class CargaMensajesWidget(QWidget):
 
         if file_path:
             self.file_label.setText(file_path)
-            # Cargar contenido del archivo en el editor de texto
+            self.sesion = None  # El texto nuevo requiere un análisis completo
+            self.archivo_stream = None
+            self.archivo_cargado = None
+            self.text_edit.setReadOnly(False)
             try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    self.text_edit.setText(file.read())
+                if os.path.getsize(file_path) > TAMANO_MAXIMO_EDITOR:
+                    # Archivo grande: solo se muestra una vista previa y se analiza por bloques
+                    with open_text_stream(file_path) as file:
+                        self.text_edit.setPlainText(file.read(CARACTERES_VISTA_PREVIA))
+                    self.text_edit.setReadOnly(True)
+                    self.archivo_stream = file_path
+                    self.file_label.setText(f"{file_path} (vista previa; se analizará el archivo completo)")
+                else:
+                    # Cargar contenido del archivo en el editor de texto
+                    self.text_edit.setText(read_text_file(file_path))
+                    # Mientras no se edite, el texto puede analizarse con el índice del archivo
+                    self.text_edit.document().setModified(False)
+                    self.archivo_cargado = file_path
             except Exception as e:
                 self.file_label.setText(f"Error al abrir archivo: {e}")
 
     def analizar_texto(self):
-        """Analiza el texto ingresado buscando patrones de ciberacoso"""
+        """Lanza el análisis en un hilo aparte para no bloquear la interfaz"""
+        if self.hilo is not None:
+            return  # Ya hay un análisis en curso
+
+        # Obtener el matcher compilado del gestor (se reutiliza entre análisis)
+        matcher = self.patrones_manager.obtener_matcher()
+        self.sesion = None
+
+        if self.archivo_stream:
+            # Archivo grande: se lee por bloques dentro del worker
+            self.worker = AnalisisWorker(matcher, archivo=self.archivo_stream)
+        else:
+            texto = self.text_edit.toPlainText()
+            if not texto:
+                return
+            if (self.indice_check.isChecked() and self.archivo_cargado
+                    and not self.text_edit.document().isModified()):
+                # Mismo texto del archivo: se consulta su índice de sufijos
+                self.worker = AnalisisWorker(matcher, texto=texto, archivo_indice=self.archivo_cargado)
+            else:
+                self.worker = AnalisisWorker(matcher, texto=texto)
+
+        self.hilo = QThread()
+        self.worker.moveToThread(self.hilo)
+
+        # Conectar señales del worker
+        self.hilo.started.connect(self.worker.ejecutar)
+        self.worker.progreso.connect(self.progress_bar.setValue)
+        self.worker.resultados_parciales.connect(self.resultados_parciales)
+        self.worker.terminado.connect(self.finalizar_analisis)
+        self.worker.cancelado.connect(self.analisis_cancelado)
+        self.worker.error.connect(self.analisis_fallido)
+        self.hilo.finished.connect(self.limpiar_hilo)
+
+        # Actualizar controles
+        self.analyze_button.setEnabled(False)
+        self.palabras_check.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.cancel_button.setEnabled(True)
+        self.cancel_button.setVisible(True)
+
+        self.analisis_iniciado.emit()
+        self.hilo.start()
+
+    def cancelar_analisis(self):
+        """Pide al worker que detenga el análisis en curso"""
+        if self.worker is not None:
+            self.cancel_button.setEnabled(False)
+            self.worker.cancelar()
+
+    def finalizar_analisis(self, resultados):
+        """Recibe los resultados completos del worker"""
+        self.hilo.quit()
+
+        # El texto del editor queda abierto a análisis incrementales (si no se editó mientras tanto)
+        if self.worker.texto is not None and self.worker.texto == self.text_edit.toPlainText():
+            self.sesion = SesionAnalisis(self.worker.texto, self.worker.matcher, resultados=resultados)
+            # La tabla pasa a tener las mismas filas, en el mismo orden, que la sesión
+            self.resultados_reemplazados.emit(self.sesion.resultados.copia())
+
+        # Emitir señales con las métricas y los resultados
+        self.metricas_disponibles.emit(self.worker.metricas)
+        self.analisis_completado.emit(resultados)
+
+    def texto_editado(self, posicion, eliminados, insertados):
+        """Vuelve a analizar solo el rango editado del texto ya analizado"""
+        if self.sesion is None or self.hilo is not None:
+            return
+
         texto = self.text_edit.toPlainText()
-        if not texto:
+        # Qt cuenta en unidades UTF-16: si hay caracteres fuera del plano básico
+        # (emoji), que ocupan dos, hay que traducir la edición a caracteres de Python
+        if len(texto) != self.text_edit.document().characterCount() - 1:
+            posicion, eliminados, insertados = _edicion_en_caracteres(texto, len(self.sesion.texto),
+                                                                     posicion, insertados)
+
+        cambios = self.sesion.editar_texto(texto, posicion, eliminados, insertados)
+        self.resultados_actualizados.emit(*cambios)
+
+    def actualizar_patrones(self):
+        """Busca solo los patrones agregados y descarta los eliminados en el texto ya analizado"""
+        if self.sesion is None or self.hilo is not None:
             return
 
-        # Obtener patrones del gestor
-        patrones = self.patrones_manager.obtener_patrones()
+        cambios = self.sesion.actualizar_patrones(self.patrones_manager.obtener_matcher())
+        if len(cambios[0]) or len(cambios[1]):
+            self.resultados_reemplazados.emit(self.sesion.resultados.copia())
+
+    def cambiar_palabras_completas(self, activo):
+        """Cambia el modo de búsqueda; los resultados mostrados valen hasta el próximo análisis"""
+        self.patrones_manager.cambiar_palabras_completas(activo)
+        # La sesión incremental quedó con el modo anterior: las ediciones no se reanalizan
+        self.sesion = None
+
+    def analisis_cancelado(self):
+        self.hilo.quit()
+        self.file_label.setText("Análisis cancelado; se muestran los resultados parciales")
+
+    def analisis_fallido(self, mensaje):
+        self.hilo.quit()
+        self.file_label.setText(f"Error durante el análisis: {mensaje}")
 
-        # Detectar patrones en el texto
-        resultados = detect_patterns(texto, patrones)
+    def limpiar_hilo(self):
+        """Libera el hilo y el worker una vez que el hilo terminó"""
+        self.worker.deleteLater()
+        self.hilo.deleteLater()
+        self.worker = None
+        self.hilo = None
 
-        # Emitir señal con los resultados
-        self.analisis_completado.emit(resultados)
\ No newline at end of file
+        self.analyze_button.setEnabled(True)
+        self.palabras_check.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        self.cancel_button.setVisible(False)
\ No newline at end of file
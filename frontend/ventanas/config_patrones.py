@@ -1,15 +1,117 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-                             QTableWidget, QTableWidgetItem, QComboBox, QLineEdit,
-                             QHeaderView, QMessageBox)
-from PyQt5.QtCore import Qt
+                             QTableView, QComboBox, QLineEdit, QHeaderView, QMessageBox,
+                             QFileDialog, QStyledItemDelegate, QStyleOptionButton, QStyle,
+                             QApplication)
+from PyQt5.QtCore import (Qt, pyqtSignal, QAbstractTableModel, QModelIndex, QSortFilterProxyModel,
+                          QEvent, QSize)
+from backend.modelos.patrones import PatronesManager
+
+
+RUTA_PATRONES = "data/patrones_ciberacoso.csv"
+COLUMNAS = ["Patrón", "Tipo", "Nivel de Severidad", "Acciones"]
+COLUMNA_ACCIONES = 3
+
+
+class ModeloPatrones(QAbstractTableModel):
+    """
+    Modelo de tabla sobre la lista de patrones del gestor
+
+    Cada alta o baja se informa a la vista como inserción o eliminación de
+    filas, en lugar de reconstruir la tabla completa.
+    """
+
+    def __init__(self, patrones_manager, parent=None):
+        super().__init__(parent)
+        self.patrones_manager = patrones_manager
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.patrones_manager.patrones)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNAS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNAS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.column() == COLUMNA_ACCIONES:
+            return None
+        if role == Qt.DisplayRole:
+            return self.patrones_manager.patrones[index.row()][index.column()]
+        return None
+
+    def agregar(self, patron, tipo, nivel):
+        """Agrega un patrón al final"""
+        fila = self.rowCount()
+        self.beginInsertRows(QModelIndex(), fila, fila)
+        self.patrones_manager.agregar_patron(patron, tipo, nivel)
+        self.endInsertRows()
+
+    def eliminar(self, fila):
+        """Elimina el patrón de la fila indicada"""
+        if not 0 <= fila < self.rowCount():
+            return False
+        self.beginRemoveRows(QModelIndex(), fila, fila)
+        self.patrones_manager.eliminar_patron(fila)
+        self.endRemoveRows()
+        return True
+
+    def importar(self, csv_path):
+        """Agrega todos los patrones de un CSV con una sola inserción de filas; retorna cuántos (-1 si falla)"""
+        try:
+            patrones, tolerancias = PatronesManager.leer_csv(csv_path)
+        except Exception as e:
+            print(f"Error al importar CSV: {e}")
+            return -1
+
+        if patrones:
+            fila = self.rowCount()
+            self.beginInsertRows(QModelIndex(), fila, fila + len(patrones) - 1)
+            self.patrones_manager.agregar_patrones(patrones, tolerancias)
+            self.endInsertRows()
+        return len(patrones)
+
+    def recargar(self, csv_path):
+        """Reemplaza los patrones por los del CSV"""
+        self.beginResetModel()
+        resultado = self.patrones_manager.cargar_desde_csv(csv_path)
+        self.endResetModel()
+        return resultado
+
+
+class EliminarDelegate(QStyledItemDelegate):
+    """Dibuja el botón Eliminar de cada fila sin crear un widget por fila"""
+    eliminar = pyqtSignal(QModelIndex)
+
+    def paint(self, painter, option, index):
+        boton = QStyleOptionButton()
+        boton.rect = option.rect.adjusted(2, 2, -2, -2)
+        boton.text = "Eliminar"
+        boton.state = QStyle.State_Enabled | QStyle.State_Raised
+        estilo = option.widget.style() if option.widget else QApplication.style()
+        estilo.drawControl(QStyle.CE_PushButton, boton, painter, option.widget)
+
+    def sizeHint(self, option, index):
+        return QSize(option.fontMetrics.horizontalAdvance("Eliminar") + 24, option.fontMetrics.height() + 10)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and option.rect.contains(event.pos()):
+            self.eliminar.emit(index)
+            return True
+        return False
 
 
 class ConfigPatronesWidget(QWidget):
+    # Se emite al agregar, eliminar, importar o recargar patrones
+    patrones_modificados = pyqtSignal()
+
     def __init__(self, patrones_manager):
         super().__init__()
         self.patrones_manager = patrones_manager
+        self.modelo = ModeloPatrones(patrones_manager, self)
         self.init_ui()
-        self.cargar_patrones()
 
     def init_ui(self):
         # Layout principal
@@ -20,10 +122,26 @@ class ConfigPatronesWidget(QWidget):
         title_label.setStyleSheet("font-size: 16px; font-weight: bold;")
         main_layout.addWidget(title_label)
 
-        # Tabla de patrones
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)  # Patrón, Tipo, Nivel, Acciones
-        self.table.setHorizontalHeaderLabels(["Patrón", "Tipo", "Nivel de Severidad", "Acciones"])
+        # Búsqueda dentro de la tabla
+        self.busqueda_input = QLineEdit()
+        self.busqueda_input.setPlaceholderText("Buscar patrón, tipo o nivel...")
+        main_layout.addWidget(self.busqueda_input)
+
+        # Tabla de patrones: el proxy filtra sin tocar el modelo
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.modelo)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.proxy.setFilterKeyColumn(-1)  # Buscar en todas las columnas
+        self.busqueda_input.textChanged.connect(self.proxy.setFilterFixedString)
+
+        self.delegado_eliminar = EliminarDelegate(self)
+        self.delegado_eliminar.eliminar.connect(self.eliminar_fila)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.setItemDelegateForColumn(COLUMNA_ACCIONES, self.delegado_eliminar)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
@@ -61,32 +179,36 @@ class ConfigPatronesWidget(QWidget):
         self.load_button = QPushButton("Recargar desde Archivo")
         self.load_button.clicked.connect(self.cargar_patrones)
 
+        self.import_button = QPushButton("Importar CSV...")
+        self.import_button.clicked.connect(self.importar_patrones)
+
         buttons_layout.addWidget(self.save_button)
         buttons_layout.addWidget(self.load_button)
+        buttons_layout.addWidget(self.import_button)
 
         main_layout.addLayout(buttons_layout)
 
         self.setLayout(main_layout)
 
     def cargar_patrones(self):
-        """Carga los patrones desde el gestor a la tabla"""
-        patrones = self.patrones_manager.obtener_patrones()
-
-        self.table.setRowCount(0)  # Limpiar tabla
-
-        for i, (patron, tipo, nivel) in enumerate(patrones):
-            self.table.insertRow(i)
-
-            # Añadir datos a la tabla
-            self.table.setItem(i, 0, QTableWidgetItem(patron))
-            self.table.setItem(i, 1, QTableWidgetItem(tipo))
-            self.table.setItem(i, 2, QTableWidgetItem(nivel))
+        """Recarga los patrones desde el archivo CSV"""
+        if self.modelo.recargar(RUTA_PATRONES):
+            self.patrones_modificados.emit()
+        else:
+            QMessageBox.warning(self, "Error", "No se pudieron cargar los patrones")
 
-            # Botón de eliminar
-            delete_button = QPushButton("Eliminar")
-            delete_button.clicked.connect(lambda checked, row=i: self.eliminar_patron(row))
+    def importar_patrones(self):
+        """Agrega los patrones de otro archivo CSV a la lista"""
+        csv_path, _ = QFileDialog.getOpenFileName(self, "Importar patrones", "",
+                                                  "Archivos CSV (*.csv);;Todos los archivos (*)")
+        if not csv_path:
+            return
 
-            self.table.setCellWidget(i, 3, delete_button)
+        cantidad = self.modelo.importar(csv_path)
+        if cantidad < 0:
+            QMessageBox.warning(self, "Error", "No se pudieron importar los patrones")
+        elif cantidad:
+            self.patrones_modificados.emit()
 
     def agregar_patron(self):
         """Agrega un nuevo patrón a la lista"""
@@ -98,23 +220,25 @@ class ConfigPatronesWidget(QWidget):
             QMessageBox.warning(self, "Error", "El patrón no puede estar vacío")
             return
 
-        # Agregar al gestor
-        self.patrones_manager.agregar_patron(patron, tipo, nivel)
-
-        # Actualizar tabla
-        self.cargar_patrones()
+        # Agregar al gestor a través del modelo (la tabla solo inserta la fila nueva)
+        self.modelo.agregar(patron, tipo, nivel)
+        self.patrones_modificados.emit()
 
         # Limpiar campo
         self.patron_input.clear()
 
+    def eliminar_fila(self, index):
+        """Elimina el patrón de la fila pulsada en la tabla (filtrada)"""
+        self.eliminar_patron(self.proxy.mapToSource(index).row())
+
     def eliminar_patron(self, row):
         """Elimina un patrón de la lista"""
-        if self.patrones_manager.eliminar_patron(row):
-            self.cargar_patrones()
+        if self.modelo.eliminar(row):
+            self.patrones_modificados.emit()
 
     def guardar_cambios(self):
         """Guarda los cambios al archivo CSV"""
-        if self.patrones_manager.guardar_a_csv("data/patrones_ciberacoso.csv"):
+        if self.patrones_manager.guardar_a_csv(RUTA_PATRONES):
             QMessageBox.information(self, "Éxito", "Patrones guardados correctamente")
         else:
-            QMessageBox.warning(self, "Error", "No se pudieron guardar los patrones")
\ No newline at end of file
+            QMessageBox.warning(self, "Error", "No se pudieron guardar los patrones")
@@ -1,12 +1,20 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
                              QComboBox, QGroupBox, QSplitter)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import numpy as np
-from collections import defaultdict
 from datetime import datetime, timedelta
+from backend.utils.estadisticas import EstadisticasAgregadas, LatenciasAgregadas
+
+
+INTERVALO_ACTUALIZACION = 300  # ms: los análisis que terminan dentro de este intervalo se dibujan juntos
+COLORES_TIPO = ['#ff9800', '#f44336', '#2196f3', '#9c27b0']
+COLORES_SEVERIDAD = {'Alto': '#f44336', 'Moderado': '#ff9800', 'Bajo': '#4caf50'}
+DIAS_SEMANA = ['Lun', 'Mar', 'Mié', 'Jue', 'Vie', 'Sáb', 'Dom']
+PERCENTILES = [('p50', '#cddc39'), ('p95', '#00bcd4'), ('p99', '#9c27b0')]
+PERIODO_MAXIMO = timedelta(days=365)  # Último año: en memoria no se guardan latencias más antiguas
 
 
 class MatplotlibCanvas(FigureCanvas):
@@ -17,9 +25,31 @@ class MatplotlibCanvas(FigureCanvas):
 
 
 class EstadisticasWidget(QWidget):
-    def __init__(self):
+    # El historial terminó de guardar un análisis o sus latencias (puede emitirse desde otro hilo)
+    historial_guardado = pyqtSignal()
+
+    def __init__(self, historial=None):
         super().__init__()
-        self.historial_resultados = []
+        # Conteos de alertas por hora, tipo, nivel y algoritmo: HistorialAnalisis (persistente)
+        # o, si no se indica, EstadisticasAgregadas en memoria
+        self.estadisticas = historial if historial is not None else EstadisticasAgregadas()
+        # Histogramas de latencia por hora y motor: los del historial persistente o,
+        # en memoria, los del último año
+        self.latencias = getattr(self.estadisticas, 'latencias', None)
+        if self.latencias is None:
+            self.latencias = LatenciasAgregadas(retencion=PERIODO_MAXIMO)
+        # Se redibuja cuando los datos ya se pueden consultar, no al encolarlos
+        self.historial_guardado.connect(self.programar_actualizacion)
+
+        # Las actualizaciones se agrupan: se dibuja como mucho una vez por intervalo
+        self.timer_actualizacion = QTimer(self)
+        self.timer_actualizacion.setSingleShot(True)
+        self.timer_actualizacion.setInterval(INTERVALO_ACTUALIZACION)
+        self.timer_actualizacion.timeout.connect(self.actualizar_estadisticas)
+        self.pendiente = False  # Hay datos nuevos sin dibujar mientras la pestaña está oculta
+
+        # Datos ya dibujados en cada gráfico (para no redibujar si no cambian)
+        self.datos_dibujados = {}
         self.init_ui()
 
     def init_ui(self):
@@ -36,7 +66,7 @@ class EstadisticasWidget(QWidget):
 
         self.period_combo = QComboBox()
         self.period_combo.addItems(["Última semana", "Último mes", "Último trimestre", "Último año"])
-        self.period_combo.currentIndexChanged.connect(self.actualizar_estadisticas)
+        self.period_combo.currentIndexChanged.connect(self.programar_actualizacion)
 
         self.refresh_button = QPushButton("Actualizar")
         self.refresh_button.clicked.connect(self.actualizar_estadisticas)
@@ -94,17 +124,72 @@ class EstadisticasWidget(QWidget):
 
         self.setLayout(main_layout)
 
-        # Inicializar gráficos
-        self.actualizar_estadisticas()
+        # Inicializar gráficos (se dibujan al mostrar la pestaña)
+        self.crear_graficos()
+        self.programar_actualizacion()
 
-    def agregar_resultados(self, resultados):
-        """Agrega nuevos resultados al historial con timestamp"""
-        timestamp = datetime.now()
-        self.historial_resultados.append((timestamp, resultados))
-        self.actualizar_estadisticas()
+    def crear_graficos(self):
+        """Crea los ejes y los artistas fijos; las actualizaciones solo cambian sus datos"""
+        # Gráfico 1: Distribución por tipo (las barras se crean con las primeras categorías)
+        self.ax1 = self.chart1.fig.add_subplot(111)
+        self.ax1.set_ylabel('Número de alertas')
+        self.ax1.tick_params(axis='x', rotation=45)
+        self.ax1.grid(axis='y', linestyle='--', alpha=0.7)
+        self.barras_tipo = None
+        self.categorias_tipo = None
 
-    def filtrar_resultados_por_periodo(self):
-        """Filtra resultados según el período seleccionado"""
+        # Gráfico 2: Distribución por severidad
+        self.ax2 = self.chart2.fig.add_subplot(111)
+        self.ax2.axis('equal')
+        self.sin_datos_severidad = self.ax2.text(0.5, 0.5, 'Sin datos', horizontalalignment='center',
+                                                 verticalalignment='center', transform=self.ax2.transAxes)
+        self.torta_severidad = None  # (etiquetas, porciones, textos, porcentajes)
+
+        # Gráfico 3: Tendencia temporal (una sola línea con un punto por día)
+        self.ax3 = self.chart3.fig.add_subplot(111)
+        self.linea_tendencia, = self.ax3.plot(DIAS_SEMANA, [0] * len(DIAS_SEMANA), marker='o', linestyle='-',
+                                              color='#3f51b5', linewidth=2)
+        self.ax3.set_xlabel('Día de la semana')
+        self.ax3.set_ylabel('Alertas detectadas')
+        self.ax3.grid(linestyle='--', alpha=0.7)
+
+        # Gráfico 4: Rendimiento de algoritmos (tres grupos de barras, uno por percentil)
+        self.ax4 = self.chart4.fig.add_subplot(111)
+        self.ax4.set_xlabel('Latencia por llamada (ms)')
+        self.ax4.grid(axis='x', linestyle='--', alpha=0.7)
+        self.sin_datos_algoritmos = self.ax4.text(0.5, 0.5, 'Sin datos', horizontalalignment='center',
+                                                  verticalalignment='center', transform=self.ax4.transAxes)
+        self.barras_percentiles = []
+        self.algoritmos_dibujados = None
+
+        for canvas in (self.chart1, self.chart2, self.chart3, self.chart4):
+            canvas.fig.tight_layout()
+
+    def agregar_resultados(self, resultados):
+        """Registra las alertas de un análisis en el historial, en la hora actual"""
+        self.estadisticas.agregar(resultados, datetime.now(), al_guardar=self.historial_guardado.emit)
+
+    def agregar_metricas(self, metricas):
+        """Suma las latencias de un análisis al histograma de la hora actual"""
+        self.latencias.agregar(metricas, datetime.now(), al_guardar=self.historial_guardado.emit)
+
+    def programar_actualizacion(self):
+        """Pide redibujar los gráficos; varias peticiones seguidas se atienden con un solo dibujo"""
+        if not self.isVisible():
+            self.pendiente = True  # Se dibuja al mostrar la pestaña
+            return
+        # El temporizador no se reinicia: con análisis continuos se dibuja una vez por intervalo
+        if not self.timer_actualizacion.isActive():
+            self.timer_actualizacion.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.pendiente:
+            self.pendiente = False
+            self.programar_actualizacion()
+
+    def fecha_inicio_periodo(self):
+        """Fecha desde la que se muestran datos según el período seleccionado"""
         periodo = self.period_combo.currentText()
         ahora = datetime.now()
         
@@ -115,102 +200,153 @@ class EstadisticasWidget(QWidget):
         elif periodo == "Último trimestre":
             fecha_inicio = ahora - timedelta(days=90)
         else:  # Último año
-            fecha_inicio = ahora - timedelta(days=365)
+            fecha_inicio = ahora - PERIODO_MAXIMO
 
-        return [(t, r) for t, r in self.historial_resultados if t >= fecha_inicio]
+        return fecha_inicio
 
-    def actualizar_estadisticas(self):
-        """Actualiza los gráficos con datos reales"""
-        resultados_filtrados = self.filtrar_resultados_por_periodo()
-        
-        # Contadores para las estadísticas
-        tipos_count = defaultdict(int)
-        severidad_count = defaultdict(int)
-        dias_count = defaultdict(int)
-        algoritmos_tiempo = defaultdict(list)
-
-        # Procesar resultados
-        for _, resultados in resultados_filtrados:
-            for resultado in resultados:
-                # Conteo por tipo
-                tipos_count[resultado['tipo']] += 1
-                
-                # Conteo por severidad
-                severidad_count[resultado['nivel']] += 1
-                
-                # Conteo por día
-                dia = _.strftime('%a')
-                dias_count[dia] += 1
-                
-                # Tiempo por algoritmo
-                if 'tiempo_ejecucion' in resultado:
-                    algoritmos_tiempo[resultado['algoritmo']].append(resultado['tiempo_ejecucion'])
-                else:
-                    algoritmos_tiempo[resultado['algoritmo']].append(1)
+    def totales_del_periodo(self):
+        """Conteos de alertas del período seleccionado por tipo, nivel, algoritmo y día de la semana"""
+        return self.estadisticas.totales(self.fecha_inicio_periodo())
 
-        # Gráfico 1: Distribución por tipo
-        self.chart1.fig.clear()
-        ax1 = self.chart1.fig.add_subplot(111)
+    def percentiles_del_periodo(self):
+        """Percentiles de latencia por motor del período seleccionado, sumando sus histogramas"""
+        return self.latencias.percentiles(self.fecha_inicio_periodo())
 
+    def actualizar_estadisticas(self):
+        """Actualiza los gráficos con datos reales"""
+        self.timer_actualizacion.stop()
+        if not self.isVisible():
+            self.pendiente = True
+            return
+
+        # Contadores para las estadísticas, sumados sobre las cubetas del período
+        totales = self.totales_del_periodo()
+
+        self.dibujar_tipos(totales['tipo'])
+        self.dibujar_severidad(totales['nivel'])
+        self.dibujar_tendencia(totales['dia'])
+        self.dibujar_algoritmos(self.percentiles_del_periodo())
+
+    def datos_cambiaron(self, canvas, datos):
+        """Indica si datos difiere de lo último dibujado en canvas, y lo recuerda"""
+        if self.datos_dibujados.get(canvas) == datos:
+            return False
+        self.datos_dibujados[canvas] = datos
+        return True
+
+    def dibujar_tipos(self, tipos_count):
+        """Gráfico 1: Distribución por tipo"""
         categories = list(tipos_count.keys()) if tipos_count else ['Sin datos']
         values = list(tipos_count.values()) if tipos_count else [0]
-        colors = ['#ff9800', '#f44336', '#2196f3', '#9c27b0'][:len(categories)]
-
-        ax1.bar(categories, values, color=colors, alpha=0.7)
-        ax1.set_ylabel('Número de alertas')
-        ax1.tick_params(axis='x', rotation=45)
-        ax1.grid(axis='y', linestyle='--', alpha=0.7)
-
-        self.chart1.fig.tight_layout()
-        self.chart1.draw()
+        if not self.datos_cambiaron(self.chart1, (categories, values)):
+            return
 
-        # Gráfico 2: Distribución por severidad
-        self.chart2.fig.clear()
-        ax2 = self.chart2.fig.add_subplot(111)
-
-        severities = list(severidad_count.keys()) if severidad_count else ['Sin datos']
-        sev_values = list(severidad_count.values()) if severidad_count else [1]
-        sev_colors = {'Alto': '#f44336', 'Moderado': '#ff9800', 'Bajo': '#4caf50'}
-        colors = [sev_colors.get(sev, '#808080') for sev in severities]
-
-        if sum(sev_values) > 0:
-            ax2.pie(sev_values, labels=severities, colors=colors, autopct='%1.1f%%',
-                    startangle=90, shadow=False)
+        if categories == self.categorias_tipo:
+            for barra, valor in zip(self.barras_tipo, values):
+                barra.set_height(valor)
         else:
-            ax2.text(0.5, 0.5, 'Sin datos', horizontalalignment='center', verticalalignment='center')
-        ax2.axis('equal')
-
-        self.chart2.fig.tight_layout()
-        self.chart2.draw()
-
-        # Gráfico 3: Tendencia temporal
-        self.chart3.fig.clear()
-        ax3 = self.chart3.fig.add_subplot(111)
-
-        dias_semana = ['Lun', 'Mar', 'Mié', 'Jue', 'Vie', 'Sáb', 'Dom']
-        trends = [dias_count.get(dia, 0) for dia in dias_semana]
-
-        ax3.plot(dias_semana, trends, marker='o', linestyle='-', color='#3f51b5', linewidth=2)
-        ax3.set_xlabel('Día de la semana')
-        ax3.set_ylabel('Alertas detectadas')
-        ax3.grid(linestyle='--', alpha=0.7)
-
-        self.chart3.fig.tight_layout()
-        self.chart3.draw()
-
-        # Gráfico 4: Rendimiento de algoritmos
-        self.chart4.fig.clear()
-        ax4 = self.chart4.fig.add_subplot(111)
-
-        algorithms = list(algoritmos_tiempo.keys())
-        times = [np.mean(tiempos) for tiempos in algoritmos_tiempo.values()] if algoritmos_tiempo else []
-
-        if algorithms:
-            ax4.barh(algorithms, times, color=['#cddc39', '#00bcd4'], alpha=0.7)
-            ax4.set_xlabel('Tiempo promedio (ms)')
+            # Cambiaron las categorías: se rehacen solo las barras, no la figura
+            if self.barras_tipo is not None:
+                self.barras_tipo.remove()
+            x = np.arange(len(categories))
+            self.barras_tipo = self.ax1.bar(x, values, color=COLORES_TIPO[:len(categories)], alpha=0.7)
+            self.ax1.set_xticks(x)
+            self.ax1.set_xticklabels(categories)
+            self.categorias_tipo = categories
+            self.chart1.fig.tight_layout()
+
+        self.ax1.relim()
+        self.ax1.autoscale_view()
+        self.chart1.draw_idle()
+
+    def dibujar_severidad(self, severidad_count):
+        """Gráfico 2: Distribución por severidad"""
+        severities = list(severidad_count.keys())
+        sev_values = list(severidad_count.values())
+        if not self.datos_cambiaron(self.chart2, (severities, sev_values)):
+            return
+
+        total = sum(sev_values)
+        if self.torta_severidad is not None and (not total or self.torta_severidad[0] != severities):
+            # Cambiaron las porciones: se quitan las anteriores
+            for artistas in self.torta_severidad[1:]:
+                for artista in artistas:
+                    artista.remove()
+            self.torta_severidad = None
+
+        if total and self.torta_severidad is None:
+            colors = [COLORES_SEVERIDAD.get(sev, '#808080') for sev in severities]
+            porciones, textos, porcentajes = self.ax2.pie(sev_values, labels=severities, colors=colors,
+                                                          autopct='%1.1f%%', startangle=90, shadow=False)
+            self.torta_severidad = (severities, porciones, textos, porcentajes)
+            self.ax2.axis('equal')
+        elif total:
+            self.mover_porciones(sev_values, total)
+
+        self.sin_datos_severidad.set_visible(not total)
+        self.chart2.draw_idle()
+
+    def mover_porciones(self, valores, total, startangle=90, labeldistance=1.1, pctdistance=0.6):
+        """Actualiza ángulos, etiquetas y porcentajes de la torta existente (mismos cálculos que Axes.pie)"""
+        _, porciones, textos, porcentajes = self.torta_severidad
+        theta1 = startangle / 360
+        for valor, porcion, texto, porcentaje in zip(valores, porciones, textos, porcentajes):
+            theta2 = theta1 + valor / total
+            porcion.set_theta1(360 * theta1)
+            porcion.set_theta2(360 * theta2)
+
+            angulo = np.pi * (theta1 + theta2)  # Ángulo medio de la porción
+            x, y = np.cos(angulo), np.sin(angulo)
+            texto.set_position((labeldistance * x, labeldistance * y))
+            texto.set_horizontalalignment('left' if x > 0 else 'right')
+            porcentaje.set_position((pctdistance * x, pctdistance * y))
+            porcentaje.set_text('%1.1f%%' % (100 * valor / total))
+            theta1 = theta2
+
+    def dibujar_tendencia(self, dias_count):
+        """Gráfico 3: Tendencia temporal"""
+        trends = [dias_count.get(dia, 0) for dia in range(len(DIAS_SEMANA))]  # 0 = lunes
+        if not self.datos_cambiaron(self.chart3, trends):
+            return
+
+        self.linea_tendencia.set_ydata(trends)
+        self.ax3.relim()
+        self.ax3.autoscale_view()
+        self.chart3.draw_idle()
+
+    def dibujar_algoritmos(self, percentiles_por_motor):
+        """Gráfico 4: Rendimiento de algoritmos"""
+        algorithms = list(percentiles_por_motor)
+        # Latencia real por llamada (un patrón en un segmento o una pasada de Aho-Corasick)
+        percentiles = np.array([percentiles_por_motor[alg] for alg in algorithms]) * 1000
+        if not self.datos_cambiaron(self.chart4, (algorithms, percentiles.tolist())):
+            return
+
+        if algorithms == self.algoritmos_dibujados:
+            for k, barras in enumerate(self.barras_percentiles):
+                for barra, valor in zip(barras, percentiles[:, k]):
+                    barra.set_width(valor)
         else:
-            ax4.text(0.5, 0.5, 'Sin datos', horizontalalignment='center', verticalalignment='center')
-        ax4.grid(axis='x', linestyle='--', alpha=0.7)
-
-        self.chart4.fig.tight_layout()
-        self.chart4.draw()
\ No newline at end of file
+            # Cambiaron los motores medidos: se rehacen solo las barras
+            for barras in self.barras_percentiles:
+                barras.remove()
+            self.barras_percentiles = []
+            y = np.arange(len(algorithms))
+            alto = 0.25
+            if algorithms:
+                for k, (etiqueta, color) in enumerate(PERCENTILES):
+                    self.barras_percentiles.append(
+                        self.ax4.barh(y + (k - 1) * alto, percentiles[:, k], height=alto, color=color,
+                                      alpha=0.7, label=etiqueta))
+                self.ax4.legend(fontsize='small')
+            elif self.ax4.get_legend() is not None:
+                self.ax4.get_legend().remove()
+            self.ax4.set_yticks(y)
+            self.ax4.set_yticklabels(algorithms)
+            self.sin_datos_algoritmos.set_visible(not algorithms)
+            self.algoritmos_dibujados = algorithms
+            self.chart4.fig.tight_layout()
+
+        self.ax4.relim()
+        self.ax4.autoscale_view()
+        self.chart4.draw_idle()
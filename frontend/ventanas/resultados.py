@@ -1,14 +1,293 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-                             QTableWidget, QTableWidgetItem, QTextEdit, QHeaderView,
-                             QGroupBox, QSplitter)
-from PyQt5.QtCore import Qt
+                             QTableView, QTextEdit, QHeaderView, QGroupBox, QSplitter, QComboBox)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PyQt5.QtGui import QColor
+from backend.modelos.resultados import ResultadosColumnares, ALGORITMOS, CONTEXTO
+from array import array
+from bisect import bisect_left, bisect_right
+import html
+
+
+COLUMNAS = ["Patrón", "Tipo", "Severidad", "Posición", "Algoritmo"]
+
+# Colores de fondo según severidad
+COLORES_NIVEL = {
+    "Alto": QColor(255, 200, 200),  # Rojo claro
+    "Moderado": QColor(255, 230, 200),  # Naranja claro
+    "Bajo": QColor(230, 255, 230),  # Verde claro
+}
+COLOR_POR_DEFECTO = QColor(255, 255, 255)
+
+# Orden de la columna Severidad (ascendente: de menor a mayor severidad)
+RANGO_NIVEL = {"Bajo": 0, "Moderado": 1, "Alto": 2}
+
+TODOS_LOS_TIPOS = "Todos los tipos"
+TODAS_LAS_SEVERIDADES = "Todas las severidades"
+
+
+class ModeloResultados(QAbstractTableModel):
+    """
+    Modelo de tabla sobre un ResultadosColumnares
+
+    La vista solo pide las filas visibles, así que no se crea ningún objeto por
+    coincidencia. El filtro por tipo y severidad y el orden por columna se
+    resuelven con una permutación precalculada (orden: fila de la vista ->
+    fila del contenedor), calculada sobre las columnas del contenedor sin
+    pasar por data().
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.resultados = ResultadosColumnares()
+        self.orden = array('q')
+        self.filtro_tipo = None
+        self.filtro_nivel = None
+        self.columna_orden = None
+        self.descendente = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.orden)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNAS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNAS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        i = self.orden[index.row()]
+        if role == Qt.DisplayRole:
+            columna = index.column()
+            if columna < 3:
+                return self.resultados.patron(i)[columna]
+            if columna == 3:
+                return self.resultados.posicion[i]
+            return ALGORITMOS[self.resultados.id_algoritmo[i]]
+        if role == Qt.BackgroundRole:
+            return COLORES_NIVEL.get(self.resultados.patron(i)[2], COLOR_POR_DEFECTO)
+        return None
+
+    def indice(self, fila):
+        """Fila del contenedor que se muestra en la fila fila de la vista"""
+        return self.orden[fila]
+
+    def reiniciar(self, resultados):
+        """Muestra otro contenedor de resultados"""
+        self.beginResetModel()
+        self.resultados = resultados
+        self.orden = self._calcular_orden()
+        self.endResetModel()
+
+    def _ids_visibles(self):
+        """Ids de patrón que pasan el filtro (None si no hay filtro)"""
+        if self.filtro_tipo is None and self.filtro_nivel is None:
+            return None
+        return {id_patron for id_patron, (_, tipo, nivel) in enumerate(self.resultados.patrones)
+                if self.filtro_tipo in (None, tipo) and self.filtro_nivel in (None, nivel)}
+
+    def _filas_visibles(self, inicio, fin):
+        """Filas [inicio, fin) del contenedor que pasan el filtro"""
+        ids = self._ids_visibles()
+        if ids is None:
+            return range(inicio, fin)
+        id_patron = self.resultados.id_patron
+        return [i for i in range(inicio, fin) if id_patron[i] in ids]
+
+    def _clave_orden(self, columna):
+        """Función clave de una fila del contenedor para ordenar por columna"""
+        resultados = self.resultados
+        id_patron = resultados.id_patron
+        if columna == 3:
+            return resultados.posicion.__getitem__
+        if columna == 4:
+            id_algoritmo = resultados.id_algoritmo
+            return lambda i: ALGORITMOS[id_algoritmo[i]]
+        if columna == 2:
+            valores = [RANGO_NIVEL.get(nivel, -1) for _, _, nivel in resultados.patrones]
+        else:
+            valores = [patron[columna] for patron in resultados.patrones]
+        return lambda i: valores[id_patron[i]]
+
+    def _calcular_orden(self):
+        filas = self._filas_visibles(0, len(self.resultados))
+        if self.columna_orden is not None:
+            filas = sorted(filas, key=self._clave_orden(self.columna_orden), reverse=self.descendente)
+        return array('q', filas)
+
+    def _reordenar(self):
+        """Recalcula la permutación sin cambiar el número de filas, conservando la selección"""
+        self.layoutAboutToBeChanged.emit()
+        persistentes = self.persistentIndexList()
+        anteriores = [self.orden[indice.row()] for indice in persistentes]
+        self.orden = self._calcular_orden()
+        if persistentes:
+            fila_de = {i: fila for fila, i in enumerate(self.orden)}
+            self.changePersistentIndexList(persistentes, [self.index(fila_de[i], indice.column())
+                                                          for i, indice in zip(anteriores, persistentes)])
+        self.layoutChanged.emit()
+
+    def _posicion_en_orden(self, orden, clave, i, desde=0):
+        """
+        Fila de orden (ordenado por la columna actual) donde va la fila i del contenedor
+
+        A igual valor de la columna las filas quedan en el orden del contenedor,
+        igual que con sorted, que es estable también en orden descendente.
+        """
+        valor = clave(i)
+        inicio, fin = desde, len(orden)
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            otro = clave(orden[medio])
+            if otro == valor:
+                antes = orden[medio] < i
+            else:
+                antes = otro > valor if self.descendente else otro < valor
+            if antes:
+                inicio = medio + 1
+            else:
+                fin = medio
+        return inicio
+
+    def _intercalar(self, nuevas):
+        """
+        Agrega a la vista ordenada las filas nuevas del contenedor
+
+        Solo se ordenan las filas nuevas; cada una se ubica con una búsqueda
+        binaria y la permutación se rearma copiando tramos, sin volver a
+        ordenar las filas que ya estaban.
+        """
+        clave = self._clave_orden(self.columna_orden)
+        nuevas = sorted(nuevas, key=clave, reverse=self.descendente)
+        anteriores = self.orden
+        posiciones = []
+        posicion = 0
+        for i in nuevas:
+            posicion = self._posicion_en_orden(anteriores, clave, i, posicion)
+            posiciones.append(posicion)
+
+        # Primero se agregan al final, para que la vista conozca el nuevo número de filas
+        fila = len(anteriores)
+        self.beginInsertRows(QModelIndex(), fila, fila + len(nuevas) - 1)
+        self.orden = anteriores + array('q', nuevas)
+        self.endInsertRows()
+
+        self.layoutAboutToBeChanged.emit()
+        persistentes = self.persistentIndexList()
+        orden = array('q')
+        copiadas = 0
+        for posicion, i in zip(posiciones, nuevas):
+            orden.extend(anteriores[copiadas:posicion])
+            orden.append(i)
+            copiadas = posicion
+        orden.extend(anteriores[copiadas:])
+        self.orden = orden
+        if persistentes:
+            destinos = []
+            for indice in persistentes:
+                anterior = indice.row()
+                if anterior < fila:
+                    destino = anterior + bisect_right(posiciones, anterior)
+                else:
+                    destino = posiciones[anterior - fila] + anterior - fila
+                destinos.append(self.index(destino, indice.column()))
+            self.changePersistentIndexList(persistentes, destinos)
+        self.layoutChanged.emit()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.columna_orden = column if column >= 0 else None  # -1: orden de llegada
+        self.descendente = order == Qt.DescendingOrder
+        self._reordenar()
+
+    def filtrar(self, tipo=None, nivel=None):
+        """Muestra solo las coincidencias del tipo y la severidad indicados (None = todos)"""
+        self.filtro_tipo = tipo
+        self.filtro_nivel = nivel
+        self.beginResetModel()
+        self.orden = self._calcular_orden()
+        self.endResetModel()
+
+    def agregar(self, resultados):
+        """Agrega las filas de otro contenedor (por ejemplo, resultados parciales)"""
+        inicio = len(self.resultados)
+        self.resultados.extend(resultados)
+
+        nuevas = self._filas_visibles(inicio, len(self.resultados))
+        if not nuevas:
+            return
+
+        if self.columna_orden is not None:
+            # Reordenar todo con cada lote parcial sería cuadrático
+            self._intercalar(nuevas)
+            return
+
+        fila = len(self.orden)
+        self.beginInsertRows(QModelIndex(), fila, fila + len(nuevas) - 1)
+        self.orden.extend(nuevas)
+        self.endInsertRows()
+
+    def reemplazar_rango(self, inicio, fin, agregados, delta):
+        """
+        Sustituye las filas [inicio, fin) del contenedor por las de agregados
+
+        Las filas posteriores se desplazan delta caracteres. El contenedor debe
+        estar ordenado por posición (el de SesionAnalisis): agregados cabe entero
+        en el hueco y solo se recorren las filas afectadas de la vista.
+        """
+        resultados = self.resultados
+        resultados.eliminar_rango(inicio, fin)
+        resultados.desplazar_filas(inicio, delta)
+        resultados.insertar(inicio, agregados)
+        cambio = len(agregados) - (fin - inicio)
+        nuevas = self._filas_visibles(inicio, inicio + len(agregados))
+
+        if self.columna_orden is None:
+            # Sin orden por columna la permutación es creciente: las filas de la
+            # vista afectadas también son contiguas
+            desde = bisect_left(self.orden, inicio)
+            hasta = bisect_left(self.orden, fin)
+            if hasta > desde:
+                self.beginRemoveRows(QModelIndex(), desde, hasta - 1)
+                del self.orden[desde:hasta]
+                self.endRemoveRows()
+            if cambio:
+                self.orden[desde:] = array('q', map(cambio.__add__, self.orden[desde:]))
+            if nuevas:
+                self.beginInsertRows(QModelIndex(), desde, desde + len(nuevas) - 1)
+                self.orden[desde:desde] = array('q', nuevas)
+                self.endInsertRows()
+            if delta and desde + len(nuevas) < len(self.orden):
+                self.dataChanged.emit(self.index(desde + len(nuevas), 3), self.index(len(self.orden) - 1, 3),
+                                      [Qt.DisplayRole])
+            return
+
+        # Con orden por columna las filas afectadas pueden estar en cualquier lugar de la vista
+        filas = [fila for fila, i in enumerate(self.orden) if inicio <= i < fin]
+        for fila in reversed(filas):
+            self.beginRemoveRows(QModelIndex(), fila, fila)
+            del self.orden[fila]
+            self.endRemoveRows()
+        # Las filas que quedan siguen ordenadas: el desplazamiento de posiciones y
+        # de índices es el mismo para todas las posteriores a la edición
+        if cambio:
+            self.orden = array('q', [i + cambio if i >= fin else i for i in self.orden])
+        if delta and self.orden:
+            self.dataChanged.emit(self.index(0, 3), self.index(len(self.orden) - 1, 3), [Qt.DisplayRole])
+        if nuevas:
+            self._intercalar(nuevas)
 
 
 class ResultadosWidget(QWidget):
     def __init__(self):
         super().__init__()
-        self.resultados = []
+        self.modelo = ModeloResultados(self)
+        # Conteos para el resumen, actualizados a medida que llegan resultados
+        self.conteo_tipos = {}
+        self.conteo_niveles = {}
         self.init_ui()
 
     def init_ui(self):
@@ -34,16 +313,37 @@ class ResultadosWidget(QWidget):
         self.alertas_group = QGroupBox("Alertas Detectadas")
         alertas_layout = QVBoxLayout()
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)  # Patrón, Tipo, Nivel, Posición, Algoritmo
-        self.table.setHorizontalHeaderLabels(["Patrón", "Tipo", "Severidad", "Posición", "Algoritmo"])
+        # Filtros por tipo y severidad
+        filtros_layout = QHBoxLayout()
+
+        self.tipo_combo = QComboBox()
+        self.tipo_combo.addItem(TODOS_LOS_TIPOS)
+        self.tipo_combo.currentIndexChanged.connect(self.aplicar_filtro)
+
+        self.nivel_combo = QComboBox()
+        self.nivel_combo.addItems([TODAS_LAS_SEVERIDADES, "Alto", "Moderado", "Bajo"])
+        self.nivel_combo.currentIndexChanged.connect(self.aplicar_filtro)
+
+        filtros_layout.addWidget(self.tipo_combo)
+        filtros_layout.addWidget(self.nivel_combo)
+        filtros_layout.addStretch()
+
+        # La vista solo pide al modelo las filas visibles
+        self.table = QTableView()
+        self.table.setModel(self.modelo)
+        # Orden de llegada hasta que se elija una columna
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeToContents)
-        self.table.itemClicked.connect(self.mostrar_contexto)
+        self.table.clicked.connect(self.mostrar_contexto)
 
+        alertas_layout.addLayout(filtros_layout)
         alertas_layout.addWidget(self.table)
         self.alertas_group.setLayout(alertas_layout)
 
@@ -84,34 +384,95 @@ class ResultadosWidget(QWidget):
 
     def actualizar_resultados(self, resultados):
         """Actualiza la vista con los nuevos resultados"""
-        self.resultados = resultados
+        self.limpiar()
+        self.agregar_resultados_parciales(resultados)
+
+    def limpiar(self):
+        """Vacía la vista antes de un nuevo análisis"""
+        self.modelo.reiniciar(ResultadosColumnares())
+        self.conteo_tipos = {}
+        self.conteo_niveles = {}
+        self.contexto_text.clear()
+        self.resumen_text.setText("Análisis en curso...")
+
+    def agregar_resultados_parciales(self, resultados):
+        """Añade resultados a medida que llegan del análisis en curso"""
+        # El modelo avisa a la vista solo de las filas nuevas
+        self.modelo.agregar(resultados)
+
+        # Actualizar conteos solo con lo nuevo
+        self._sumar_conteos(resultados)
 
         # Actualizar resumen
         self.actualizar_resumen()
 
-        # Actualizar tabla
-        self.actualizar_tabla()
+    def _sumar_conteos(self, resultados):
+        """Suma a los conteos del resumen los tipos y severidades de resultados"""
+        for tipo, cantidad in resultados.contar('tipo').items():
+            self.conteo_tipos[tipo] = self.conteo_tipos.get(tipo, 0) + cantidad
+            if self.tipo_combo.findText(tipo) < 0:
+                self.tipo_combo.addItem(tipo)
+        for nivel, cantidad in resultados.contar('nivel').items():
+            self.conteo_niveles[nivel] = self.conteo_niveles.get(nivel, 0) + cantidad
+
+    def aplicar_filtro(self):
+        """Filtra la tabla según el tipo y la severidad elegidos"""
+        tipo = self.tipo_combo.currentText()
+        nivel = self.nivel_combo.currentText()
+        self.modelo.filtrar(None if tipo == TODOS_LOS_TIPOS else tipo,
+                            None if nivel == TODAS_LAS_SEVERIDADES else nivel)
+
+    def aplicar_cambios(self, eliminados, agregados, desde, delta):
+        """
+        Actualiza la vista en el lugar tras editar el texto analizado
+
+        La tabla contiene lo mismo que la sesión incremental (ver reemplazar_resultados),
+        ordenado por posición: las filas eliminadas son las len(eliminados) que
+        empiezan en bisect_left(posicion, desde), las agregadas ocupan su lugar y
+        las posteriores se desplazan delta caracteres. Los conteos del resumen se
+        actualizan solo con las filas eliminadas y agregadas.
+        """
+        resultados = self.modelo.resultados
+        inicio = bisect_left(resultados.posicion, desde)
+
+        # El contexto se extrae del texto ya editado
+        if agregados.fuente is not None:
+            resultados.fuente = agregados.fuente
+        self.modelo.reemplazar_rango(inicio, inicio + len(eliminados), agregados, delta)
+
+        for conteo, campo in ((self.conteo_tipos, 'tipo'), (self.conteo_niveles, 'nivel')):
+            for clave, cantidad in eliminados.contar(campo).items():
+                conteo[clave] -= cantidad
+                if not conteo[clave]:
+                    del conteo[clave]
+        self._sumar_conteos(agregados)
+        self.actualizar_resumen()
+
+    def reemplazar_resultados(self, resultados):
+        """
+        Muestra los resultados de la sesión incremental, ordenados por posición
+
+        Se llama al terminar un análisis sobre el texto del editor y al cambiar los
+        patrones; a partir de aquí aplicar_cambios solo toca las filas editadas.
+        """
+        self.modelo.reiniciar(resultados)
+        self.conteo_tipos = {}
+        self.conteo_niveles = {}
+        self._sumar_conteos(resultados)
+        self.actualizar_resumen()
 
     def actualizar_resumen(self):
         """Actualiza el resumen con estadísticas de los resultados"""
-        if not self.resultados:
+        if not self.modelo.resultados:
             self.resumen_text.setText("No se encontraron patrones de ciberacoso.")
             return
 
-        # Contar por tipo
-        tipos = {}
-        niveles = {}
-
-        for resultado in self.resultados:
-            tipo = resultado['tipo']
-            nivel = resultado['nivel']
-
-            tipos[tipo] = tipos.get(tipo, 0) + 1
-            niveles[nivel] = niveles.get(nivel, 0) + 1
+        tipos = self.conteo_tipos
+        niveles = self.conteo_niveles
 
         # Crear texto de resumen
         resumen = f"<h3>Análisis Completado</h3>"
-        resumen += f"<p>Se encontraron <b>{len(self.resultados)}</b> posibles indicadores de ciberacoso.</p>"
+        resumen += f"<p>Se encontraron <b>{len(self.modelo.resultados)}</b> posibles indicadores de ciberacoso.</p>"
 
         resumen += "<h4>Distribución por tipo:</h4>"
         resumen += "<ul>"
@@ -135,54 +496,32 @@ class ResultadosWidget(QWidget):
 
         self.resumen_text.setHtml(resumen)
 
-    def actualizar_tabla(self):
-        """Actualiza la tabla con los resultados"""
-        self.table.setRowCount(0)  # Limpiar tabla
-
-        for i, resultado in enumerate(self.resultados):
-            self.table.insertRow(i)
-
-            # Añadir datos a la tabla
-            self.table.setItem(i, 0, QTableWidgetItem(resultado['patron']))
-            self.table.setItem(i, 1, QTableWidgetItem(resultado['tipo']))
-            self.table.setItem(i, 2, QTableWidgetItem(resultado['nivel']))
-            self.table.setItem(i, 3, QTableWidgetItem(str(resultado['posicion'])))
-            self.table.setItem(i, 4, QTableWidgetItem(resultado['algoritmo']))
-
-            # Colorear según severidad
-            color = QColor(255, 255, 255)  # Blanco por defecto
-            if resultado['nivel'] == "Alto":
-                color = QColor(255, 200, 200)  # Rojo claro
-            elif resultado['nivel'] == "Moderado":
-                color = QColor(255, 230, 200)  # Naranja claro
-            elif resultado['nivel'] == "Bajo":
-                color = QColor(230, 255, 230)  # Verde claro
-
-            for j in range(5):
-                self.table.item(i, j).setBackground(color)
-
-    def mostrar_contexto(self, item):
+    def mostrar_contexto(self, index):
         """Muestra el contexto de la alerta seleccionada"""
-        row = item.row()
-        if row < len(self.resultados):
-            resultado = self.resultados[row]
+        row = index.row()
+        if 0 <= row < self.modelo.rowCount():
+            resultado = self.modelo.resultados[self.modelo.indice(row)]
 
-            # Obtener contexto y resaltar el patrón
+            # Resaltar el tramo del contexto que cubre la coincidencia, que puede no
+            # ser igual al patrón (normalización, tolerancias)
             contexto = resultado['contexto']
-            patron = resultado['patron']
+            inicio = min(CONTEXTO, resultado['posicion'])
+            fin = inicio + resultado['longitud']
 
-            # Crear HTML con el patrón resaltado
-            html_contexto = contexto.replace(patron,
-                                             f"<span style='background-color: yellow; font-weight: bold;'>{patron}</span>")
+            # Crear HTML con la coincidencia resaltada
+            html_contexto = (html.escape(contexto[:inicio])
+                             + "<span style='background-color: yellow; font-weight: bold;'>"
+                             + html.escape(contexto[inicio:fin]) + "</span>"
+                             + html.escape(contexto[fin:]))
 
             # Mostrar información adicional
-            html = f"<h4>Contexto de la alerta:</h4>"
-            html += f"<p>{html_contexto}</p>"
-            html += f"<p><b>Tipo:</b> {resultado['tipo']}</p>"
-            html += f"<p><b>Severidad:</b> {resultado['nivel']}</p>"
-            html += f"<p><b>Algoritmo utilizado:</b> {resultado['algoritmo']}</p>"
+            contenido = f"<h4>Contexto de la alerta:</h4>"
+            contenido += f"<p>{html_contexto}</p>"
+            contenido += f"<p><b>Tipo:</b> {resultado['tipo']}</p>"
+            contenido += f"<p><b>Severidad:</b> {resultado['nivel']}</p>"
+            contenido += f"<p><b>Algoritmo utilizado:</b> {resultado['algoritmo']}</p>"
 
-            self.contexto_text.setHtml(html)
+            self.contexto_text.setHtml(contenido)
 
     def exportar_resultados(self):
         """Exporta los resultados a un archivo"""
@@ -6,6 +6,7 @@ from frontend.ventanas.resultados import ResultadosWidget
 from frontend.ventanas.animacion import AnimacionWidget
 from frontend.ventanas.estadisticas import EstadisticasWidget
 from backend.modelos.patrones import PatronesManager
+from backend.utils.historial import abrir_historial
 
 
 class MainWindow(QMainWindow):
@@ -28,7 +29,7 @@ class MainWindow(QMainWindow):
         self.config_patrones = ConfigPatronesWidget(self.patrones_manager)
         self.resultados = ResultadosWidget()
         self.animacion = AnimacionWidget()
-        self.estadisticas = EstadisticasWidget()
+        self.estadisticas = EstadisticasWidget(abrir_historial())  # Historial persistente en data/historial.db
 
         # Añadir pestañas
         self.tabs.addTab(self.carga_mensajes, "Carga de Mensajes")
@@ -38,13 +39,23 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.estadisticas, "Estadísticas")
 
         # Conectar señales
+        self.carga_mensajes.analisis_iniciado.connect(self.preparar_resultados)
+        self.carga_mensajes.resultados_parciales.connect(self.resultados.agregar_resultados_parciales)
+        self.carga_mensajes.metricas_disponibles.connect(self.estadisticas.agregar_metricas)
         self.carga_mensajes.analisis_completado.connect(self.mostrar_resultados)
+        self.carga_mensajes.resultados_actualizados.connect(self.resultados.aplicar_cambios)
+        self.carga_mensajes.resultados_reemplazados.connect(self.resultados.reemplazar_resultados)
+        self.config_patrones.patrones_modificados.connect(self.carga_mensajes.actualizar_patrones)
+
+    def preparar_resultados(self):
+        """Limpia la pestaña de resultados para recibir los del nuevo análisis"""
+        self.resultados.limpiar()
+        self.tabs.setCurrentIndex(2)  # Cambiar a la pestaña de resultados
 
     def mostrar_resultados(self, resultados):
-        """Muestra los resultados del análisis en la pestaña correspondiente"""
-        self.resultados.actualizar_resultados(resultados)
+        """Registra los resultados completos del análisis (la tabla ya se llenó por partes)"""
+        self.resultados.actualizar_resumen()
         self.estadisticas.agregar_resultados(resultados)  # Actualizar estadísticas
-        self.tabs.setCurrentIndex(2)  # Cambiar a la pestaña de resultados
 
 
 if __name__ == "__main__":